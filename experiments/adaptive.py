@@ -0,0 +1,254 @@
+import logging
+from dataclasses import dataclass, field, fields
+from math import sqrt
+from pathlib import Path
+from statistics import NormalDist
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from experiments.utils import DualGovernanceParameters
+from specs.dual_governance.state import State
+from specs.utils import ether_base
+
+
+def reached_rage_quit(timestep_data: pd.DataFrame) -> float:
+    return float((timestep_data["dg_state_value"] == State.RageQuit.value).any())
+
+
+def time_to_first_veto(timestep_data: pd.DataFrame) -> float:
+    """First timestep spent in Veto Signalling, censored at the end of the simulation when it never happens."""
+    veto_timesteps = timestep_data.loc[timestep_data["dg_state_value"] == State.VetoSignalling.value, "timestep"]
+
+    if veto_timesteps.empty:
+        return float(timestep_data["timestep"].max() + 1)
+
+    return float(veto_timesteps.min())
+
+
+def final_locked_share(timestep_data: pd.DataFrame) -> float:
+    return timestep_data.sort_values("timestep")["dg_rage_quit_support"].iloc[-1] / ether_base
+
+
+@dataclass
+class Metric:
+    extract: Callable[[pd.DataFrame], float]
+    binary: bool = False
+
+
+metrics = {
+    "reached_rage_quit": Metric(reached_rage_quit, binary=True),
+    "time_to_first_veto": Metric(time_to_first_veto),
+    "final_locked_share": Metric(final_locked_share),
+}
+
+
+@dataclass
+class AdaptiveSampling:
+    """
+    Sequential sampling settings for `run_simulation_batches`.
+
+    Seeds are run in rounds of `round_size` per dual governance parameters point. A point stops once the
+    `confidence` interval of the `metric` mean is at most `tolerance` wide on either side, or after `max_runs`
+    runs (`monte_carlo_runs` of the template when not set).
+    """
+
+    metric: str = "reached_rage_quit"
+    tolerance: float = 0.05
+    confidence: float = 0.95
+    round_size: int = 10
+    max_runs: int = None
+
+    def __post_init__(self):
+        if self.metric not in metrics:
+            raise ValueError(f"Unknown adaptive sampling metric '{self.metric}'")
+        if self.round_size < 2:
+            raise ValueError("Adaptive sampling needs at least two runs per round")
+
+
+@dataclass
+class SamplingPoint:
+    params: DualGovernanceParameters
+    params_index: int = 0
+    samples: list[float] = field(default_factory=list)
+    simulation_hashes: list[str] = field(default_factory=list)
+    runs: int = 0
+    converged: bool = False
+
+
+def confidence_interval_half_width(samples: list[float], confidence: float, binary: bool = False) -> float:
+    """
+    Normal approximation of the confidence interval half width of the samples mean. Binary metrics use the
+    Wilson score interval, which stays informative when all runs agree.
+    """
+    n = len(samples)
+    if n < 2:
+        return float("inf")
+
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+
+    if binary:
+        p = float(np.mean(samples))
+        return z * sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+
+    return z * float(np.std(samples, ddof=1)) / sqrt(n)
+
+
+def is_point_finished(point: SamplingPoint, adaptive_sampling: AdaptiveSampling, max_runs: int) -> bool:
+    metric = metrics[adaptive_sampling.metric]
+    half_width = confidence_interval_half_width(point.samples, adaptive_sampling.confidence, metric.binary)
+    point.converged = half_width <= adaptive_sampling.tolerance
+
+    return point.converged or point.runs >= max_runs
+
+
+def read_simulation_metric(batch_folder_path: Path, simulation_hashes: list[str], metric: str) -> dict[str, float]:
+    timestep_data_path = batch_folder_path.joinpath("timestep_data.parquet")
+    if not timestep_data_path.is_file():
+        return {}
+
+    timestep_data = pd.read_parquet(timestep_data_path)
+    timestep_data = timestep_data[timestep_data["simulation_hash"].isin(simulation_hashes)]
+    timestep_data = timestep_data.drop_duplicates(subset=["simulation_hash", "timestep"])
+
+    return {
+        simulation_hash: metrics[metric].extract(simulation_data)
+        for simulation_hash, simulation_data in timestep_data.groupby("simulation_hash")
+    }
+
+
+def summarize_sampling_points(points: list[SamplingPoint], adaptive_sampling: AdaptiveSampling) -> pd.DataFrame:
+    metric = metrics[adaptive_sampling.metric]
+    rows = []
+
+    for point in points:
+        row = {
+            field.name: getattr(point.params, field.name)
+            for field in fields(point.params)
+            if field.name != "custom_delays"
+        }
+        row.update(
+            {
+                "params_index": point.params_index,
+                "metric": adaptive_sampling.metric,
+                "runs": point.runs,
+                "mean": float(np.mean(point.samples)) if point.samples else float("nan"),
+                "half_width": confidence_interval_half_width(
+                    point.samples, adaptive_sampling.confidence, metric.binary
+                ),
+                "converged": point.converged,
+            }
+        )
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def run_sampling_round(
+    points: list[SamplingPoint],
+    round_size: int,
+    max_runs: int,
+    metric: str,
+    timesteps: int,
+    seed: int = 0,
+    out_dir: str = "",
+    **simulation_params,
+):
+    """
+    Runs the next `round_size` seeds (capped by `max_runs`) of every point as a single experiment and appends the
+    resulting metric samples to the points.
+
+    Run `r` of a point uses seed `seed + r`, as the fixed Monte Carlo mode does. Every round is its own batch of one
+    point, so only rounds of an earlier adaptive run with the same settings and `out_dir` are read back instead of
+    rerun, batches of full grid runs are not.
+    """
+    from experiments.batch import setup_simulation_batch
+    from experiments.utils import get_batch_hash
+
+    experiment = None
+    round_batches = []
+
+    for point in points:
+        round_runs = min(round_size, max_runs - point.runs)
+        if round_runs <= 0:
+            continue
+
+        point_experiment, simulation_hashes = setup_simulation_batch(
+            batch_index=0,
+            batch_size=round_runs,
+            timesteps=timesteps,
+            monte_carlo_runs=round_runs,
+            seed=seed + point.runs,
+            out_dir=out_dir,
+            dual_governance_params=[point.params],
+            save_files=True,
+            **simulation_params,
+        )
+        point.runs += round_runs
+
+        if simulation_hashes is None:
+            continue
+
+        batch_folder_path = Path(out_dir).joinpath(f"batch_{get_batch_hash(simulation_hashes, timesteps)}/")
+        round_batches.append((point, batch_folder_path, simulation_hashes))
+
+        if point_experiment is None:
+            continue
+        if experiment is None:
+            experiment = point_experiment
+        else:
+            experiment.add_simulations(point_experiment.simulations)
+
+    if experiment is not None:
+        experiment.run()
+
+    for point, batch_folder_path, simulation_hashes in round_batches:
+        point.simulation_hashes.extend(simulation_hashes)
+        simulation_metrics = read_simulation_metric(batch_folder_path, simulation_hashes, metric)
+
+        if len(simulation_metrics) < len(simulation_hashes):
+            logging.warning(
+                f"Missing results for {len(simulation_hashes) - len(simulation_metrics)} simulations "
+                f"in {batch_folder_path}"
+            )
+
+        point.samples.extend(simulation_metrics[h] for h in simulation_hashes if h in simulation_metrics)
+
+
+def run_adaptive_simulation_batches(
+    adaptive_sampling: AdaptiveSampling,
+    timesteps: int,
+    monte_carlo_runs: int,
+    dual_governance_params: list[DualGovernanceParameters],
+    seed: int = 0,
+    out_dir: str = "",
+    **simulation_params,
+) -> tuple[list[str], pd.DataFrame]:
+    """Runs seeds in rounds for every dual governance parameters point until its metric converges."""
+    max_runs = adaptive_sampling.max_runs or monte_carlo_runs
+    points = [SamplingPoint(params=params, params_index=index) for index, params in enumerate(dual_governance_params)]
+    active_points = list(points)
+    round_index = 0
+
+    while active_points:
+        round_index += 1
+        run_sampling_round(
+            active_points,
+            adaptive_sampling.round_size,
+            max_runs,
+            adaptive_sampling.metric,
+            timesteps=timesteps,
+            seed=seed,
+            out_dir=out_dir,
+            **simulation_params,
+        )
+
+        active_points = [point for point in active_points if not is_point_finished(point, adaptive_sampling, max_runs)]
+        logging.info(
+            f"Adaptive sampling round {round_index}: {len(points) - len(active_points)}/{len(points)} points finished"
+        )
+
+    simulation_hashes = [simulation_hash for point in points for simulation_hash in point.simulation_hashes]
+
+    return simulation_hashes, summarize_sampling_points(points, adaptive_sampling)
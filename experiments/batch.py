@@ -5,6 +5,8 @@ from typing import Callable, Union
 
 from radcad import Backend, Engine, Experiment, Model, Simulation
 
+from experiments.adaptive import AdaptiveSampling, run_adaptive_simulation_batches
+from experiments.boundary_search import BoundarySearch, run_boundary_search
 from experiments.utils import DualGovernanceParameters, construct_state_data, get_batch_hash, get_simulation_hash
 from model.state_update_blocks import state_update_blocks
 from model.sys_params import sys_params
@@ -100,6 +102,7 @@ def setup_simulation_batch(
                 deposit_cap=params.deposit_cap,
                 process_deposits=params.process_deposits,
                 normalize_funds=normalize_funds,
+                batch_proposals=params.batch_proposals,
             )
 
             custom_delays = state["reaction_delay_generator"].custom_delays
@@ -129,6 +132,9 @@ def setup_simulation_batch(
                 normalize_funds=state["normalize_funds"],
             )
 
+            if state["batch_proposals"]:
+                state_data["batch_proposals"] = True
+
             sys_params["wallet_csv_name"] = wallet_csv_name
             simulation_hash = get_simulation_hash(
                 initial_state=state_data,
@@ -159,7 +165,7 @@ def setup_simulation_batch(
         required_files = ["common_data.parquet", "proposals_data.parquet", "timestep_data.parquet"]
         if all(batch_folder_path.joinpath(f).is_file() for f in required_files):
             print(f"Skipping batch {batch_hash} as it already exists with required files.")
-            return None, None
+            return None, simulation_hashes
 
     if save_files:
         batch_folder_path.mkdir(exist_ok=True, parents=True)
@@ -205,10 +211,54 @@ def run_simulation_batches(
     execute_simulations: bool = False,
     wallet_csv_name: str = "stETH token distribution  - stETH+wstETH holders.csv",
     normalize_funds: int = 0,
+    adaptive_sampling: AdaptiveSampling = None,
+    boundary_search: BoundarySearch = None,
 ):
     """Run simulations in batches"""
     dual_governance_params = dual_governance_params or [DualGovernanceParameters()]
 
+    if adaptive_sampling is not None or boundary_search is not None:
+        if not execute_simulations:
+            raise ValueError("Adaptive sampling and boundary search need executed simulations to evaluate metrics")
+
+        simulation_params = dict(
+            timesteps=timesteps,
+            dual_governance_params=dual_governance_params,
+            seed=seed,
+            out_dir=out_dir,
+            scenario=scenario,
+            proposal_types=proposal_types,
+            proposal_subtypes=proposal_subtypes,
+            proposals_generation=proposals_generation,
+            proposals=proposals,
+            attackers=attackers,
+            defenders=defenders,
+            simulation_starting_time=simulation_starting_time,
+            max_actors=max_actors,
+            institutional_threshold=institutional_threshold,
+            labeled_addresses=labeled_addresses,
+            time_profiling=time_profiling,
+            processes=processes,
+            skip_existing_batches=skip_existing_batches,
+            wallet_csv_name=wallet_csv_name,
+            normalize_funds=normalize_funds,
+        )
+        Path(out_dir).mkdir(exist_ok=True, parents=True)
+
+        if boundary_search is not None:
+            simulation_hashes, boundaries, evaluations = run_boundary_search(boundary_search, **simulation_params)
+            boundaries.to_csv(Path(out_dir).joinpath("boundary_search.csv"), index=False)
+            evaluations.to_csv(Path(out_dir).joinpath("boundary_search_evaluations.csv"), index=False)
+            print(boundaries.to_string(index=False))
+        else:
+            simulation_hashes, summary = run_adaptive_simulation_batches(
+                adaptive_sampling, monte_carlo_runs=monte_carlo_runs, **simulation_params
+            )
+            summary.to_csv(Path(out_dir).joinpath("adaptive_sampling.csv"), index=False)
+
+        print(f"Completed {len(simulation_hashes)} simulations")
+        return simulation_hashes
+
     total_simulations = monte_carlo_runs * len(dual_governance_params)
     batch_count = (total_simulations + batch_size - 1) // batch_size
     print(f"Total simulations: {total_simulations}")
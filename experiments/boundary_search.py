@@ -0,0 +1,233 @@
+import logging
+from dataclasses import dataclass, field, fields, replace
+
+import pandas as pd
+
+from experiments.adaptive import SamplingPoint, confidence_interval_half_width, metrics, run_sampling_round
+from experiments.utils import DualGovernanceParameters
+
+
+@dataclass
+class BoundarySearch:
+    """
+    Noisy bisection over a single DualGovernanceParameters field.
+
+    The mean of `metric` is assumed to be monotone in `field`, increasing unless `increasing` is False, and the
+    boundary is the value where it crosses `level` inside [`lower`, `upper`]. Every bisection step runs
+    `runs_per_step` more seeds on the midpoint until the confidence interval of the mean excludes `level` or
+    `max_runs_per_step` is reached, then keeps the half of the bracket on the side of the estimate. The search
+    stops when the bracket is no wider than `resolution`. Integer bounds restrict the search to integers.
+
+    With `outer_field` set, a boundary is searched for every distinct value of that field in the template grid,
+    which traces the boundary curve over two parameters. All curves are bisected in lockstep so each round is a
+    single experiment.
+    """
+
+    field: str
+    lower: float
+    upper: float
+    resolution: float
+    metric: str = "reached_rage_quit"
+    level: float = 0.5
+    increasing: bool = True
+    runs_per_step: int = 10
+    max_runs_per_step: int = 40
+    confidence: float = 0.95
+    outer_field: str = None
+
+    def __post_init__(self):
+        parameter_fields = {parameter_field.name for parameter_field in fields(DualGovernanceParameters)}
+
+        for name in (self.field, self.outer_field):
+            if name is not None and name not in parameter_fields:
+                raise ValueError(f"Unknown DualGovernanceParameters field '{name}'")
+        if self.metric not in metrics:
+            raise ValueError(f"Unknown boundary search metric '{self.metric}'")
+        if self.lower >= self.upper:
+            raise ValueError("Boundary search lower bound must be below the upper bound")
+        if self.resolution <= 0:
+            raise ValueError("Boundary search resolution must be positive")
+
+    @property
+    def is_integer(self) -> bool:
+        """Integer bounds keep every evaluated value an integer, e.g. for `attacker_funds`."""
+        return isinstance(self.lower, int) and isinstance(self.upper, int)
+
+
+@dataclass
+class BoundaryLine:
+    base_params: DualGovernanceParameters
+    lower: float
+    upper: float
+    point: SamplingPoint = None
+    evaluations: list[dict] = field(default_factory=list)
+    undecided_steps: int = 0
+
+
+def get_midpoint(line: BoundaryLine, boundary_search: BoundarySearch):
+    midpoint = (line.lower + line.upper) / 2
+
+    if boundary_search.is_integer:
+        return int(midpoint)
+
+    return midpoint
+
+
+def is_line_finished(line: BoundaryLine, boundary_search: BoundarySearch) -> bool:
+    if line.upper - line.lower <= boundary_search.resolution:
+        return True
+
+    midpoint = get_midpoint(line, boundary_search)
+    return boundary_search.is_integer and midpoint in (line.lower, line.upper)
+
+
+def estimate_step(point: SamplingPoint, boundary_search: BoundarySearch) -> tuple[float, float, bool]:
+    """Returns the metric mean at the point, its confidence interval half width and whether it excludes `level`."""
+    mean = sum(point.samples) / len(point.samples) if point.samples else float("nan")
+    half_width = confidence_interval_half_width(
+        point.samples, boundary_search.confidence, metrics[boundary_search.metric].binary
+    )
+
+    return mean, half_width, abs(mean - boundary_search.level) > half_width
+
+
+def is_step_decided(point: SamplingPoint, boundary_search: BoundarySearch) -> bool:
+    """Runs without results give no samples, so a point without samples keeps sampling until `max_runs_per_step`."""
+    if point.runs >= boundary_search.max_runs_per_step:
+        return True
+    if not point.samples:
+        return False
+
+    _, _, decided = estimate_step(point, boundary_search)
+    return decided
+
+
+def complete_step(line: BoundaryLine, boundary_search: BoundarySearch):
+    point = line.point
+    value = getattr(point.params, boundary_search.field)
+
+    if not point.samples:
+        raise ValueError(
+            f"No {boundary_search.metric} samples at {boundary_search.field}={value} after {point.runs} runs"
+        )
+
+    mean, half_width, decided = estimate_step(point, boundary_search)
+
+    if not decided:
+        line.undecided_steps += 1
+
+    if (mean >= boundary_search.level) == boundary_search.increasing:
+        line.upper = value
+    else:
+        line.lower = value
+
+    line.evaluations.append(
+        {
+            boundary_search.field: value,
+            "runs": point.runs,
+            "mean": mean,
+            "half_width": half_width,
+            "decided": decided,
+        }
+    )
+    line.point = None
+
+
+def get_boundary_lines(
+    boundary_search: BoundarySearch, dual_governance_params: list[DualGovernanceParameters]
+) -> list[BoundaryLine]:
+    if boundary_search.outer_field is None:
+        base_params = [dual_governance_params[0]]
+    else:
+        outer_values = {}
+        for params in dual_governance_params:
+            outer_values.setdefault(getattr(params, boundary_search.outer_field), params)
+        base_params = list(outer_values.values())
+
+    return [BoundaryLine(params, boundary_search.lower, boundary_search.upper) for params in base_params]
+
+
+def summarize_boundary_lines(lines: list[BoundaryLine], boundary_search: BoundarySearch) -> pd.DataFrame:
+    rows = []
+
+    for line in lines:
+        row = {}
+        if boundary_search.outer_field is not None:
+            row[boundary_search.outer_field] = getattr(line.base_params, boundary_search.outer_field)
+
+        row.update(
+            {
+                "field": boundary_search.field,
+                "metric": boundary_search.metric,
+                "level": boundary_search.level,
+                "boundary": (line.lower + line.upper) / 2,
+                "boundary_lower": line.lower,
+                "boundary_upper": line.upper,
+                "steps": len(line.evaluations),
+                "undecided_steps": line.undecided_steps,
+                "simulations": sum(evaluation["runs"] for evaluation in line.evaluations),
+            }
+        )
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def run_boundary_search(
+    boundary_search: BoundarySearch,
+    timesteps: int,
+    dual_governance_params: list[DualGovernanceParameters],
+    seed: int = 0,
+    out_dir: str = "",
+    **simulation_params,
+) -> tuple[list[str], pd.DataFrame, pd.DataFrame]:
+    """
+    Bisects the boundary of every line and returns the simulation hashes, the boundaries with their brackets
+    and every evaluated point.
+    """
+    lines = get_boundary_lines(boundary_search, dual_governance_params)
+    simulation_hashes = []
+    round_index = 0
+
+    active_lines = [line for line in lines if not is_line_finished(line, boundary_search)]
+
+    while active_lines:
+        round_index += 1
+
+        for line in active_lines:
+            if line.point is None:
+                params = replace(line.base_params, **{boundary_search.field: get_midpoint(line, boundary_search)})
+                line.point = SamplingPoint(params=params)
+
+        run_sampling_round(
+            [line.point for line in active_lines],
+            boundary_search.runs_per_step,
+            boundary_search.max_runs_per_step,
+            boundary_search.metric,
+            timesteps=timesteps,
+            seed=seed,
+            out_dir=out_dir,
+            **simulation_params,
+        )
+
+        for line in active_lines:
+            if is_step_decided(line.point, boundary_search):
+                simulation_hashes.extend(line.point.simulation_hashes)
+                complete_step(line, boundary_search)
+
+        active_lines = [line for line in lines if line.point is not None or not is_line_finished(line, boundary_search)]
+        logging.info(
+            f"Boundary search round {round_index}: {len(lines) - len(active_lines)}/{len(lines)} boundaries found"
+        )
+
+    evaluations = pd.DataFrame(
+        [
+            dict(evaluation, **{boundary_search.outer_field: getattr(line.base_params, boundary_search.outer_field)})
+            if boundary_search.outer_field is not None
+            else evaluation
+            for line in lines
+            for evaluation in line.evaluations
+        ]
+    )
+
+    return simulation_hashes, summarize_boundary_lines(lines, boundary_search), evaluations
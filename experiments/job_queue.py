@@ -0,0 +1,318 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from experiments.plan import PLAN_FILE_NAME, get_plan_template_params, load_plan, save_plan
+
+DEFAULT_LEASE_SECONDS = 15 * 60
+DEFAULT_POLL_INTERVAL = 5
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def generate_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def _write_json_atomic(path: Path, data: dict):
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class Job:
+    job_id: str
+    point: dict
+    attempt: int = 0
+
+
+@dataclass
+class JobQueue:
+    """
+    Directory based job queue for running the simulation points of a compiled plan on several workers.
+
+    All coordination goes through the shared filesystem, so workers may live on different hosts:
+
+        plan.json               the compiled experiment plan
+        jobs/<job_id>.json      one job per simulation point
+        leases/<job_id>.<n>     lease for the n-th attempt of a job, created with O_EXCL
+        done/<job_id>.json      completion marker with the simulation hashes
+        failed/<job_id>.json    failure marker with the error of the last attempt
+
+    A lease is kept alive by touching its file. Once its modification time is older than `lease_seconds`
+    any worker may reclaim the job by creating the lease for the next attempt, which only one of them can do.
+    A failed attempt releases its lease, recording the error in it, so the job is retried until it has failed
+    `max_attempts` times. Hosts sharing a queue are expected to have roughly synchronised clocks.
+    """
+
+    root: Path
+    lease_seconds: float = DEFAULT_LEASE_SECONDS
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+
+    def __post_init__(self):
+        self.root = Path(self.root)
+
+    @property
+    def plan_path(self) -> Path:
+        return self.root.joinpath(PLAN_FILE_NAME)
+
+    @property
+    def jobs_dir(self) -> Path:
+        return self.root.joinpath("jobs")
+
+    @property
+    def leases_dir(self) -> Path:
+        return self.root.joinpath("leases")
+
+    @property
+    def done_dir(self) -> Path:
+        return self.root.joinpath("done")
+
+    @property
+    def failed_dir(self) -> Path:
+        return self.root.joinpath("failed")
+
+    def enqueue_plan(self, plan: dict) -> list[str]:
+        for directory in (self.jobs_dir, self.leases_dir, self.done_dir, self.failed_dir):
+            directory.mkdir(exist_ok=True, parents=True)
+
+        save_plan(plan, self.plan_path)
+
+        job_ids = []
+        for point in plan["points"]:
+            job_id = f"{point['index']:08d}"
+            job_path = self.jobs_dir.joinpath(f"{job_id}.json")
+            if not job_path.exists():
+                _write_json_atomic(job_path, {"job_id": job_id, "point": point})
+            job_ids.append(job_id)
+
+        return job_ids
+
+    def get_job_ids(self) -> list[str]:
+        return sorted(path.stem for path in self.jobs_dir.glob("*.json"))
+
+    def get_done_job_ids(self) -> set[str]:
+        return {path.stem for path in self.done_dir.glob("*.json")}
+
+    def get_failed_job_ids(self) -> set[str]:
+        return {path.stem for path in self.failed_dir.glob("*.json")}
+
+    def is_finished(self) -> bool:
+        finished = self.get_done_job_ids() | self.get_failed_job_ids()
+        return all(job_id in finished for job_id in self.get_job_ids())
+
+    def _lease_path(self, job_id: str, attempt: int) -> Path:
+        return self.leases_dir.joinpath(f"{job_id}.{attempt}")
+
+    def _get_latest_attempt(self, job_id: str) -> int:
+        attempt = -1
+        while self._lease_path(job_id, attempt + 1).exists():
+            attempt += 1
+
+        return attempt
+
+    def _is_stale(self, lease_path: Path) -> bool:
+        try:
+            return lease_path.stat().st_mtime + self.lease_seconds < time.time()
+        except FileNotFoundError:
+            return False
+
+    def _try_lease(self, job_id: str, attempt: int, worker_id: str) -> bool:
+        try:
+            fd = os.open(self._lease_path(job_id, attempt), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+
+        with os.fdopen(fd, "w") as f:
+            json.dump({"worker_id": worker_id, "claimed_at": time.time()}, f)
+
+        return True
+
+    def claim(self, job_id: str, worker_id: str) -> Optional[Job]:
+        if self.done_dir.joinpath(f"{job_id}.json").exists() or self.failed_dir.joinpath(f"{job_id}.json").exists():
+            return None
+
+        latest_attempt = self._get_latest_attempt(job_id)
+
+        if latest_attempt < 0:
+            attempt = 0
+        elif self._is_stale(self._lease_path(job_id, latest_attempt)):
+            attempt = latest_attempt + 1
+            logging.warning(f"Reclaiming stale lease of job {job_id} (attempt {latest_attempt})")
+        else:
+            return None
+
+        if not self._try_lease(job_id, attempt, worker_id):
+            return None
+
+        job_data = json.loads(self.jobs_dir.joinpath(f"{job_id}.json").read_text())
+        return Job(job_id=job_id, point=job_data["point"], attempt=attempt)
+
+    def claim_next(self, worker_id: str) -> Optional[Job]:
+        finished = self.get_done_job_ids() | self.get_failed_job_ids()
+
+        for job_id in self.get_job_ids():
+            if job_id in finished:
+                continue
+
+            job = self.claim(job_id, worker_id)
+            if job is not None:
+                return job
+
+        return None
+
+    def renew(self, job: Job):
+        try:
+            os.utime(self._lease_path(job.job_id, job.attempt))
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def heartbeat(self, job: Job):
+        """Keeps the lease of `job` alive while the body is running."""
+        stop = threading.Event()
+
+        def renew_lease():
+            while not stop.wait(self.lease_seconds / 3):
+                self.renew(job)
+
+        thread = threading.Thread(target=renew_lease, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, job: Job, worker_id: str, simulation_hashes: list[str]):
+        _write_json_atomic(
+            self.done_dir.joinpath(f"{job.job_id}.json"),
+            {
+                "job_id": job.job_id,
+                "worker_id": worker_id,
+                "attempt": job.attempt,
+                "simulation_hashes": simulation_hashes,
+                "finished_at": time.time(),
+            },
+        )
+
+    def fail(self, job: Job, worker_id: str, error: Exception):
+        failure = {"job_id": job.job_id, "worker_id": worker_id, "attempt": job.attempt, "error": repr(error)}
+
+        if job.attempt + 1 >= self.max_attempts:
+            _write_json_atomic(self.failed_dir.joinpath(f"{job.job_id}.json"), failure)
+            return
+
+        ## a lease older than any lease duration is stale at once, so the next claim starts another attempt
+        lease_path = self._lease_path(job.job_id, job.attempt)
+        _write_json_atomic(lease_path, failure)
+        os.utime(lease_path, (0, 0))
+
+    def get_simulation_hashes(self) -> list[str]:
+        simulation_hashes = []
+
+        for job_id in self.get_job_ids():
+            done_path = self.done_dir.joinpath(f"{job_id}.json")
+            if done_path.exists():
+                simulation_hashes.extend(json.loads(done_path.read_text())["simulation_hashes"] or [])
+
+        return simulation_hashes
+
+
+def run_job(
+    template_params: dict,
+    point: dict,
+    out_dir: Path,
+    processes: int = None,
+    time_profiling: bool = False,
+    save_files: bool = False,
+) -> list[str]:
+    """
+    Runs a single simulation point of a plan as a batch of one simulation. The simulation is always executed,
+    since the returned hashes mark the job as done.
+    """
+    from experiments.batch import setup_simulation_batch
+
+    params = dict(template_params, monte_carlo_runs=1, seed=point["seed"])
+    if params.get("dual_governance_params"):
+        params["dual_governance_params"] = [params["dual_governance_params"][point["params_index"]]]
+
+    experiment, simulation_hashes = setup_simulation_batch(
+        batch_index=0,
+        batch_size=1,
+        processes=processes,
+        out_dir=out_dir,
+        time_profiling=time_profiling,
+        save_files=save_files,
+        **params,
+    )
+
+    if experiment is not None:
+        experiment.run()
+
+    return simulation_hashes
+
+
+def run_worker(
+    queue_dir: Path,
+    out_dir: Path = None,
+    worker_id: str = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    wait: bool = True,
+    max_jobs: int = None,
+    job_runner: Callable = run_job,
+    **job_kwargs,
+) -> int:
+    """
+    Claims and runs jobs from `queue_dir` until every job is done or failed.
+
+    With `wait` enabled the worker keeps polling while other workers hold live leases, so it can pick up jobs
+    whose workers died. Returns the number of jobs completed by this worker.
+    """
+    queue = JobQueue(queue_dir, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    worker_id = worker_id or generate_worker_id()
+
+    plan = load_plan(queue.plan_path)
+    template_params = get_plan_template_params(plan)
+
+    if out_dir is None:
+        from experiments.simulation_configuration import get_path
+
+        out_dir = get_path().joinpath(plan["simulation_name"])
+
+    completed_jobs = 0
+
+    while max_jobs is None or completed_jobs < max_jobs:
+        job = queue.claim_next(worker_id)
+
+        if job is None:
+            if not wait or queue.is_finished():
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logging.info(f"Worker {worker_id} running job {job.job_id} (attempt {job.attempt})")
+
+        with queue.heartbeat(job):
+            try:
+                simulation_hashes = job_runner(template_params, job.point, out_dir, **job_kwargs)
+            except Exception as e:
+                logging.error(f"Job {job.job_id} failed (attempt {job.attempt}): {e}")
+                queue.fail(job, worker_id, e)
+                continue
+
+        queue.complete(job, worker_id, simulation_hashes)
+        completed_jobs += 1
+
+    logging.info(f"Worker {worker_id} finished after completing {completed_jobs} jobs")
+    return completed_jobs
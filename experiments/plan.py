@@ -0,0 +1,92 @@
+from importlib import import_module
+from pathlib import Path
+
+from json_tricks import dumps, loads
+
+from experiments.registry import get_template_module_path, load_template, load_template_module
+
+PLAN_VERSION = 1
+PLAN_FILE_NAME = "plan.json"
+TEMPLATE_ATTRIBUTE_KEY = "__template_attribute__"
+
+
+def expand_simulation_points(monte_carlo_runs: int, seed: int, params_count: int) -> list[dict]:
+    """
+    Expands a template into the flat list of simulation points in the order `setup_simulation_batch` creates them:
+    every Monte Carlo run is seeded with `seed + run` and iterates over all dual governance parameters.
+    """
+    return [
+        {"index": run * params_count + params_index, "run": run, "seed": seed + run, "params_index": params_index}
+        for run in range(monte_carlo_runs)
+        for params_index in range(params_count)
+    ]
+
+
+def _encode_template_params(template_params: dict, template_module) -> dict:
+    encoded = {}
+
+    for key, value in template_params.items():
+        if callable(value):
+            attribute = next(
+                (name for name, attr in vars(template_module).items() if attr is value and not name.startswith("_")),
+                None,
+            )
+            if attribute is None:
+                raise ValueError(f"Template parameter '{key}' is a callable not exposed by {template_module.__name__}")
+            value = {TEMPLATE_ATTRIBUTE_KEY: attribute}
+        encoded[key] = value
+
+    return encoded
+
+
+def _decode_template_params(template_params: dict, template: str) -> dict:
+    decoded = {}
+
+    for key, value in template_params.items():
+        if isinstance(value, dict) and TEMPLATE_ATTRIBUTE_KEY in value:
+            value = getattr(import_module(template), value[TEMPLATE_ATTRIBUTE_KEY])
+        decoded[key] = value
+
+    return decoded
+
+
+def compile_plan(simulation_name: str) -> dict:
+    template_module = load_template_module(simulation_name)
+    _, template_params = load_template(simulation_name)(simulation_name, return_template=True)
+
+    if template_params is None:
+        raise ValueError(f"Could not get parameters for simulation '{simulation_name}'")
+
+    dual_governance_params = template_params.get("dual_governance_params")
+    params_count = len(dual_governance_params) if dual_governance_params else 1
+
+    return {
+        "version": PLAN_VERSION,
+        "simulation_name": simulation_name,
+        "template": get_template_module_path(simulation_name),
+        "template_params": _encode_template_params(template_params, template_module),
+        "points": expand_simulation_points(
+            template_params["monte_carlo_runs"], template_params.get("seed", 0), params_count
+        ),
+    }
+
+
+def save_plan(plan: dict, path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    path.write_text(dumps(plan, indent=2))
+
+    return path
+
+
+def load_plan(path: Path) -> dict:
+    plan = loads(Path(path).read_text(), preserve_order=False)
+
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"Unsupported plan version {plan.get('version')} in {path}")
+
+    return plan
+
+
+def get_plan_template_params(plan: dict) -> dict:
+    return _decode_template_params(plan["template_params"], plan["template"])
@@ -0,0 +1,45 @@
+import importlib
+from types import ModuleType
+from typing import Callable
+
+TEMPLATES_PACKAGE = "experiments.templates"
+
+templates = {
+    "model_validation": "model_validation",
+    "withdrawal_queue_replacement": "withdrawal_queue_replacement",
+    "rage_quit": "rage_quit_scenario",
+    "withdrawal_queue_replacement_institutional": "withdrawal_queue_replacement_institutional",
+    "signalling_thresholds_sweep_under_proposal_with_attack": "signalling_thresholds_sweep_under_proposal_with_attack",
+    "single_attack_sweep_first_threshold": "single_attack_sweep_first_threshold",
+    "single_attack_sweep_second_threshold": "single_attack_sweep_second_threshold",
+    "veto_signalling_loop": "veto_signalling_loop",
+    "constant_veto_signalling_loop": "constant_veto_signalling_loop",
+    "actors_labelling": "actors_labelling",
+    "rage_quit_loop": "rage_quit_loop",
+    "bribed_withdrawal_queue_replacement": "bribed_withdrawal_queue_replacement",
+}
+
+
+def get_template_names() -> list[str]:
+    return list(templates.keys())
+
+
+def get_template_module_path(simulation_name: str) -> str:
+    if simulation_name not in templates:
+        raise ValueError(f"Simulation '{simulation_name}' not found.")
+
+    return f"{TEMPLATES_PACKAGE}.{templates[simulation_name]}"
+
+
+def load_template_module(simulation_name: str) -> ModuleType:
+    """
+    Imports the template module registered under `simulation_name`.
+
+    Templates build their parameter grids at import time and pull in the whole model, so they are only imported
+    once a simulation is actually selected.
+    """
+    return importlib.import_module(get_template_module_path(simulation_name))
+
+
+def load_template(simulation_name: str) -> Callable:
+    return load_template_module(simulation_name).create_experiment
@@ -1,37 +1,11 @@
 import argparse
 import logging
+import os
 import sys
 import time
 
-from experiments.batch import run_simulation_batches
+from experiments.registry import get_template_names, load_template
 from experiments.simulation_configuration import get_path
-from experiments.templates.actors_labelling import create_experiment as actors_labelling
-from experiments.templates.bribed_withdrawal_queue_replacement import (
-    create_experiment as bribed_withdrawal_queue_replacement,
-)
-from experiments.templates.constant_veto_signalling_loop import create_experiment as constant_veto_signalling_loop
-from experiments.templates.model_validation import create_experiment as model_validation_experiment
-from experiments.templates.rage_quit_loop import create_experiment as rage_quit_loop
-from experiments.templates.rage_quit_scenario import create_experiment as rage_quit_experiment
-from experiments.templates.signalling_thresholds_sweep_under_proposal_with_attack import (
-    create_experiment as signalling_thresholds_sweep_under_proposal_with_attack,
-)
-from experiments.templates.single_attack_sweep_first_threshold import (
-    create_experiment as single_attack_sweep_first_threshold,
-)
-from experiments.templates.single_attack_sweep_second_threshold import (
-    create_experiment as single_attack_sweep_second_threshold,
-)
-from experiments.templates.veto_signalling_loop import create_experiment as veto_signalling_loop
-from experiments.templates.withdrawal_queue_replacement import create_experiment as withdrawal_queue_experiment
-from experiments.templates.withdrawal_queue_replacement_institutional import (
-    create_experiment as withdrawal_queue_replacement_institutional,
-)
-from experiments.utils import (
-    merge_simulation_results,
-    save_combined_actors_simulation_result,
-    save_postprocessing_result,
-)
 
 logger = logging.getLogger()
 logger.setLevel(logging.DEBUG)
@@ -48,44 +22,46 @@ def run(
     processes: int = None,
     batch_size: int = 100,
     template_override=None,
+    template_params: dict = None,
     skip_existing_batches: bool = False,
     execute_simulations: bool = False,
     save_files: bool = False,
+    adaptive_sampling=None,
+    boundary_search=None,
 ):
     out_path = get_path()
 
     if simulation_name is None:
         simulation_name = "model_validation"
 
-    if template_override:
-        template_func = template_override
-    else:
-        simulations = {
-            "model_validation": model_validation_experiment,
-            "withdrawal_queue_replacement": withdrawal_queue_experiment,
-            "rage_quit": rage_quit_experiment,
-            "withdrawal_queue_replacement_institutional": withdrawal_queue_replacement_institutional,
-            "signalling_thresholds_sweep_under_proposal_with_attack": signalling_thresholds_sweep_under_proposal_with_attack,
-            "single_attack_sweep_first_threshold": single_attack_sweep_first_threshold,
-            "single_attack_sweep_second_threshold": single_attack_sweep_second_threshold,
-            "veto_signalling_loop": veto_signalling_loop,
-            "constant_veto_signalling_loop": constant_veto_signalling_loop,
-            "actors_labelling": actors_labelling,
-            "rage_quit_loop": rage_quit_loop,
-            "bribed_withdrawal_queue_replacement": bribed_withdrawal_queue_replacement,
-        }
-
-        if simulation_name not in simulations:
-            logging.error(f"Simulation '{simulation_name}' not found.")
-            return None, None
-
-        template_func = simulations[simulation_name]
-
-    _, template_params = template_func(simulation_name, return_template=True)
+    if template_params is None:
+        if template_override:
+            template_func = template_override
+        else:
+            if simulation_name not in get_template_names():
+                logging.error(f"Simulation '{simulation_name}' not found.")
+                return None, None
+
+            template_func = load_template(simulation_name)
+
+        _, template_params = template_func(simulation_name, return_template=True)
+
     if template_params is None:
         logging.error(f"Could not get parameters for simulation '{simulation_name}'")
         return None, None
 
+    if adaptive_sampling is not None:
+        template_params = dict(template_params, adaptive_sampling=adaptive_sampling)
+    if boundary_search is not None:
+        template_params = dict(template_params, boundary_search=boundary_search)
+
+    from experiments.batch import run_simulation_batches
+    from experiments.utils import (
+        merge_simulation_results,
+        save_combined_actors_simulation_result,
+        save_postprocessing_result,
+    )
+
     logging.info(f"Running simulation {simulation_name}")
     start_time = time.time()
     experiment_duration = 0
@@ -126,9 +102,22 @@ def run(
     logging.info("Simulation execution finished")
 
 
+def parse_number(value: str):
+    number = float(value)
+    return int(number) if number.is_integer() and "." not in value else number
+
+
 if __name__ == "__main__":
+    metric_names = ["reached_rage_quit", "time_to_first_veto", "final_locked_share"]
+
     parser = argparse.ArgumentParser(description="Run a simulation")
-    parser.add_argument("--simulation_name", type=str, help="Name of the simulation to run", required=True)
+    parser.add_argument(
+        "--simulation_name", type=str, help="Name of the simulation to run", choices=get_template_names()
+    )
+    parser.add_argument("--plan", type=str, help="Run a previously compiled experiment plan", required=False)
+    parser.add_argument(
+        "--compile_plan", action="store_true", help="Compile the simulation into an experiment plan and exit"
+    )
     parser.add_argument("--post_processing", action="store_true", help="Enable post-processing result")
     parser.add_argument("--time_profiling", action="store_true", help="Profile time usage")
     parser.add_argument("--execute", action="store_true", help="Execute simulations", required=False, default=False)
@@ -137,11 +126,143 @@ if __name__ == "__main__":
         "--batch_size", type=int, help="Number of simulations inside of a batch", required=False, default=100
     )
     parser.add_argument("--save_files", action="store_true", help="Save files", required=False, default=False)
+    parser.add_argument(
+        "--fast_mode", action="store_true", help="Skip bounds checks of spec value type arithmetic in simulations"
+    )
+    parser.add_argument("--queue_dir", type=str, help="Shared job queue directory", required=False, default=None)
+    parser.add_argument("--enqueue", action="store_true", help="Write the simulation points as jobs into --queue_dir")
+    parser.add_argument(
+        "--worker", action="store_true", help="Execute jobs from --queue_dir until the queue is finished"
+    )
+    parser.add_argument(
+        "--lease_seconds", type=float, help="Job lease duration for workers", required=False, default=15 * 60
+    )
+    parser.add_argument(
+        "--max_attempts", type=int, help="Attempts of a job before workers give up on it", required=False, default=3
+    )
+    parser.add_argument(
+        "--adaptive_metric",
+        type=str,
+        help="Stop Monte Carlo runs of a parameter point once this metric converges",
+        choices=metric_names,
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--adaptive_tolerance",
+        type=float,
+        help="Confidence interval half width to stop at",
+        required=False,
+        default=0.05,
+    )
+    parser.add_argument(
+        "--adaptive_round_size", type=int, help="Runs per parameter point and round", required=False, default=10
+    )
+
+    parser.add_argument(
+        "--boundary_field", type=str, help="Search the boundary of the metric over this parameter", default=None
+    )
+    parser.add_argument(
+        "--boundary_range", type=parse_number, nargs=2, metavar=("LOWER", "UPPER"), help="Boundary search bracket"
+    )
+    parser.add_argument("--boundary_resolution", type=parse_number, help="Boundary search bracket width to stop at")
+    parser.add_argument("--boundary_metric", type=str, choices=metric_names, default="reached_rage_quit")
+    parser.add_argument("--boundary_level", type=float, help="Metric level defining the boundary", default=0.5)
+    parser.add_argument(
+        "--boundary_outer_field", type=str, help="Search a boundary for every template value of this parameter"
+    )
+    parser.add_argument(
+        "--boundary_decreasing", action="store_true", help="The metric decreases with the boundary parameter"
+    )
 
     args = parser.parse_args()
 
+    if args.boundary_field and (args.boundary_range is None or args.boundary_resolution is None):
+        parser.error("--boundary_range and --boundary_resolution are required with --boundary_field")
+
+    if args.compile_plan and (args.plan or args.simulation_name is None):
+        parser.error("--compile_plan requires --simulation_name and can't be combined with --plan")
+
+    if (args.enqueue or args.worker) and args.queue_dir is None:
+        parser.error("--queue_dir is required with --enqueue and --worker")
+
+    if args.fast_mode:
+        from specs.types.fast_mode import FAST_MODE_ENV_VARIABLE, enable_fast_mode
+
+        os.environ[FAST_MODE_ENV_VARIABLE] = "1"
+        enable_fast_mode()
+
+    if args.worker:
+        from experiments.job_queue import run_worker
+
+        run_worker(
+            args.queue_dir,
+            lease_seconds=args.lease_seconds,
+            processes=args.processes,
+            max_attempts=args.max_attempts,
+            time_profiling=args.time_profiling,
+            save_files=args.save_files,
+        )
+        sys.exit(0)
+
+    if args.simulation_name is None and args.plan is None:
+        parser.error("one of --simulation_name or --plan is required")
+
+    simulation_name = args.simulation_name
+    template_params = None
+
+    if args.compile_plan:
+        from experiments.plan import PLAN_FILE_NAME, compile_plan, save_plan
+
+        plan = compile_plan(simulation_name)
+        plan_path = save_plan(plan, get_path().joinpath(simulation_name, PLAN_FILE_NAME))
+        logging.info(f"Compiled {len(plan['points'])} simulation points into {plan_path}")
+        sys.exit(0)
+
+    if args.enqueue:
+        from experiments.job_queue import JobQueue
+        from experiments.plan import compile_plan, load_plan
+
+        plan = load_plan(args.plan) if args.plan else compile_plan(simulation_name)
+        job_ids = JobQueue(args.queue_dir).enqueue_plan(plan)
+        logging.info(f"Enqueued {len(job_ids)} jobs into {args.queue_dir}")
+        sys.exit(0)
+
+    if args.plan:
+        from experiments.plan import get_plan_template_params, load_plan
+
+        plan = load_plan(args.plan)
+        simulation_name = plan["simulation_name"]
+        template_params = get_plan_template_params(plan)
+
+    adaptive_sampling = None
+    if args.adaptive_metric:
+        from experiments.adaptive import AdaptiveSampling
+
+        adaptive_sampling = AdaptiveSampling(
+            metric=args.adaptive_metric, tolerance=args.adaptive_tolerance, round_size=args.adaptive_round_size
+        )
+
+    boundary_search = None
+    if args.boundary_field:
+        from experiments.boundary_search import BoundarySearch
+
+        boundary_search = BoundarySearch(
+            field=args.boundary_field,
+            lower=args.boundary_range[0],
+            upper=args.boundary_range[1],
+            resolution=args.boundary_resolution,
+            metric=args.boundary_metric,
+            level=args.boundary_level,
+            increasing=not args.boundary_decreasing,
+            outer_field=args.boundary_outer_field,
+        )
+
     run(
-        simulation_name=args.simulation_name,
+        simulation_name=simulation_name,
+        template_params=template_params,
+        adaptive_sampling=adaptive_sampling,
+        boundary_search=boundary_search,
         post_processing=args.post_processing,
         time_profiling=args.time_profiling,
         processes=args.processes,
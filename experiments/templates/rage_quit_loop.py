@@ -41,7 +41,6 @@ shares = np.array([0.06, 0.1075, 0.1526, 0.1955])
 # shares = np.array([0.1075]) + 0.0001
 # shares = np.array([0.1, 0.2, 0.3, 0.4]) + 0.03
 attacker_funds_list = [int(np.round(total_balance * get_share(share))) for share in shares]
-print(attacker_funds_list)
 lido_exit_share_list = [0.3]
 deposit_caps = [300_000]
 dual_governance_params = [
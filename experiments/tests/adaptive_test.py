@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from experiments.adaptive import (
+    AdaptiveSampling,
+    SamplingPoint,
+    confidence_interval_half_width,
+    final_locked_share,
+    is_point_finished,
+    reached_rage_quit,
+    time_to_first_veto,
+)
+from experiments.utils import DualGovernanceParameters
+from specs.dual_governance.state import State
+from specs.utils import ether_base
+
+
+def create_timestep_data(states: list[State], rage_quit_support: list[int]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestep": list(range(1, len(states) + 1)),
+            "dg_state_value": [state.value for state in states],
+            "dg_rage_quit_support": rage_quit_support,
+        }
+    )
+
+
+def test_metrics():
+    timestep_data = create_timestep_data(
+        [State.Normal, State.VetoSignalling, State.RageQuit, State.VetoCooldown],
+        [0, ether_base // 100, ether_base // 10, ether_base // 20],
+    )
+
+    assert reached_rage_quit(timestep_data) == 1
+    assert time_to_first_veto(timestep_data) == 2
+    assert final_locked_share(timestep_data) == 0.05
+
+    normal_data = create_timestep_data([State.Normal] * 3, [0] * 3)
+
+    assert reached_rage_quit(normal_data) == 0
+    assert time_to_first_veto(normal_data) == 4
+
+
+@given(
+    samples=st.lists(st.floats(min_value=0, max_value=1), min_size=2, max_size=50),
+    confidence=st.sampled_from([0.9, 0.95, 0.99]),
+)
+def test_half_width_shrinks_with_more_samples(samples, confidence):
+    half_width = confidence_interval_half_width(samples, confidence)
+    repeated_half_width = confidence_interval_half_width(samples * 4, confidence)
+
+    assert half_width >= 0
+    assert repeated_half_width <= half_width + 1e-12
+
+
+@given(successes=st.integers(min_value=0, max_value=20), runs=st.integers(min_value=2, max_value=20))
+def test_binary_half_width_is_positive(successes, runs):
+    successes = min(successes, runs)
+    samples = [1.0] * successes + [0.0] * (runs - successes)
+
+    assert 0 < confidence_interval_half_width(samples, 0.95, binary=True) < 1
+
+
+def test_point_stops_on_convergence_or_max_runs():
+    adaptive_sampling = AdaptiveSampling(metric="reached_rage_quit", tolerance=0.1, round_size=10)
+
+    uncertain_point = SamplingPoint(params=DualGovernanceParameters(), samples=[0.0, 1.0] * 5, runs=10)
+    assert not is_point_finished(uncertain_point, adaptive_sampling, max_runs=100)
+    assert is_point_finished(uncertain_point, adaptive_sampling, max_runs=10)
+    assert not uncertain_point.converged
+
+    certain_point = SamplingPoint(params=DualGovernanceParameters(), samples=[0.0] * 40, runs=40)
+    assert is_point_finished(certain_point, adaptive_sampling, max_runs=100)
+    assert certain_point.converged
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError):
+        AdaptiveSampling(metric="unknown")
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+import experiments.boundary_search as boundary_search_module
+from experiments.boundary_search import BoundarySearch, run_boundary_search
+from experiments.utils import DualGovernanceParameters
+
+
+def fake_sampling_round(boundaries: dict):
+    """Success probability steps from 0.1 to 0.9 at the boundary of the line's second threshold."""
+    rng = np.random.default_rng(0)
+
+    def run_sampling_round(points, round_size, max_runs, metric, **kwargs):
+        for point in points:
+            round_runs = min(round_size, max_runs - point.runs)
+            boundary = boundaries[point.params.second_rage_quit_support]
+            probability = 0.9 if point.params.attacker_funds >= boundary else 0.1
+
+            point.samples.extend(float(sample) for sample in rng.random(round_runs) < probability)
+            point.simulation_hashes.extend(
+                f"{point.params.attacker_funds}-{point.runs + run}" for run in range(round_runs)
+            )
+            point.runs += round_runs
+
+    return run_sampling_round
+
+
+@given(boundary=st.integers(min_value=1_000, max_value=999_000))
+@settings(deadline=None, max_examples=20)
+def test_boundary_search_finds_threshold(boundary):
+    boundary_search = BoundarySearch(field="attacker_funds", lower=0, upper=1_000_000, resolution=10_000)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(boundary_search_module, "run_sampling_round", fake_sampling_round({10: boundary}))
+        simulation_hashes, boundaries, evaluations = run_boundary_search(
+            boundary_search, timesteps=1, dual_governance_params=[DualGovernanceParameters(second_rage_quit_support=10)]
+        )
+
+    result = boundaries.iloc[0]
+    assert result["boundary_upper"] - result["boundary_lower"] <= boundary_search.resolution
+    assert result["boundary_lower"] <= boundary <= result["boundary_upper"]
+    assert len(evaluations) == result["steps"]
+    assert len(simulation_hashes) == result["simulations"]
+    assert all(float(value).is_integer() for value in evaluations["attacker_funds"])
+
+
+def test_boundary_search_over_outer_field():
+    boundaries_by_outer_value = {10: 200_000, 15: 600_000}
+    boundary_search = BoundarySearch(
+        field="attacker_funds", lower=0, upper=1_000_000, resolution=20_000, outer_field="second_rage_quit_support"
+    )
+    dual_governance_params = [
+        DualGovernanceParameters(second_rage_quit_support=second_threshold, attacker_funds=funds)
+        for second_threshold in boundaries_by_outer_value
+        for funds in range(0, 1_000_000, 100_000)
+    ]
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            boundary_search_module, "run_sampling_round", fake_sampling_round(boundaries_by_outer_value)
+        )
+        _, boundaries, _ = run_boundary_search(
+            boundary_search, timesteps=1, dual_governance_params=dual_governance_params
+        )
+
+    assert list(boundaries["second_rage_quit_support"]) == list(boundaries_by_outer_value)
+
+    for _, result in boundaries.iterrows():
+        boundary = boundaries_by_outer_value[result["second_rage_quit_support"]]
+        assert result["boundary_lower"] <= boundary <= result["boundary_upper"]
+
+
+def test_boundary_search_without_samples_raises():
+    boundary_search = BoundarySearch(field="attacker_funds", lower=0, upper=1_000_000, resolution=10_000)
+    sampled_runs = []
+
+    def run_sampling_round(points, round_size, max_runs, metric, **kwargs):
+        for point in points:
+            point.runs += min(round_size, max_runs - point.runs)
+            sampled_runs.append(point.runs)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(boundary_search_module, "run_sampling_round", run_sampling_round)
+        with pytest.raises(ValueError, match="No reached_rage_quit samples"):
+            run_boundary_search(boundary_search, timesteps=1, dual_governance_params=[DualGovernanceParameters()])
+
+    assert sampled_runs[-1] == boundary_search.max_runs_per_step
+
+
+def test_invalid_boundary_search():
+    with pytest.raises(ValueError):
+        BoundarySearch(field="unknown", lower=0, upper=1, resolution=0.1)
+    with pytest.raises(ValueError):
+        BoundarySearch(field="attacker_funds", lower=1, upper=0, resolution=0.1)
@@ -0,0 +1,102 @@
+import json
+import os
+import time
+from multiprocessing import Process
+
+from experiments.job_queue import JobQueue, run_worker
+from experiments.plan import PLAN_VERSION, expand_simulation_points
+
+
+def create_plan(monte_carlo_runs: int = 5, params_count: int = 4) -> dict:
+    return {
+        "version": PLAN_VERSION,
+        "simulation_name": "job_queue_test",
+        "template": "experiments.templates.model_validation",
+        "template_params": {},
+        "points": expand_simulation_points(monte_carlo_runs, 0, params_count),
+    }
+
+
+def record_point_runner(template_params, point, out_dir):
+    time.sleep(0.01)
+    return [f"simulation-{point['index']}"]
+
+
+def failing_runner(template_params, point, out_dir):
+    raise RuntimeError("simulation failed")
+
+
+def run_test_worker(queue_dir, worker_id):
+    run_worker(queue_dir, out_dir=queue_dir, worker_id=worker_id, poll_interval=0.05, job_runner=record_point_runner)
+
+
+def test_workers_complete_each_job_once(tmp_path):
+    plan = create_plan()
+    queue = JobQueue(tmp_path)
+    job_ids = queue.enqueue_plan(plan)
+
+    workers = [Process(target=run_test_worker, args=(tmp_path, f"worker-{i}")) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    assert queue.is_finished()
+    assert queue.get_done_job_ids() == set(job_ids)
+    assert sorted(os.listdir(queue.leases_dir)) == sorted(f"{job_id}.0" for job_id in job_ids)
+    assert sorted(queue.get_simulation_hashes()) == sorted(f"simulation-{point['index']}" for point in plan["points"])
+
+
+def test_stale_lease_is_reclaimed(tmp_path):
+    queue = JobQueue(tmp_path, lease_seconds=60)
+    queue.enqueue_plan(create_plan(monte_carlo_runs=1, params_count=1))
+
+    job = queue.claim_next("worker-a")
+    assert job is not None and job.attempt == 0
+    assert queue.claim_next("worker-b") is None
+
+    stale_time = time.time() - 120
+    os.utime(queue.leases_dir.joinpath(f"{job.job_id}.0"), (stale_time, stale_time))
+
+    reclaimed_job = queue.claim_next("worker-b")
+    assert reclaimed_job.job_id == job.job_id
+    assert reclaimed_job.attempt == 1
+    assert queue.claim_next("worker-c") is None
+
+    queue.complete(reclaimed_job, "worker-b", ["simulation-0"])
+    assert queue.is_finished()
+    assert queue.claim_next("worker-c") is None
+
+
+def test_failed_jobs_are_retried_up_to_max_attempts(tmp_path):
+    queue = JobQueue(tmp_path)
+    queue.enqueue_plan(create_plan(monte_carlo_runs=1, params_count=2))
+
+    assert run_worker(tmp_path, out_dir=tmp_path, worker_id="worker-a", job_runner=failing_runner) == 0
+    assert queue.is_finished()
+    assert len(queue.get_failed_job_ids()) == 2
+    assert sorted(os.listdir(queue.leases_dir)) == sorted(
+        f"{job_id}.{attempt}" for job_id in queue.get_job_ids() for attempt in range(queue.max_attempts)
+    )
+
+    failure = json.loads(queue.failed_dir.joinpath("00000000.json").read_text())
+    assert failure["attempt"] == queue.max_attempts - 1
+    assert "simulation failed" in failure["error"]
+
+
+def test_failed_attempt_is_reclaimed_at_once(tmp_path):
+    queue = JobQueue(tmp_path, lease_seconds=60, max_attempts=2)
+    queue.enqueue_plan(create_plan(monte_carlo_runs=1, params_count=1))
+
+    job = queue.claim_next("worker-a")
+    queue.fail(job, "worker-a", RuntimeError("simulation failed"))
+    assert not queue.is_finished()
+
+    retried_job = queue.claim_next("worker-b")
+    assert retried_job.job_id == job.job_id
+    assert retried_job.attempt == 1
+
+    queue.complete(retried_job, "worker-b", ["simulation-0"])
+    assert queue.is_finished()
+    assert queue.get_failed_job_ids() == set()
@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from experiments.batch import setup_simulation_batch
+from experiments.plan import compile_plan, expand_simulation_points, get_plan_template_params, load_plan, save_plan
+from experiments.registry import get_template_names, load_template
+
+
+@given(
+    monte_carlo_runs=st.integers(min_value=1, max_value=5),
+    seed=st.integers(min_value=0, max_value=10_000),
+    params_count=st.integers(min_value=1, max_value=5),
+)
+def test_expand_simulation_points(monte_carlo_runs, seed, params_count):
+    points = expand_simulation_points(monte_carlo_runs, seed, params_count)
+
+    assert len(points) == monte_carlo_runs * params_count
+    assert [point["index"] for point in points] == list(range(len(points)))
+
+    for point in points:
+        assert point["seed"] == seed + point["run"]
+        assert 0 <= point["params_index"] < params_count
+
+
+def test_unknown_template():
+    with pytest.raises(ValueError):
+        load_template("unknown_simulation")
+
+
+def test_run_cli_does_not_import_templates():
+    code = "import sys, experiments.run; print(any(m.startswith(('radcad', 'experiments.templates.')) for m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+    assert output.strip().endswith("False")
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        ["--compile_plan", "--plan", "plan.json"],
+        ["--compile_plan", "--plan", "plan.json", "--simulation_name", "rage_quit"],
+    ],
+)
+def test_compile_plan_requires_a_simulation_name_without_plan(arguments):
+    result = subprocess.run([sys.executable, "-m", "experiments.run", *arguments], capture_output=True, text=True)
+
+    assert result.returncode == 2
+    assert "--compile_plan requires --simulation_name" in result.stderr
+
+
+@pytest.mark.parametrize("simulation_name", ["constant_veto_signalling_loop", "actors_labelling"])
+def test_compiled_plan_matches_template(simulation_name, tmp_path):
+    assert simulation_name in get_template_names()
+
+    _, template_params = load_template(simulation_name)(simulation_name, return_template=True)
+    plan = load_plan(save_plan(compile_plan(simulation_name), tmp_path.joinpath("plan.json")))
+    plan_template_params = get_plan_template_params(plan)
+
+    assert plan["simulation_name"] == simulation_name
+    assert len(plan["points"]) == template_params["monte_carlo_runs"] * len(template_params["dual_governance_params"])
+    assert plan_template_params.keys() == template_params.keys()
+
+    _, simulation_hashes = setup_simulation_batch(0, 1, save_files=False, **template_params)
+    _, plan_simulation_hashes = setup_simulation_batch(0, 1, save_files=False, **plan_template_params)
+
+    assert simulation_hashes == plan_simulation_hashes
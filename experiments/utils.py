@@ -39,6 +39,7 @@ class DualGovernanceParameters:
     modeled_reactions: ModeledReactions = ModeledReactions.Normal
     deposit_cap: int = 300_000
     process_deposits: bool = False
+    batch_proposals: bool = False
 
 
 def get_simulation_hash(initial_state=None, state_update_blocks=None, params=None, timesteps=None):
@@ -123,6 +124,7 @@ def setup_simulation(
                 lido_exit_share=params.lido_exit_share,
                 churn_rate=params.churn_rate,
                 process_deposits=params.process_deposits,
+                batch_proposals=params.batch_proposals,
             )
 
             state_custom_delays = state["reaction_delay_generator"].custom_delays
@@ -148,6 +150,9 @@ def setup_simulation(
                 process_deposits=state["process_deposits"],
             )
 
+            if state["batch_proposals"]:
+                state_data["batch_proposals"] = True
+
             simulation_hash = get_simulation_hash(
                 initial_state=state_data,
                 state_update_blocks=state_update_blocks,
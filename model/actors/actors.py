@@ -5,21 +5,27 @@ from typing import List, Tuple
 import numpy as np
 
 from model import sys_params
+from model.actors import kernels
 from model.actors.errors import NotEnoughActorStETHBalance, NotEnoughActorWstETHBalance
+from model.actors.scratch import ScratchBuffers, is_debug_allocations_enabled, track_peak_allocation
 from model.types.actors import ActorReaction, ActorType
 from model.types.proposal_type import ProposalSubType, ProposalType
 from model.types.proposals import Proposal
+from model.types.reaction_time import ReactionTime
 from model.types.scenario import Scenario
+from model.utils.numbers import allocate_up_to
 from model.utils.reactions import ReactionDelayGenerator
+from model.utils.seed import get_address_allocator
 from specs.dual_governance import DualGovernance
 from specs.dual_governance.proposals import ProposalStatus
 from specs.dual_governance.state import State
-from specs.utils import generate_address
 
 logging.getLogger("numba").setLevel(logging.WARNING)
 
 
 class Actors:
+    use_reaction_kernel = True
+
     def __init__(
         self,
         address: np.ndarray,
@@ -83,11 +89,66 @@ class Actors:
         self.entity[empty_entity] = "Other"
 
         empty_address = self.address == ""
-        self.address[empty_address] = [generate_address() for _ in range(np.sum(empty_address))]
+        if np.any(empty_address):
+            self.address[empty_address] = get_address_allocator().allocate_many(np.sum(empty_address))
         self.did_quit = np.zeros(self.amount, dtype=np.bool_)
 
-    def exclude_quit_actors(self, mask: np.ndarray) -> np.ndarray:
-        return mask & ~self.did_quit
+        ## Actors without reaction never get due for an HP check, their next check stays beyond 2**32 - 1, so they
+        ## never react and never lock. The per-tick reaction pass only visits the active partition.
+        self.active_indices = np.flatnonzero(self.reaction_time != ReactionTime.NoReaction.value)
+        self.active_actor_types = set(np.unique(self.actor_type[self.active_indices]).tolist())
+
+        self.scratch = ScratchBuffers(self.amount)
+        self.active_scratch = ScratchBuffers(len(self.active_indices))
+        self.debug_allocations = is_debug_allocations_enabled()
+        self.last_tick_allocation_peak = 0
+
+    def exclude_quit_actors(self, mask: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        if out is None:
+            return mask & ~self.did_quit
+
+        # mask & ~did_quit of boolean masks without a temporary array
+        return np.greater(mask, self.did_quit, out=out)
+
+    def _get_mask_buffer(self, name: str) -> np.ndarray:
+        return self.scratch.get(name, np.bool_)
+
+    ## The selections below write into `out`, which may be `mask` itself, and keep their conditions in
+    ## dedicated buffers, so they can be chained without allocating temporary masks.
+
+    def _select_actor_type(self, actor_type: ActorType, mask: np.ndarray, out: np.ndarray) -> np.ndarray:
+        condition = np.equal(self.actor_type, actor_type.value, out=self._get_mask_buffer("actor_type_condition"))
+        return np.logical_and(condition, mask, out=out)
+
+    def _exclude_actor_type(self, actor_type: ActorType, mask: np.ndarray, out: np.ndarray) -> np.ndarray:
+        condition = np.not_equal(self.actor_type, actor_type.value, out=self._get_mask_buffer("actor_type_condition"))
+        return np.logical_and(condition, mask, out=out)
+
+    def _select_locked(self, mask: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Actors of `mask` with locked stETH or wstETH"""
+        condition = np.greater(self.stETH_locked, 0, out=self._get_mask_buffer("stETH_locked_condition"))
+        wstETH_condition = np.greater(self.wstETH_locked, 0, out=self._get_mask_buffer("wstETH_locked_condition"))
+        np.logical_or(condition, wstETH_condition, out=condition)
+        return np.logical_and(condition, mask, out=out)
+
+    def _select_unlocked(self, mask: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Actors of `mask` without locked stETH and wstETH"""
+        condition = np.equal(self.stETH_locked, 0, out=self._get_mask_buffer("stETH_locked_condition"))
+        wstETH_condition = np.equal(self.wstETH_locked, 0, out=self._get_mask_buffer("wstETH_locked_condition"))
+        np.logical_and(condition, wstETH_condition, out=condition)
+        return np.logical_and(condition, mask, out=out)
+
+    def _select_reaction(
+        self, reactions: np.ndarray, reaction: ActorReaction, mask: np.ndarray, out: np.ndarray
+    ) -> np.ndarray:
+        condition = np.equal(reactions, reaction.value, out=self._get_mask_buffer("reaction_condition"))
+        return np.logical_and(condition, mask, out=out)
+
+    def _select_unlock_or_quit(self, reactions: np.ndarray, mask: np.ndarray, out: np.ndarray) -> np.ndarray:
+        condition = np.equal(reactions, ActorReaction.Unlock.value, out=self._get_mask_buffer("reaction_condition"))
+        quit_condition = np.equal(reactions, ActorReaction.Quit.value, out=self._get_mask_buffer("quit_condition"))
+        np.logical_or(condition, quit_condition, out=condition)
+        return np.logical_and(condition, mask, out=out)
 
     ## ---
     ## Funds movement section
@@ -169,24 +230,18 @@ class Actors:
 
         match proposal.sub_type:
             case ProposalSubType.FundsStealing:
-                current_stETH = np.copy(self.hypothetical_stETH)
-                current_wstETH = np.copy(self.hypothetical_wstETH)
-
                 proposal.register_fund_changes(
                     actors_amount=self.stETH,
                     victims_mask=victims_mask,
-                    victims_stETH=current_stETH,
-                    victims_wstETH=current_wstETH,
+                    victims_stETH=self.hypothetical_stETH,
+                    victims_wstETH=self.hypothetical_wstETH,
                     attackers_mask=attackers_mask,
                 )
 
-                self.hypothetical_stETH += proposal.stETH_changes
-                self.hypothetical_wstETH += proposal.wstETH_changes
+                self.hypothetical_stETH[proposal.fund_change_indices] += proposal.stETH_changes
+                self.hypothetical_wstETH[proposal.fund_change_indices] += proposal.wstETH_changes
 
             case ProposalSubType.Bribing:
-                current_stETH = np.copy(self.hypothetical_stETH)
-                current_wstETH = np.copy(self.hypothetical_wstETH)
-
                 bribed_mask = np.isin(self.address, list(proposal.attack_targets))
 
                 victims_mask = victims_mask & ~bribed_mask
@@ -196,82 +251,134 @@ class Actors:
                     bribed_mask=bribed_mask,
                     victims_mask=victims_mask,
                     attackers_mask=attackers_mask,
-                    current_stETH=current_stETH,
-                    current_wstETH=current_wstETH,
+                    current_stETH=self.hypothetical_stETH,
+                    current_wstETH=self.hypothetical_wstETH,
                 )
 
-                self.hypothetical_stETH += proposal.stETH_changes
-                self.hypothetical_wstETH += proposal.wstETH_changes
+                self.hypothetical_stETH[proposal.fund_change_indices] += proposal.stETH_changes
+                self.hypothetical_wstETH[proposal.fund_change_indices] += proposal.wstETH_changes
 
     def reset_proposal_effect(self, proposal: Proposal):
         """Reset only the changes from this specific proposal"""
-        if hasattr(proposal, "stETH_changes") and hasattr(proposal, "wstETH_changes"):
-            self.hypothetical_stETH -= proposal.stETH_changes
-            self.hypothetical_wstETH -= proposal.wstETH_changes
+        if proposal.fund_change_indices is not None:
+            self.hypothetical_stETH[proposal.fund_change_indices] -= proposal.stETH_changes
+            self.hypothetical_wstETH[proposal.fund_change_indices] -= proposal.wstETH_changes
 
     def finalize_proposal_effect(self, proposal: Proposal):
         """Finalize balance changes when a proposal is executed"""
         if not proposal.is_active:
             return
 
-        if proposal.stETH_changes is not None:
-            if np.sum(proposal.stETH_changes) > 0:
-                self.stETH += proposal.stETH_changes
+        if proposal.fund_change_indices is None:
+            return
+
+        if np.sum(proposal.stETH_changes) > 0:
+            self.stETH[proposal.fund_change_indices] += proposal.stETH_changes
 
-        if proposal.wstETH_changes is not None:
-            if np.sum(proposal.wstETH_changes) > 0:
-                self.wstETH += proposal.wstETH_changes
+        if np.sum(proposal.wstETH_changes) > 0:
+            self.wstETH[proposal.fund_change_indices] += proposal.wstETH_changes
 
     ## ---
     ## Proposal damage section
     ## ---
 
-    def apply_proposal_damage(
-        self,
-        reaction_delay_generator: ReactionDelayGenerator,
-        current_timestamp: int,
-        proposal: Proposal,
-        mask: np.ndarray = None,
-    ):
+    def calculate_proposal_damage(self, proposal: Proposal, mask: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the indices of the actors in `mask` damaged by the proposal and their non-zero damage"""
         if mask is None:
-            mask = np.repeat(True, self.amount)
-
-        mask = self.exclude_quit_actors(mask)
+            mask = np.logical_not(self.did_quit, out=self._get_mask_buffer("damage_mask"))
+        else:
+            mask = self.exclude_quit_actors(mask.astype(np.bool_, copy=False), out=self._get_mask_buffer("damage_mask"))
 
-        initial_health = self.hypothetical_health.copy()
-        damage = np.repeat(proposal.damage, self.amount)
+        indices = np.flatnonzero(mask)
+        damage = np.repeat(proposal.damage, len(indices))
 
         if proposal.sub_type == ProposalSubType.FundsStealing:
             if proposal.attack_targets:
-                target_mask = np.isin(self.address, list(proposal.attack_targets)) & mask
-                damage[target_mask] = sys_params.sys_params["max_damage"]
+                target_mask = np.isin(self.address[indices], list(proposal.attack_targets))
             else:
-                target_mask = (self.entity != "Contract") & mask
-                damage[target_mask] = sys_params.sys_params["max_damage"]
+                target_mask = self.entity[indices] != "Contract"
+            damage[target_mask] = sys_params.sys_params["max_damage"]
 
         elif proposal.sub_type == ProposalSubType.Bribing:
-            bribed_mask = np.isin(self.address, list(proposal.attack_targets)) & mask
+            bribed_mask = np.isin(self.address[indices], list(proposal.attack_targets))
             damage[bribed_mask] = -1
 
-            target_mask = (self.entity != "Contract") & mask
+            target_mask = self.entity[indices] != "Contract"
             damage[~bribed_mask & target_mask] = sys_params.sys_params["max_damage"]
 
         for label, label_damage in proposal.effects.effects.items():
             if label_damage != 0:
-                damage[(self.label == label) & mask] = label_damage
+                damage[self.label[indices] == label] = label_damage
+
+        damaged = damage != 0
+
+        return indices[damaged], damage[damaged]
+
+    def apply_proposal_damage(
+        self,
+        reaction_delay_generator: ReactionDelayGenerator,
+        current_timestamp: int,
+        proposal: Proposal,
+        mask: np.ndarray = None,
+    ):
+        indices, damage = self.calculate_proposal_damage(proposal, mask)
+
+        self.hypothetical_health = self.hypothetical_health.astype(
+            np.result_type(self.hypothetical_health, damage), copy=False
+        )
+        self.hypothetical_health[indices] -= damage
+
+        proposal.store_damage_effect(indices, damage)
+
+        damage_is_positive = damage > 0
+        self.total_damage[indices[damage_is_positive]] += np.abs(damage[damage_is_positive])
+        self.total_healing[indices[~damage_is_positive]] += np.abs(damage[~damage_is_positive])
+
+        damage_mask = self._get_mask_buffer("damage_mask")
+        damage_mask.fill(False)
+        damage_mask[indices] = True
+        self.update_next_hp_check_timestamp(reaction_delay_generator, current_timestamp, damage_mask)
+
+        return damage_mask
+
+    def apply_proposals_damage(
+        self,
+        reaction_delay_generator: ReactionDelayGenerator,
+        current_timestamp: int,
+        proposals: List[Proposal],
+        masks: List[np.ndarray],
+    ):
+        """
+        Applies the damage of proposals registered together as a (proposals x affected actors) matrix. Every proposal
+        keeps its own damage for a later cancellation or execution, while the health of the actors changes once by
+        the sum of the damage of all proposals and every damaged actor gets a single new reaction delay. The returned
+        mask is a scratch buffer, valid until the next damage update.
+        """
+        if not proposals:
+            return np.zeros(self.amount, dtype=bool)
 
-        damage[np.logical_not(mask)] = 0
+        damages = [self.calculate_proposal_damage(proposal, mask) for proposal, mask in zip(proposals, masks)]
+        affected = np.unique(np.concatenate([indices for indices, _ in damages]).astype(np.int64))
 
-        self.hypothetical_health = initial_health - damage
+        damage_matrix = np.zeros(
+            (len(proposals), len(affected)), dtype=np.result_type(*[damage for _, damage in damages])
+        )
+
+        for row, (proposal, (indices, damage)) in enumerate(zip(proposals, damages)):
+            damage_matrix[row, np.searchsorted(affected, indices)] = damage
+            proposal.store_damage_effect(indices, damage)
 
-        proposal.store_damage_effect(damage)
+        self.hypothetical_health = self.hypothetical_health.astype(
+            np.result_type(self.hypothetical_health, damage_matrix), copy=False
+        )
+        self.hypothetical_health[affected] -= damage_matrix.sum(axis=0)
 
-        damage_mask = damage != 0
-        if np.any(damage_mask):
-            damage_is_positive = damage > 0
-            self.total_damage[damage_mask & damage_is_positive] += np.abs(damage[damage_mask & damage_is_positive])
-            self.total_healing[damage_mask & ~damage_is_positive] += np.abs(damage[damage_mask & ~damage_is_positive])
+        self.total_damage[affected] += np.where(damage_matrix > 0, damage_matrix, 0).sum(axis=0)
+        self.total_healing[affected] += np.where(damage_matrix < 0, -damage_matrix, 0).sum(axis=0)
 
+        damage_mask = self._get_mask_buffer("damage_mask")
+        damage_mask.fill(False)
+        damage_mask[affected] = True
         self.update_next_hp_check_timestamp(reaction_delay_generator, current_timestamp, damage_mask)
 
         return damage_mask
@@ -279,39 +386,40 @@ class Actors:
     def remove_proposal_damage(
         self, reaction_delay_generator: ReactionDelayGenerator, current_timestamp: int, proposal: Proposal
     ):
-        if not proposal.is_active or proposal.damage_amounts is None:
+        if not proposal.is_active or proposal.damage_indices is None:
             return
 
-        damage_mask = proposal.get_damage_mask()
-        if not np.any(damage_mask):
+        indices = proposal.damage_indices
+        if len(indices) == 0:
             return
 
-        initial_health = self.hypothetical_health.copy()
-        self.hypothetical_health[damage_mask] += proposal.damage_amounts[damage_mask]
+        initial_health = self.hypothetical_health[indices]
+        self.hypothetical_health[indices] += proposal.damage_amounts
 
-        health_change = self.hypothetical_health - initial_health
+        health_change = self.hypothetical_health[indices] - initial_health
 
         if proposal.damage > 0:
-            recovery_mask = damage_mask & (health_change > 0)
-            if np.any(recovery_mask):
-                self.total_recovery[recovery_mask] += np.abs(health_change[recovery_mask])
-                self.recovery_time[recovery_mask] = current_timestamp
+            recovered = health_change > 0
+            if np.any(recovered):
+                self.total_recovery[indices[recovered]] += np.abs(health_change[recovered])
+                self.recovery_time[indices[recovered]] = current_timestamp
 
-        self.update_next_hp_check_timestamp(
-            reaction_delay_generator, current_timestamp, damage_mask & (health_change != 0)
-        )
+        changed_mask = self._get_mask_buffer("damage_mask")
+        changed_mask.fill(False)
+        changed_mask[indices[health_change != 0]] = True
+
+        self.update_next_hp_check_timestamp(reaction_delay_generator, current_timestamp, changed_mask)
         proposal.clear_damage_effect()
 
     def finalize_proposal_damage(self, proposal: Proposal):
-        if not proposal.is_active or proposal.damage_amounts is None:
+        if not proposal.is_active or proposal.damage_indices is None:
             return
 
-        damage_mask = proposal.get_damage_mask()
-        if not np.any(damage_mask):
+        if len(proposal.damage_indices) == 0:
             return
 
-        self.health[damage_mask] -= proposal.damage_amounts[damage_mask]
-        self.cropped_health = np.clip(self.health, 0, 100)
+        self.health[proposal.damage_indices] -= proposal.damage_amounts
+        np.clip(self.health, 0, 100, out=self.cropped_health)
 
         ### TODO: add update next hp check timestamp here
 
@@ -322,8 +430,21 @@ class Actors:
     def check_hp_and_calculate_reaction(
         self, scenario: Scenario, dual_governance: DualGovernance, proposals: List[Proposal]
     ):
-        mask = self.next_hp_check_timestamp <= dual_governance.time_manager.get_current_timestamp()
-        mask = self.exclude_quit_actors(mask)
+        if self.debug_allocations:
+            with track_peak_allocation() as peak:
+                result = self._check_hp_and_calculate_reaction(scenario, dual_governance, proposals)
+            self.last_tick_allocation_peak = peak.bytes
+            return result
+
+        return self._check_hp_and_calculate_reaction(scenario, dual_governance, proposals)
+
+    def _check_hp_and_calculate_reaction(
+        self, scenario: Scenario, dual_governance: DualGovernance, proposals: List[Proposal]
+    ):
+        if self.use_reaction_kernel:
+            return self._calculate_reactions_with_kernel(scenario, dual_governance, proposals)
+
+        mask = self._get_due_mask(dual_governance)
         reactions = self.get_reactions_based_on_hp(mask)
 
         # correct reactions for specific situations and actortypes
@@ -336,13 +457,154 @@ class Actors:
 
         return reactions, stETH_amounts, wstETH_amounts
 
+    def _calculate_reactions_with_kernel(
+        self, scenario: Scenario, dual_governance: DualGovernance, proposals: List[Proposal]
+    ):
+        """
+        Same reactions and lock amounts as the NumPy reference above, computed in one pass of
+        `kernels.calculate_reactions` over the active partition. The corrections of single defenders and coordinated
+        attackers only depend on the proposals and the Dual Governance state, so they are decided before the pass.
+        """
+        defender_correction = kernels.NO_CORRECTION
+        if proposals and self._has_actor_type(ActorType.SingleDefender):
+            if self._are_negative_proposals_canceled(dual_governance, proposals):
+                defender_correction = kernels.UNLOCK_LOCKED
+            else:
+                defender_correction = kernels.LOCK_UNLOCKED
+
+        attacker_correction = kernels.NO_CORRECTION
+        if proposals and self._has_actor_type(ActorType.CoordinatedAttacker):
+            if scenario in [Scenario.VetoSignallingLoop, Scenario.ConstantVetoSignallingLoop]:
+                if self._are_positive_proposals_pending(dual_governance, proposals):
+                    attacker_correction = kernels.LOCK_UNLOCKED
+                else:
+                    attacker_correction = kernels.UNLOCK_LOCKED
+
+            elif scenario == Scenario.RageQuitLoop:
+                attacker_mask = self._select_actor_type(
+                    ActorType.CoordinatedAttacker,
+                    self._get_due_mask(dual_governance),
+                    out=self._get_mask_buffer("attacker_mask"),
+                )
+                if np.any(attacker_mask) and self._should_attackers_lock(dual_governance, attacker_mask):
+                    attacker_correction = kernels.LOCK_ALL
+
+        active_indices = self.active_indices
+        locked, unlocked = self._get_active_lock_flags()
+        reactions = self.scratch.get("reactions", np.uint8, fill_value=ActorReaction.NoReaction.value)
+        balance_indices = self.active_scratch.get("balance_indices", active_indices.dtype)
+        unlock_indices = self.active_scratch.get("unlock_indices", active_indices.dtype)
+        attacker_indices = self.active_scratch.get("attacker_indices", active_indices.dtype)
+
+        balance_count, unlock_count, attacker_count = kernels.calculate_reactions(
+            active_indices,
+            self.next_hp_check_timestamp,
+            dual_governance.time_manager.get_current_timestamp(),
+            self.did_quit,
+            self.health,
+            self.hypothetical_health,
+            self.actor_type,
+            locked,
+            unlocked,
+            defender_correction,
+            attacker_correction,
+            scenario == Scenario.RageQuitLoop,
+            dual_governance.get_current_state() == State.RageQuit,
+            reactions,
+            balance_indices,
+            unlock_indices,
+            attacker_indices,
+        )
+
+        ## amounts of the inert actors are never written after the buffers are allocated
+        stETH_amounts = self.scratch.get("stETH_amounts", self.stETH.dtype, fill_value=0)
+        wstETH_amounts = self.scratch.get("wstETH_amounts", self.wstETH.dtype, fill_value=0)
+        np.put(stETH_amounts, active_indices, 0, mode="clip")
+        np.put(wstETH_amounts, active_indices, 0, mode="clip")
+
+        self._put_active_amounts(stETH_amounts, self.stETH, balance_indices[:balance_count])
+        self._put_active_amounts(wstETH_amounts, self.wstETH, balance_indices[:balance_count])
+        self._put_active_amounts(stETH_amounts, self.stETH_locked, unlock_indices[:unlock_count], negative=True)
+        self._put_active_amounts(wstETH_amounts, self.wstETH_locked, unlock_indices[:unlock_count], negative=True)
+
+        if attacker_count > 0:
+            self._set_attacker_lock_amounts(
+                dual_governance, attacker_indices[:attacker_count], stETH_amounts, wstETH_amounts
+            )
+
+        return reactions, stETH_amounts, wstETH_amounts
+
+    def _get_active_lock_flags(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Whether the actors of the active partition have locked funds, and whether they have none"""
+        stETH_locked = np.take(
+            self.stETH_locked,
+            self.active_indices,
+            out=self.active_scratch.get("stETH_locked", self.stETH_locked.dtype),
+            mode="clip",
+        )
+        wstETH_locked = np.take(
+            self.wstETH_locked,
+            self.active_indices,
+            out=self.active_scratch.get("wstETH_locked", self.wstETH_locked.dtype),
+            mode="clip",
+        )
+        condition = self.active_scratch.get("lock_condition", np.bool_)
+
+        locked = np.greater(stETH_locked, 0, out=self.active_scratch.get("locked", np.bool_))
+        np.logical_or(locked, np.greater(wstETH_locked, 0, out=condition), out=locked)
+
+        unlocked = np.equal(stETH_locked, 0, out=self.active_scratch.get("unlocked", np.bool_))
+        np.logical_and(unlocked, np.equal(wstETH_locked, 0, out=condition), out=unlocked)
+
+        return locked, unlocked
+
+    def _put_active_amounts(self, amounts: np.ndarray, source: np.ndarray, indices: np.ndarray, negative=False):
+        """Writes the values of `source`, or their negation, at `indices` into `amounts`"""
+        values = np.take(
+            source, indices, out=self.active_scratch.get("values", source.dtype)[: len(indices)], mode="clip"
+        )
+        if negative:
+            np.negative(values, out=values)
+
+        np.put(amounts, indices, values, mode="clip")
+
+    def _get_due_mask(self, dual_governance: DualGovernance) -> np.ndarray:
+        """Actors that didn't quit and whose next HP check is due"""
+        mask = np.less_equal(
+            self.next_hp_check_timestamp,
+            dual_governance.time_manager.get_current_timestamp(),
+            out=self._get_mask_buffer("reaction_mask"),
+        )
+        return self.exclude_quit_actors(mask, out=mask)
+
+    def _has_actor_type(self, actor_type: ActorType) -> bool:
+        """Whether the active partition has actors of `actor_type`"""
+        return actor_type.value in self.active_actor_types
+
     def get_reactions_based_on_hp(self, mask: np.ndarray):
-        reactions = np.zeros(self.amount, dtype=np.uint8)
-        reactions[:] = ActorReaction.NoReaction.value
-        reactions[(self.health > 0) & (self.hypothetical_health > 0) & mask] = ActorReaction.Unlock.value
-        reactions[(self.health > 0) & (self.hypothetical_health <= 0) & mask] = ActorReaction.Lock.value
-        reactions[(self.health <= 0) & (self.hypothetical_health > 0) & mask] = ActorReaction.Unlock.value
-        reactions[(self.health <= 0) & (self.hypothetical_health <= 0) & mask] = ActorReaction.Quit.value
+        reactions = self.scratch.get("reactions", np.uint8)
+        reactions.fill(ActorReaction.NoReaction.value)
+
+        healthy = np.greater(self.health, 0, out=self._get_mask_buffer("healthy"))
+        unhealthy = np.less_equal(self.health, 0, out=self._get_mask_buffer("unhealthy"))
+        hypothetically_healthy = np.greater(
+            self.hypothetical_health, 0, out=self._get_mask_buffer("hypothetically_healthy")
+        )
+        hypothetically_unhealthy = np.less_equal(
+            self.hypothetical_health, 0, out=self._get_mask_buffer("hypothetically_unhealthy")
+        )
+
+        selected = self._get_mask_buffer("selection")
+        for health_condition, hypothetical_condition, reaction in (
+            (healthy, hypothetically_healthy, ActorReaction.Unlock),
+            (healthy, hypothetically_unhealthy, ActorReaction.Lock),
+            (unhealthy, hypothetically_healthy, ActorReaction.Unlock),
+            (unhealthy, hypothetically_unhealthy, ActorReaction.Quit),
+        ):
+            np.logical_and(health_condition, hypothetical_condition, out=selected)
+            np.logical_and(selected, mask, out=selected)
+            np.copyto(reactions, reaction.value, where=selected)
+
         return reactions
 
     def correct_reactions(
@@ -366,20 +628,25 @@ class Actors:
         reactions: np.ndarray,
         mask: np.ndarray,
     ):
-        already_unlocked_mask = mask * (self.stETH_locked == 0) & (self.wstETH_locked == 0) * (
-            reactions == ActorReaction.Unlock.value
-        )
-        reactions[already_unlocked_mask] = ActorReaction.NoAction.value
-        already_locked_mask = (
-            mask
-            * ((self.stETH_locked > 0) | (self.wstETH_locked > 0))
-            * (reactions == ActorReaction.Lock.value)
-            * ~((scenario == Scenario.RageQuitLoop) & (self.actor_type == ActorType.CoordinatedAttacker.value))
+        selected = self._get_mask_buffer("selection")
+
+        already_unlocked_mask = self._select_unlocked(mask, out=selected)
+        already_unlocked_mask = self._select_reaction(
+            reactions, ActorReaction.Unlock, already_unlocked_mask, out=selected
         )
-        reactions[already_locked_mask] = ActorReaction.NoAction.value
+        np.copyto(reactions, ActorReaction.NoAction.value, where=already_unlocked_mask)
+
+        already_locked_mask = self._select_locked(mask, out=selected)
+        already_locked_mask = self._select_reaction(reactions, ActorReaction.Lock, already_locked_mask, out=selected)
+        if scenario == Scenario.RageQuitLoop:
+            already_locked_mask = self._exclude_actor_type(
+                ActorType.CoordinatedAttacker, already_locked_mask, out=selected
+            )
+        np.copyto(reactions, ActorReaction.NoAction.value, where=already_locked_mask)
+
         if dual_governance.get_current_state() == State.RageQuit:
-            mask1 = mask * ((reactions == ActorReaction.Unlock.value) + (reactions == ActorReaction.Quit.value))
-            reactions[mask1] = ActorReaction.NoAction.value
+            mask1 = self._select_unlock_or_quit(reactions, mask, out=selected)
+            np.copyto(reactions, ActorReaction.NoAction.value, where=mask1)
 
     def update_next_hp_check_timestamp(
         self,
@@ -406,73 +673,87 @@ class Actors:
         reactions: np.ndarray,
         mask: np.ndarray,
     ) -> Tuple[np.ndarray, np.ndarray]:
-        stETH_amounts = np.zeros_like(self.stETH)
-        wstETH_amounts = np.zeros_like(self.wstETH)
+        stETH_amounts, wstETH_amounts = self._get_lock_amount_buffers()
+
+        selected = self._get_mask_buffer("selection")
 
-        normal_lock_mask = (
-            mask & (reactions == ActorReaction.Lock.value) & (self.actor_type != ActorType.CoordinatedAttacker.value)
+        normal_lock_mask = self._select_reaction(reactions, ActorReaction.Lock, mask, out=selected)
+        normal_lock_mask = self._exclude_actor_type(ActorType.CoordinatedAttacker, normal_lock_mask, out=selected)
+        np.copyto(stETH_amounts, self.stETH, where=normal_lock_mask)
+        np.copyto(wstETH_amounts, self.wstETH, where=normal_lock_mask)
+
+        coordinated_lock_mask = self._select_reaction(reactions, ActorReaction.Lock, mask, out=selected)
+        coordinated_lock_mask = self._select_actor_type(
+            ActorType.CoordinatedAttacker, coordinated_lock_mask, out=selected
         )
-        stETH_amounts[normal_lock_mask] = self.stETH[normal_lock_mask]
-        wstETH_amounts[normal_lock_mask] = self.wstETH[normal_lock_mask]
 
         if scenario == Scenario.RageQuitLoop:
-            coordinated_attacker_mask = (
-                mask
-                & (reactions == ActorReaction.Lock.value)
-                & (self.actor_type == ActorType.CoordinatedAttacker.value)
-            )
-            if np.any(coordinated_attacker_mask):
-                current_support = dual_governance.state.signalling_escrow.get_rage_quit_support()
-                total_supply = dual_governance.state.signalling_escrow.lido.get_total_supply()
-                needed_support = 0
+            if np.any(coordinated_lock_mask):
+                self._set_attacker_lock_amounts(
+                    dual_governance, np.flatnonzero(coordinated_lock_mask), stETH_amounts, wstETH_amounts
+                )
 
-                if dual_governance.state.state != State.RageQuit:
-                    needed_support = dual_governance.state.config.second_seal_rage_quit_support - current_support
-                elif dual_governance.state.state == State.RageQuit:
-                    needed_support = dual_governance.state.config.first_seal_rage_quit_support - current_support
+        else:
+            np.copyto(stETH_amounts, self.stETH, where=coordinated_lock_mask)
+            np.copyto(wstETH_amounts, self.wstETH, where=coordinated_lock_mask)
+
+        unlock_mask = self._select_unlock_or_quit(reactions, mask, out=selected)
+        np.negative(self.stETH_locked, out=stETH_amounts, where=unlock_mask)
+        np.negative(self.wstETH_locked, out=wstETH_amounts, where=unlock_mask)
+
+        return stETH_amounts, wstETH_amounts
 
-                needed_funds = (needed_support * total_supply) // 10**18
-                actor_indices = np.where(coordinated_attacker_mask)[0]
+    def _get_lock_amount_buffers(self) -> Tuple[np.ndarray, np.ndarray]:
+        stETH_amounts = self.scratch.get("stETH_amounts", self.stETH.dtype)
+        wstETH_amounts = self.scratch.get("wstETH_amounts", self.wstETH.dtype)
+        stETH_amounts.fill(0)
+        wstETH_amounts.fill(0)
 
-                remaining_needed = needed_funds
+        return stETH_amounts, wstETH_amounts
 
-                if remaining_needed > 0:
-                    for actor_idx in actor_indices:
-                        available_stETH = self.stETH[actor_idx]
+    def _set_attacker_lock_amounts(
+        self,
+        dual_governance: DualGovernance,
+        actor_indices: np.ndarray,
+        stETH_amounts: np.ndarray,
+        wstETH_amounts: np.ndarray,
+    ):
+        """Lock amounts of the attackers at `actor_indices` to reach the next rage quit support threshold"""
+        if dual_governance.state.state != State.RageQuit:
+            threshold = dual_governance.state.config.second_seal_rage_quit_support
+        else:
+            threshold = dual_governance.state.config.first_seal_rage_quit_support
 
-                        if available_stETH > 0:
-                            stETH_to_lock = min(available_stETH, remaining_needed)
-                            stETH_amounts[actor_idx] = stETH_to_lock
-                            remaining_needed -= stETH_to_lock
+        needed_funds = self._get_needed_rage_quit_funds(dual_governance, threshold)
 
-                            if remaining_needed <= 0:
-                                break
+        if needed_funds > 0:
+            stETH_to_lock, wstETH_to_lock = self._allocate_attacker_funds(actor_indices, needed_funds)
+            stETH_amounts[actor_indices] = stETH_to_lock
+            wstETH_amounts[actor_indices] = wstETH_to_lock
 
-                            if remaining_needed > 0:
-                                available_wstETH = self.wstETH[actor_idx]
+    def _allocate_attacker_funds(self, actor_indices: np.ndarray, needed_funds: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Splits `needed_funds` over the stETH and wstETH of the attackers at `actor_indices`, taking each attacker's
+        stETH and then its wstETH in order until the funds are covered. The wstETH of an attacker without stETH is
+        never used.
+        """
+        stETH = self.stETH[actor_indices]
+        wstETH = self.wstETH[actor_indices]
 
-                                if available_wstETH > 0:
-                                    wstETH_to_lock = min(available_wstETH, remaining_needed)
-                                    wstETH_amounts[actor_idx] = wstETH_to_lock
-                                    remaining_needed -= wstETH_to_lock
+        available = np.zeros(2 * len(actor_indices), dtype=object)
+        available[0::2] = np.where(stETH > 0, stETH, 0)
+        available[1::2] = np.where((stETH > 0) & (wstETH > 0), wstETH, 0)
 
-                                    if remaining_needed <= 0:
-                                        break
+        allocated = allocate_up_to(available, needed_funds)
 
-        else:
-            coordinated_lock_mask = (
-                mask
-                & (reactions == ActorReaction.Lock.value)
-                & (self.actor_type == ActorType.CoordinatedAttacker.value)
-            )
-            stETH_amounts[coordinated_lock_mask] = self.stETH[coordinated_lock_mask]
-            wstETH_amounts[coordinated_lock_mask] = self.wstETH[coordinated_lock_mask]
+        return allocated[0::2], allocated[1::2]
 
-        unlock_mask = mask & ((reactions == ActorReaction.Unlock.value) + (reactions == ActorReaction.Quit.value))
-        stETH_amounts[unlock_mask] = -self.stETH_locked[unlock_mask]
-        wstETH_amounts[unlock_mask] = -self.wstETH_locked[unlock_mask]
+    def _get_needed_rage_quit_funds(self, dual_governance: DualGovernance, threshold: int) -> int:
+        """Funds the signalling escrow lacks to reach the rage quit support `threshold`"""
+        current_support = dual_governance.state.signalling_escrow.get_rage_quit_support()
+        total_supply = dual_governance.state.signalling_escrow.lido.get_total_supply()
 
-        return stETH_amounts, wstETH_amounts
+        return ((threshold - current_support) * total_supply) // 10**18
 
     ## ---
     ## Honest actors implementation
@@ -499,29 +780,33 @@ class Actors:
         reactions: np.ndarray,
         mask: np.ndarray,
     ):
-        mask1 = mask * (self.actor_type == ActorType.SingleDefender.value)
+        mask1 = self._select_actor_type(ActorType.SingleDefender, mask, out=self._get_mask_buffer("defender_mask"))
         if not np.any(mask1):
             return
 
         if not proposals:
             return
+
+        selected = self._get_mask_buffer("selection")
+
+        if self._are_negative_proposals_canceled(dual_governance, proposals):
+            locked_mask = self._select_locked(mask1, out=selected)
+            np.copyto(reactions, ActorReaction.Unlock.value, where=locked_mask)
+
+        else:
+            unlocked_mask = self._select_unlocked(mask1, out=selected)
+            np.copyto(reactions, ActorReaction.Lock.value, where=unlocked_mask)
+
+    def _are_negative_proposals_canceled(self, dual_governance: DualGovernance, proposals: List[Proposal]) -> bool:
         timelock_proposals = dual_governance.timelock.proposals
         negative_types = {ProposalType.Negative, ProposalType.Danger, ProposalType.Hack}
 
-        all_negative_proposals_canceled = all(
+        return all(
             timelock_proposals._is_proposal_marked_cancelled(proposal.id)
             for proposal in proposals
             if proposal.proposal_type in negative_types
         )
 
-        if all_negative_proposals_canceled:
-            locked_mask = mask1 & ((self.stETH_locked > 0) | (self.wstETH_locked > 0))
-            reactions[locked_mask] = ActorReaction.Unlock.value
-
-        else:
-            unlocked_mask = mask1 & (self.stETH_locked == 0) & (self.wstETH_locked == 0)
-            reactions[unlocked_mask] = ActorReaction.Lock.value
-
     ## ---
     ## Attackers actors implementation
     ## ---
@@ -534,11 +819,13 @@ class Actors:
         reactions: np.ndarray,
         mask: np.ndarray,
     ):
-        coordinated_attacker_mask = mask & (self.actor_type == ActorType.CoordinatedAttacker.value)
+        coordinated_attacker_mask = self._select_actor_type(
+            ActorType.CoordinatedAttacker, mask, out=self._get_mask_buffer("attacker_mask")
+        )
         if not np.any(coordinated_attacker_mask):
             return
 
-        reactions[coordinated_attacker_mask] = ActorReaction.NoAction.value
+        np.copyto(reactions, ActorReaction.NoAction.value, where=coordinated_attacker_mask)
 
         if scenario in [Scenario.VetoSignallingLoop, Scenario.ConstantVetoSignallingLoop]:
             self._handle_veto_signalling_loop(dual_governance, proposals, reactions, coordinated_attacker_mask)
@@ -554,69 +841,61 @@ class Actors:
         if not proposals:
             return
 
+        selected = self._get_mask_buffer("selection")
+
+        if self._are_positive_proposals_pending(dual_governance, proposals):
+            unlocked_mask = self._select_unlocked(mask, out=selected)
+            np.copyto(reactions, ActorReaction.Lock.value, where=unlocked_mask)
+        else:
+            locked_mask = self._select_locked(mask, out=selected)
+            np.copyto(reactions, ActorReaction.Unlock.value, where=locked_mask)
+
+    def _are_positive_proposals_pending(self, dual_governance: DualGovernance, proposals: List[Proposal]) -> bool:
         timelock_proposals = dual_governance.timelock.proposals
         proposal_status = dual_governance.timelock.get_proposal_status
         positive_types = {ProposalType.Positive, ProposalType.NoImpact, ProposalType.Random}
 
-        positive_proposals_pending = any(
+        return any(
             not timelock_proposals._is_proposal_marked_cancelled(p.id)
             and proposal_status(p.id) is not ProposalStatus.Executed
             for p in proposals
             if p.proposal_type in positive_types
         )
 
-        if positive_proposals_pending:
-            unlocked_mask = mask & (self.stETH_locked == 0) & (self.wstETH_locked == 0)
-            reactions[unlocked_mask] = ActorReaction.Lock.value
-        else:
-            locked_mask = mask & ((self.stETH_locked > 0) | (self.wstETH_locked > 0))
-            reactions[locked_mask] = ActorReaction.Unlock.value
-
     def _handle_rage_quit_loop(
         self, dual_governance: DualGovernance, proposals: List[Proposal], reactions: np.ndarray, mask: np.ndarray
     ):
         if not proposals:
             return
 
+        if self._should_attackers_lock(dual_governance, mask):
+            np.copyto(reactions, ActorReaction.Lock.value, where=mask)
+
+    def _should_attackers_lock(self, dual_governance: DualGovernance, mask: np.ndarray) -> bool:
+        """Whether the funds of the attackers of `mask` are enough to reach the next rage quit support threshold"""
         current_state = dual_governance.get_current_state()
         if current_state == State.RageQuit:
             current_support = dual_governance.state.signalling_escrow.get_rage_quit_support()
             first_seal_threshold = dual_governance.state.config.first_seal_rage_quit_support
 
             if current_support >= first_seal_threshold:
-                return
-
-            attacker_stETH = np.sum(self.stETH[mask])
-            attacker_wstETH = np.sum(self.wstETH[mask])
-            attacker_funds = attacker_stETH + attacker_wstETH
+                return False
 
-            total_supply = dual_governance.state.signalling_escrow.lido.get_total_supply()
-            needed_support = first_seal_threshold - current_support
-            needed_funds = (needed_support * total_supply) // 10**18
+            attacker_funds = np.sum(self.stETH[mask]) + np.sum(self.wstETH[mask])
+            needed_funds = self._get_needed_rage_quit_funds(dual_governance, first_seal_threshold)
 
-            if attacker_funds >= needed_funds:
-                reactions[mask] = ActorReaction.Lock.value
-
-            return
+            return attacker_funds >= needed_funds
 
         if current_state == State.VetoSignalling:
             current_support = dual_governance.state.signalling_escrow.get_rage_quit_support()
             if dual_governance.state._is_second_seal_rage_quit_support_crossed(current_support):
-                return
-
-        attacker_stETH = np.sum(self.stETH[mask])
-        attacker_wstETH = np.sum(self.wstETH[mask])
-        attacker_funds = attacker_stETH + attacker_wstETH
+                return False
 
         attacker_funds = np.sum(self.stETH[mask] + self.wstETH[mask])
-        current_support = dual_governance.state.signalling_escrow.get_rage_quit_support()
         second_seal_threshold = dual_governance.state.config.second_seal_rage_quit_support
-        needed_support = second_seal_threshold - current_support
-        total_supply = dual_governance.state.signalling_escrow.lido.get_total_supply()
+        needed_funds = self._get_needed_rage_quit_funds(dual_governance, second_seal_threshold)
 
-        needed_funds = (needed_support * total_supply) // 10**18
-        if attacker_funds >= needed_funds:
-            reactions[mask] = ActorReaction.Lock.value
+        return attacker_funds >= needed_funds
 
     def register_eth_withdrawals(self, eth_amounts: np.ndarray, withdrawal_mask: np.ndarray):
         """Register ETH withdrawals for multiple actors in a single operation"""
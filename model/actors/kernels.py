@@ -0,0 +1,116 @@
+import numba
+import numpy as np
+
+from model.types.actors import ActorReaction, ActorType
+
+NO_REACTION = ActorReaction.NoReaction.value
+NO_ACTION = ActorReaction.NoAction.value
+LOCK = ActorReaction.Lock.value
+UNLOCK = ActorReaction.Unlock.value
+QUIT = ActorReaction.Quit.value
+
+SINGLE_DEFENDER = ActorType.SingleDefender.value
+COORDINATED_ATTACKER = ActorType.CoordinatedAttacker.value
+
+## Corrections of the reactions of due single defenders and coordinated attackers, decided once per tick
+NO_CORRECTION = 0
+LOCK_UNLOCKED = 1
+UNLOCK_LOCKED = 2
+LOCK_ALL = 3
+
+
+def _calculate_reactions_impl(
+    active_indices: np.ndarray,
+    next_hp_check_timestamp: np.ndarray,
+    current_timestamp: int,
+    did_quit: np.ndarray,
+    health: np.ndarray,
+    hypothetical_health: np.ndarray,
+    actor_type: np.ndarray,
+    locked: np.ndarray,
+    unlocked: np.ndarray,
+    defender_correction: int,
+    attacker_correction: int,
+    is_rage_quit_loop: bool,
+    is_rage_quit_state: bool,
+    reactions: np.ndarray,
+    balance_indices: np.ndarray,
+    unlock_indices: np.ndarray,
+    attacker_indices: np.ndarray,
+):
+    """
+    Single pass version of `Actors.get_reactions_based_on_hp`, `Actors.correct_reactions` and
+    `Actors.calculate_lock_amount` over the actors at `active_indices`, the reactions of the other actors are left
+    as they are. `locked` and `unlocked` hold the flags of the active actors in the order of `active_indices`.
+
+    Balances may be Python ints, which can't be used in nopython mode, so instead of the lock amounts it writes the
+    indices of the actors locking their balances to `balance_indices`, of the actors unlocking their locked funds
+    to `unlock_indices` and of the attackers whose lock amounts are allocated to `attacker_indices`, and returns how
+    many indices it wrote to each of them.
+    """
+    balance_count = 0
+    unlock_count = 0
+    attacker_count = 0
+
+    for position in range(len(active_indices)):
+        i = active_indices[position]
+        reactions[i] = NO_REACTION
+
+        if not next_hp_check_timestamp[i] <= current_timestamp or did_quit[i]:
+            continue
+
+        reaction = NO_REACTION
+        if health[i] > 0:
+            if hypothetical_health[i] > 0:
+                reaction = UNLOCK
+            elif hypothetical_health[i] <= 0:
+                reaction = LOCK
+        elif health[i] <= 0:
+            if hypothetical_health[i] > 0:
+                reaction = UNLOCK
+            elif hypothetical_health[i] <= 0:
+                reaction = QUIT
+
+        is_coordinated_attacker = actor_type[i] == COORDINATED_ATTACKER
+
+        if actor_type[i] == SINGLE_DEFENDER:
+            if defender_correction == UNLOCK_LOCKED and locked[position]:
+                reaction = UNLOCK
+            elif defender_correction == LOCK_UNLOCKED and unlocked[position]:
+                reaction = LOCK
+
+        elif is_coordinated_attacker:
+            reaction = NO_ACTION
+
+            if attacker_correction == LOCK_ALL:
+                reaction = LOCK
+            elif attacker_correction == UNLOCK_LOCKED and locked[position]:
+                reaction = UNLOCK
+            elif attacker_correction == LOCK_UNLOCKED and unlocked[position]:
+                reaction = LOCK
+
+        if reaction == UNLOCK and unlocked[position]:
+            reaction = NO_ACTION
+        if reaction == LOCK and locked[position] and not (is_rage_quit_loop and is_coordinated_attacker):
+            reaction = NO_ACTION
+        if is_rage_quit_state and (reaction == UNLOCK or reaction == QUIT):
+            reaction = NO_ACTION
+
+        reactions[i] = reaction
+
+        if reaction == LOCK:
+            if is_rage_quit_loop and is_coordinated_attacker:
+                attacker_indices[attacker_count] = i
+                attacker_count += 1
+            else:
+                balance_indices[balance_count] = i
+                balance_count += 1
+        elif reaction == UNLOCK or reaction == QUIT:
+            unlock_indices[unlock_count] = i
+            unlock_count += 1
+
+    return balance_count, unlock_count, attacker_count
+
+
+## fastmath is left off, NaN hypothetical health has to compare the same way as in NumPy
+calculate_reactions = numba.jit(nopython=True, cache=True)(_calculate_reactions_impl)
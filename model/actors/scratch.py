@@ -0,0 +1,75 @@
+import os
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator
+
+import numpy as np
+
+DEBUG_ALLOCATIONS_ENV_VARIABLE = "DG_MODEL_DEBUG_ALLOCATIONS"
+
+
+class ScratchBuffers:
+    """
+    Named arrays of the actors population size reused by the per-tick kernels of `Actors`.
+
+    A buffer is allocated the first time its name is requested, or again if it's requested with another dtype, and
+    `allocations` counts these allocations, so it stops growing once every kernel ran at least once. Buffers are
+    dropped when the actors are copied or pickled and are allocated again by the copy on first use. The contents of
+    a buffer are only valid until the next kernel writing to it, so results returned from a buffer have to be used
+    before the next tick.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buffers: Dict[str, np.ndarray] = {}
+        self.allocations = 0
+
+    def get(self, name: str, dtype, fill_value=None) -> np.ndarray:
+        """Buffer `name` of `dtype`, filled with `fill_value` when it's allocated if given"""
+        buffer = self.buffers.get(name)
+
+        if buffer is None or buffer.dtype != dtype:
+            buffer = self.buffers[name] = np.empty(self.size, dtype=dtype)
+            self.allocations += 1
+
+            if fill_value is not None:
+                buffer.fill(fill_value)
+
+        return buffer
+
+    def __getstate__(self):
+        return {"size": self.size, "buffers": {}, "allocations": self.allocations}
+
+
+@dataclass
+class AllocationPeak:
+    bytes: int = 0
+
+
+@contextmanager
+def track_peak_allocation() -> Iterator[AllocationPeak]:
+    """
+    Measures the peak of the memory allocated inside the block above the memory allocated before it, including NumPy
+    arrays. A block that allocates no temporary array of the population size keeps the peak below the size of a
+    boolean array of the population. Tracing slows everything down, so it's meant for tests and debugging only.
+    """
+    peak = AllocationPeak()
+    was_tracing = tracemalloc.is_tracing()
+
+    if not was_tracing:
+        tracemalloc.start()
+
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        yield peak
+        _, end_peak = tracemalloc.get_traced_memory()
+        peak.bytes = end_peak - start
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def is_debug_allocations_enabled() -> bool:
+    return os.environ.get(DEBUG_ALLOCATIONS_ENV_VARIABLE, "") not in ("", "0")
@@ -71,7 +71,11 @@ def actor_submit_proposals(params, substep, state_history, prev_state, policy_in
     dual_governance: DualGovernance = prev_state["dual_governance"]
     reaction_delay_generator: ReactionDelayGenerator = prev_state["reaction_delay_generator"]
 
-    actors = actor_update_health(dual_governance, scenario, proposals, actors, attackers, reaction_delay_generator)
+    batched: bool = prev_state.get("batch_proposals", False)
+
+    actors = actor_update_health(
+        dual_governance, scenario, proposals, actors, attackers, reaction_delay_generator, batched
+    )
 
     return "actors", actors
 
@@ -83,63 +87,100 @@ def actor_update_health(
     actors: Actors,
     attackers: Set[str],
     reaction_delay_generator: ReactionDelayGenerator,
+    batched: bool = False,
 ):
+    """
+    Applies the effects and the damage of newly registered proposals to the actors.
+
+    With `batched` the damage of all proposals is applied in one pass by `Actors.apply_proposals_damage`, so each
+    damaged actor and each loop attacker draws its next reaction delay once per batch instead of once per proposal.
+    Balance changes are still simulated proposal by proposal, since every proposal moves the funds left by the
+    previous one.
+    """
+    loop_scenarios = [Scenario.VetoSignallingLoop, Scenario.ConstantVetoSignallingLoop, Scenario.RageQuitLoop]
+    batched_proposals = []
+    batched_masks = []
+
     for proposal in proposals:
-        if scenario in [
-            Scenario.HappyPath,
-            Scenario.VetoSignallingLoop,
-            Scenario.ConstantVetoSignallingLoop,
-            Scenario.RageQuitLoop,
-        ]:
-            mask = (actors.actor_type == ActorType.HonestActor.value) * (actors.entity != "Contract") + np.isin(
-                actors.actor_type, [ActorType.SingleDefender.value, ActorType.CoordinatedDefender.value]
-            )
+        masks = get_proposal_masks(scenario, proposal, actors, attackers)
+        if masks is None:
+            continue
 
-            actors.simulate_proposal_effect(proposal, mask)
-            actors.apply_proposal_damage(
-                reaction_delay_generator, dual_governance.time_manager.get_current_timestamp(), proposal, mask
-            )
+        victims_mask, attackers_mask, damage_mask = masks
+        actors.simulate_proposal_effect(proposal, victims_mask, attackers_mask)
+
+        if batched:
+            batched_proposals.append(proposal)
+            batched_masks.append(damage_mask)
+            continue
 
+        actors.apply_proposal_damage(
+            reaction_delay_generator, dual_governance.time_manager.get_current_timestamp(), proposal, damage_mask
+        )
+
+        if scenario == Scenario.HappyPath or scenario in loop_scenarios:
             ## Update reaction delay for attackers in veto signalling loop attacks
-            mask2 = (
-                scenario in [Scenario.VetoSignallingLoop, Scenario.ConstantVetoSignallingLoop, Scenario.RageQuitLoop]
-            ) * np.isin(actors.address, list(attackers))
+            mask2 = (scenario in loop_scenarios) * np.isin(actors.address, list(attackers))
             actors.update_next_hp_check_timestamp(
                 reaction_delay_generator, dual_governance.time_manager.get_current_timestamp(), mask2
             )
 
-        elif scenario in (Scenario.SingleAttack, Scenario.CoordinatedAttack):
-            victims_mask = proposal.get_victims_mask(actors, include_contracts=True)
+    if batched_proposals:
+        actors.apply_proposals_damage(
+            reaction_delay_generator,
+            dual_governance.time_manager.get_current_timestamp(),
+            batched_proposals,
+            batched_masks,
+        )
+
+        if scenario in loop_scenarios:
+            actors.update_next_hp_check_timestamp(
+                reaction_delay_generator,
+                dual_governance.time_manager.get_current_timestamp(),
+                np.isin(actors.address, list(attackers)),
+            )
+
+    return actors
 
-            attackers_mask = np.zeros(actors.amount, dtype=bool)
 
-            if scenario == Scenario.CoordinatedAttack:
-                attackers_mask = np.isin(actors.address, list(attackers))
-            elif scenario == Scenario.SingleAttack:
-                if proposal.proposer in attackers:
-                    attackers_mask = actors.address == proposal.proposer
+def get_proposal_masks(scenario: Scenario, proposal: Proposal, actors: Actors, attackers: Set[str]):
+    """Returns the victims, attackers and damage masks of a proposal, or None if the scenario has no proposal effects"""
+    if scenario in [
+        Scenario.HappyPath,
+        Scenario.VetoSignallingLoop,
+        Scenario.ConstantVetoSignallingLoop,
+        Scenario.RageQuitLoop,
+    ]:
+        mask = (actors.actor_type == ActorType.HonestActor.value) * (actors.entity != "Contract") + np.isin(
+            actors.actor_type, [ActorType.SingleDefender.value, ActorType.CoordinatedDefender.value]
+        )
 
-            if np.any(victims_mask & attackers_mask):
-                print("WARNING: Found overlap between victims and attackers!")
-                print("Fixing by removing overlapping actors from victims...")
-                victims_mask &= ~attackers_mask
+        return mask, None, mask
 
-            actors.simulate_proposal_effect(
-                proposal=proposal,
-                victims_mask=victims_mask,
-                attackers_mask=attackers_mask,
-            )
+    elif scenario in (Scenario.SingleAttack, Scenario.CoordinatedAttack):
+        victims_mask = proposal.get_victims_mask(actors, include_contracts=True)
 
-            damage_mask = (
-                (actors.actor_type == ActorType.HonestActor.value) * (actors.entity != "Contract")
-                + np.isin(actors.actor_type, [ActorType.SingleDefender.value, ActorType.CoordinatedDefender.value])
-            ) & ~attackers_mask
+        attackers_mask = np.zeros(actors.amount, dtype=bool)
 
-            actors.apply_proposal_damage(
-                reaction_delay_generator, dual_governance.time_manager.get_current_timestamp(), proposal, damage_mask
-            )
+        if scenario == Scenario.CoordinatedAttack:
+            attackers_mask = np.isin(actors.address, list(attackers))
+        elif scenario == Scenario.SingleAttack:
+            if proposal.proposer in attackers:
+                attackers_mask = actors.address == proposal.proposer
 
-    return actors
+        if np.any(victims_mask & attackers_mask):
+            print("WARNING: Found overlap between victims and attackers!")
+            print("Fixing by removing overlapping actors from victims...")
+            victims_mask &= ~attackers_mask
+
+        damage_mask = (
+            (actors.actor_type == ActorType.HonestActor.value) * (actors.entity != "Contract")
+            + np.isin(actors.actor_type, [ActorType.SingleDefender.value, ActorType.CoordinatedDefender.value])
+        ) & ~attackers_mask
+
+        return victims_mask, attackers_mask, damage_mask
+
+    return None
 
 
 ## ---
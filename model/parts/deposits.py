@@ -3,6 +3,7 @@ from datetime import date
 import numpy as np
 
 from model.actors.actors import Actors
+from model.utils.numbers import allocate_up_to
 from specs.dual_governance import DualGovernance
 from specs.lido import Lido
 from specs.time_manager import TimeManager
@@ -27,29 +28,34 @@ def calculate_deposit_amounts(params, substep, state_history, prev_state):
     if not np.any(eth_balance_mask):
         return {"deposit_data": None}
 
-    deposits_to_process = []
-    total_to_deposit = 0
+    actor_indices, amounts = allocate_deposits(actors.eth_balance, eth_balance_mask, deposit_cap)
+    total_to_deposit = amounts.sum() if len(amounts) > 0 else 0
 
-    for idx in np.where(eth_balance_mask)[0]:
-        if total_to_deposit >= deposit_cap:
-            # print(f"→ Reached daily deposit cap ({deposit_cap / 10**18} ETH)")
-            break
+    if len(actor_indices) > 0:
+        dual_governance.last_deposit_day = current_day
 
-        amount_to_deposit = min(actors.eth_balance[idx], deposit_cap - total_to_deposit)
+    return {
+        "deposit_data": {
+            "actor_indices": actor_indices,
+            "amounts": amounts,
+            "total_amount": total_to_deposit,
+            "current_day": current_day,
+        }
+    }
 
-        if amount_to_deposit <= 0:
-            continue
 
-        deposits_to_process.append({"actor_address": actors.address[idx], "amount": amount_to_deposit})
-        total_to_deposit += amount_to_deposit
-        # print(f"Added deposit: {actors.address[idx]}, amount {amount_to_deposit / 10**18} ETH")
+def allocate_deposits(eth_balance: np.ndarray, eth_balance_mask: np.ndarray, deposit_cap: int):
+    """
+    Fills the daily deposit cap with the ETH balances of the actors in `eth_balance_mask`, in actor order.
 
-    if deposits_to_process:
-        dual_governance.last_deposit_day = current_day
+    Every actor deposits its whole balance while the running total stays under the cap, the actor crossing the cap
+    deposits what is left of it and the later actors wait for the next day.
+    """
+    eligible_indices = np.flatnonzero(eth_balance_mask)
+    amounts = allocate_up_to(eth_balance[eligible_indices], deposit_cap)
+    depositing = amounts > 0
 
-    return {
-        "deposit_data": {"deposits": deposits_to_process, "total_amount": total_to_deposit, "current_day": current_day}
-    }
+    return eligible_indices[depositing], amounts[depositing]
 
 
 def process_deposits(params, substep, state_history, prev_state, policy_input):
@@ -61,21 +67,19 @@ def process_deposits(params, substep, state_history, prev_state, policy_input):
     if deposit_data is None:
         return ("dual_governance", dual_governance)
 
-    # print(f"Processing {len(deposit_data['deposits'])} deposits")
-    # print(f"Total amount to process: {deposit_data['total_amount'] / 10**18} ETH")
+    actor_indices = deposit_data["actor_indices"]
+    amounts = deposit_data["amounts"]
+
+    if len(actor_indices) > 0:
+        buffered_ether = lido.get_buffered_ether()
+        for actor_address, amount in zip(actors.address[actor_indices], amounts):
+            lido._mint_shares(actor_address, amount)
+        lido.set_buffered_ether(buffered_ether + deposit_data["total_amount"])
 
     deposit_amounts = np.zeros_like(actors.eth_balance)
+    deposit_amounts[actor_indices] = amounts
     deposit_mask = np.zeros_like(actors.eth_balance, dtype=bool)
-
-    for deposit in deposit_data["deposits"]:
-        # print(f"Processing deposit: {deposit['actor_address']}, amount {deposit['amount'] / 10**18} ETH"
-        actor_idx = np.where(actors.address == deposit["actor_address"])[0][0]
-        deposit_amounts[actor_idx] = deposit["amount"]
-        deposit_mask[actor_idx] = True
-
-        buffered_ether = lido.get_buffered_ether()
-        lido._mint_shares(deposit["actor_address"], deposit["amount"])
-        lido.set_buffered_ether(buffered_ether + deposit["amount"])
+    deposit_mask[actor_indices] = True
 
     actors.process_deposits(deposit_amounts, deposit_mask)
 
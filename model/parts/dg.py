@@ -3,7 +3,9 @@ from typing import List
 
 import numpy as np
 
+from model.actors.actors import Actors
 from model.parts.actors import ActorReaction
+from model.types.finalization_schedule import FinalizationSchedule
 from model.utils.numbers import max_withdrawal_per_day
 from specs.dual_governance import DualGovernance
 from specs.dual_governance.state import State
@@ -23,8 +25,18 @@ def update_escrow(params, substep, state_history, prev_state, policy_input):
     delta_staked_by_agent: List[np.ndarray, np.ndarray, np.ndarray] = policy_input["agent_delta_staked"]
     reactions: np.ndarray = policy_input["actor_reactions"]
     dual_governance: DualGovernance = prev_state["dual_governance"]
+    actors: Actors = prev_state["actors"]
 
-    for actor_address, stETH_amount, wstETH_amount, reaction in zip(*delta_staked_by_agent, reactions):
+    ## actors outside of the active partition never react, so their amounts are always zero
+    active_indices = actors.active_indices
+    actor_addresses, stETH_amounts, wstETH_amounts = delta_staked_by_agent
+
+    for actor_address, stETH_amount, wstETH_amount, reaction in zip(
+        actor_addresses[active_indices],
+        stETH_amounts[active_indices],
+        wstETH_amounts[active_indices],
+        reactions[active_indices],
+    ):
         if stETH_amount == 0 and wstETH_amount == 0:
             continue
 
@@ -180,6 +192,7 @@ def calculate_withdrawal_amounts_for_finalization_and_claims(params, substep, st
     last_withdrawal_day: date = prev_state["last_withdrawal_day"]
     churn_rate: int = prev_state["churn_rate"]
     time_manager: TimeManager = prev_state["time_manager"]
+    finalization_schedule: FinalizationSchedule = prev_state["finalization_schedule"]
 
     if dual_governance.state.rage_quit_escrow is None or dual_governance.get_current_state() != State.RageQuit:
         return {"withdrawal_data": None}
@@ -189,8 +202,7 @@ def calculate_withdrawal_amounts_for_finalization_and_claims(params, substep, st
     if len(escrow.withdrawal_queue.requests_by_owner) == 0:
         return {"withdrawal_data": None}
 
-    unstETH_ids = escrow.withdrawal_queue.get_withdrawal_requests(escrow.address)
-    if not unstETH_ids:
+    if not escrow.withdrawal_queue.get_withdrawal_requests(escrow.address):
         return {"withdrawal_data": None}
 
     current_day = time_manager.get_current_time().date()
@@ -199,33 +211,18 @@ def calculate_withdrawal_amounts_for_finalization_and_claims(params, substep, st
         return {"withdrawal_data": None}
 
     daily_withdrawal_limit = max_withdrawal_per_day(churn_rate, lido_exit_share)
-    last_finalized_request = escrow.withdrawal_queue.queue[escrow.withdrawal_queue.last_finalized_request_id]
-
-    withdrawals_to_process = []
-    total_to_finalize = 0
-
-    for unstETH_id in unstETH_ids:
-        if unstETH_id <= escrow.withdrawal_queue.last_finalized_request_id:
-            continue
-
-        if total_to_finalize >= daily_withdrawal_limit:
-            break
-
-        request_to_finalize = escrow.withdrawal_queue.queue[unstETH_id]
-        request_amount = request_to_finalize.cumulative_stETH - last_finalized_request.cumulative_stETH
 
-        if request_amount + total_to_finalize > daily_withdrawal_limit:
-            break
+    if finalization_schedule is None or not finalization_schedule.is_valid_for(escrow, daily_withdrawal_limit):
+        finalization_schedule = FinalizationSchedule.build(escrow, daily_withdrawal_limit)
 
-        withdrawals_to_process.append({"unstETH_id": unstETH_id, "amount": request_amount})
-        total_to_finalize += request_amount
-        last_finalized_request = request_to_finalize
+    unstETH_ids, total_to_finalize = finalization_schedule.next_withdrawals()
 
     return {
         "withdrawal_data": {
-            "withdrawals": withdrawals_to_process,
+            "unstETH_ids": unstETH_ids,
             "total_amount": total_to_finalize,
             "current_day": current_day,
+            "finalization_schedule": finalization_schedule,
         }
     }
 
@@ -233,27 +230,41 @@ def calculate_withdrawal_amounts_for_finalization_and_claims(params, substep, st
 def update_last_withdrawal_day(params, substep, state_history, prev_state, policy_input):
     withdrawal_data = policy_input["withdrawal_data"]
 
-    if withdrawal_data is None or len(withdrawal_data["withdrawals"]) == 0:
+    if withdrawal_data is None or len(withdrawal_data["unstETH_ids"]) == 0:
         return ("last_withdrawal_day", prev_state["last_withdrawal_day"])
 
     return ("last_withdrawal_day", withdrawal_data["current_day"])
 
 
+def update_finalization_schedule(params, substep, state_history, prev_state, policy_input):
+    withdrawal_data = policy_input["withdrawal_data"]
+
+    if withdrawal_data is None:
+        return ("finalization_schedule", prev_state["finalization_schedule"])
+
+    finalization_schedule: FinalizationSchedule = withdrawal_data["finalization_schedule"]
+
+    if len(withdrawal_data["unstETH_ids"]) > 0:
+        finalization_schedule.advance()
+
+    return ("finalization_schedule", finalization_schedule)
+
+
 def process_finalization_and_claims(params, substep, state_history, prev_state, policy_input):
     dual_governance: DualGovernance = prev_state["dual_governance"]
     lido: Lido = prev_state["lido"]
     withdrawal_data = policy_input["withdrawal_data"]
 
-    if withdrawal_data is None or len(withdrawal_data["withdrawals"]) == 0:
+    if withdrawal_data is None or len(withdrawal_data["unstETH_ids"]) == 0:
         return ("dual_governance", dual_governance)
 
     escrow = dual_governance.state.rage_quit_escrow
 
     escrow.withdrawal_queue.finalize(
-        withdrawal_data["withdrawals"][-1]["unstETH_id"], withdrawal_data["total_amount"], 1 * 10**27
+        int(withdrawal_data["unstETH_ids"][-1]), withdrawal_data["total_amount"], 1 * 10**27
     )
 
-    escrow.claim_next_withdrawals_batch(len(withdrawal_data["withdrawals"]))
+    escrow.claim_next_withdrawals_batch(len(withdrawal_data["unstETH_ids"]))
 
     if withdrawal_data["total_amount"] > 0:
         buffered_ether = lido.get_buffered_ether()
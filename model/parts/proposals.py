@@ -3,7 +3,14 @@ from typing import List, Set
 
 from model.sys_params import cancellation_delay_days
 from model.types.proposal_type import ProposalGeneration
-from model.types.proposals import Proposal, ProposalType, get_proposal_by_id, new_proposal
+from model.types.proposals import (
+    Proposal,
+    ProposalList,
+    ProposalType,
+    get_proposal_by_id,
+    get_proposals_by_timestep,
+    new_proposal,
+)
 from model.types.scenario import Scenario
 from model.utils.proposals import iterable_proposals
 from model.utils.proposals_queue import ProposalQueueManager
@@ -41,7 +48,7 @@ def generate_proposal(params, substep, state_history, prev_state):
     if len(non_initialized_proposals) > 0:
         created_proposal = False
 
-        for proposal in non_initialized_proposals:
+        for proposal in get_proposals_by_timestep(non_initialized_proposals, timestep):
             if proposal.timestep == prev_state["timestep"]:
                 proposal.id = new_proposal_id
                 new_proposal_id += 1
@@ -185,16 +192,20 @@ def get_proposals_to_cancel(params, substep, state_history, prev_state):
 def get_proposals_to_schedule_and_execute(params, substep, state_history, prev_state):
     dual_governance: DualGovernance = prev_state["dual_governance"]
 
+    timelock = dual_governance.timelock
+
     proposals_to_schedule: List[Proposal] = []
     proposals_to_execute: List[Proposal] = []
-    for proposal in dual_governance.timelock.proposals.state.proposals:
-        if dual_governance.can_schedule(proposal.id) and dual_governance.state.can_schedule_proposal(
-            proposal.submittedAt
-        ):
-            proposals_to_schedule.append(proposal)
 
-        elif dual_governance.can_execute(proposal.id):
-            proposals_to_execute.append(proposal)
+    if dual_governance.state.is_proposals_adoption_allowed():
+        for proposal_id in timelock.get_schedulable_proposal_ids():
+            proposal = timelock.get_proposal(proposal_id)
+
+            if dual_governance.state.can_schedule_proposal(proposal.submittedAt):
+                proposals_to_schedule.append(proposal)
+
+    for proposal_id in timelock.get_executable_proposal_ids():
+        proposals_to_execute.append(timelock.get_proposal(proposal_id))
 
     return {"proposals_to_schedule": proposals_to_schedule, "proposals_to_execute": proposals_to_execute}
 
@@ -296,14 +307,23 @@ def initialize_proposals(params, substep, state_history, prev_state, policy_inpu
     non_initialized_proposals: List[Proposal] = prev_state["non_initialized_proposals"]
     proposals: List[Proposal] = policy_input["proposal_create"]
 
-    non_initialized_proposals_left = []
-    for non_initialized_proposal in non_initialized_proposals:
-        initialized = False
-        for proposal in proposals:
-            if non_initialized_proposal == proposal:
-                initialized = True
-        if not initialized:
-            non_initialized_proposals_left.append(non_initialized_proposal)
+    if not proposals:
+        return ("non_initialized_proposals", non_initialized_proposals)
+
+    initialized_proposals = [
+        non_initialized_proposal
+        for timestep in {proposal.timestep for proposal in proposals}
+        for non_initialized_proposal in get_proposals_by_timestep(non_initialized_proposals, timestep)
+        if any(non_initialized_proposal == proposal for proposal in proposals)
+    ]
+
+    if not initialized_proposals:
+        return ("non_initialized_proposals", non_initialized_proposals)
+
+    initialized_ids = {id(proposal) for proposal in initialized_proposals}
+    non_initialized_proposals_left = ProposalList(
+        proposal for proposal in non_initialized_proposals if id(proposal) not in initialized_ids
+    )
 
     return ("non_initialized_proposals", non_initialized_proposals_left)
 
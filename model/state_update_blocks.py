@@ -69,6 +69,7 @@ state_update_blocks = [
         "variables": {
             "dual_governance": dg.process_finalization_and_claims,
             "last_withdrawal_day": dg.update_last_withdrawal_day,
+            "finalization_schedule": dg.update_finalization_schedule,
         },
     },
     {
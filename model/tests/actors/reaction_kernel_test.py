@@ -0,0 +1,120 @@
+import copy
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from model.actors.actors import Actors
+from model.tests.actors.utils import create_actors
+from model.tests.scratch_test import create_dual_governance
+from model.types.actors import ActorType
+from model.types.proposals import Proposal
+from model.types.reaction_time import ReactionTime
+from model.types.scenario import Scenario
+from model.utils.seed import initialize_seed
+from specs.dual_governance import State
+
+funds_strategy = st.sampled_from([0, 10**18])
+mostly_true_strategy = st.sampled_from([True, True, True, False])
+
+
+def actor_strategy():
+    return st.fixed_dictionaries(
+        {
+            "health": st.integers(min_value=-1, max_value=1),
+            "hypothetical_health": st.one_of(
+                st.integers(min_value=-1, max_value=1), st.floats(min_value=-1, max_value=1), st.just(np.nan)
+            ),
+            "actor_type": st.sampled_from(
+                [ActorType.HonestActor, ActorType.SingleDefender, ActorType.CoordinatedAttacker]
+            ),
+            "stETH": funds_strategy,
+            "wstETH": funds_strategy,
+            "stETH_locked": funds_strategy,
+            "wstETH_locked": funds_strategy,
+            "reaction_time": st.sampled_from([ReactionTime.Normal, ReactionTime.Normal, ReactionTime.NoReaction]),
+            "is_due": mostly_true_strategy,
+            "did_quit": mostly_true_strategy.map(lambda value: not value),
+        }
+    )
+
+
+def create_kernel_actors(actors_data) -> Actors:
+    def column(name, dtype):
+        return np.array([actor[name] for actor in actors_data], dtype=dtype)
+
+    hypothetical_health = [actor["hypothetical_health"] for actor in actors_data]
+    if all(isinstance(value, int) for value in hypothetical_health):
+        hypothetical_health = np.array(hypothetical_health, dtype="int32")
+    else:
+        hypothetical_health = np.array(hypothetical_health, dtype=np.float64)
+
+    reaction_time = np.array([actor["reaction_time"].value for actor in actors_data])
+    ## actors without reaction are never due
+    is_due = column("is_due", bool) & (reaction_time != ReactionTime.NoReaction.value)
+
+    return create_actors(
+        len(actors_data),
+        stETH=column("stETH", object),
+        wstETH=column("wstETH", object),
+        health=column("health", "int32"),
+        actor_type=np.array([actor["actor_type"].value for actor in actors_data], dtype="uint8"),
+        reaction_time=reaction_time,
+        state={
+            "hypothetical_health": hypothetical_health,
+            "stETH_locked": column("stETH_locked", object),
+            "wstETH_locked": column("wstETH_locked", object),
+            "next_hp_check_timestamp": np.where(is_due, 0, 2**32 - 1).astype(np.int64),
+            "did_quit": column("did_quit", bool),
+        },
+    )
+
+
+## the first examples include compiling the kernel for every dtype of the hypothetical health
+@settings(deadline=None)
+@given(
+    actors_data=st.lists(actor_strategy(), min_size=1, max_size=12),
+    scenario=st.sampled_from(list(Scenario)),
+    state=st.sampled_from([State.Normal, State.VetoSignalling, State.RageQuit]),
+    has_proposals=st.booleans(),
+    negative_proposals_canceled=st.booleans(),
+    positive_proposals_pending=st.booleans(),
+    attackers_lock=st.booleans(),
+)
+def test_reaction_kernel_matches_numpy_reference(
+    actors_data,
+    scenario,
+    state,
+    has_proposals,
+    negative_proposals_canceled,
+    positive_proposals_pending,
+    attackers_lock,
+):
+    initialize_seed(1)
+    dual_governance = create_dual_governance()
+    dual_governance.get_current_state = lambda: state
+    proposals = [Proposal(id=1)] if has_proposals else []
+
+    reference_actors = create_kernel_actors(actors_data)
+    kernel_actors = copy.deepcopy(reference_actors)
+
+    results = []
+    for actors, use_reaction_kernel in ((reference_actors, False), (kernel_actors, True)):
+        actors.use_reaction_kernel = use_reaction_kernel
+        actors._are_negative_proposals_canceled = lambda *_: negative_proposals_canceled
+        actors._are_positive_proposals_pending = lambda *_: positive_proposals_pending
+        actors._should_attackers_lock = lambda *_: attackers_lock
+
+        if use_reaction_kernel:
+            ## the reactions of a previous tick must not leak into the compared one
+            hypothetical_health = actors.hypothetical_health
+            actors.hypothetical_health = -hypothetical_health
+            actors.check_hp_and_calculate_reaction(scenario, dual_governance, proposals)
+            actors.hypothetical_health = hypothetical_health
+
+        reactions, stETH_amounts, wstETH_amounts = actors.check_hp_and_calculate_reaction(
+            scenario, dual_governance, proposals
+        )
+        results.append((list(reactions), list(stETH_amounts), list(wstETH_amounts)))
+
+    assert results[0] == results[1]
@@ -0,0 +1,38 @@
+import numpy as np
+
+from model.actors.actors import Actors
+from model.types.actors import ActorType
+from model.types.governance_participation import GovernanceParticipation
+from model.types.reaction_time import ReactionTime
+from model.utils.reactions import ReactionDelayGenerator
+
+
+def create_actors(n: int, state: dict = None, **columns) -> Actors:
+    """
+    Creates `n` honest actors with addresses `0x..01` to `0x..n`, normal reactions and no funds. `columns` override
+    the arguments of `Actors`, and `state` sets attributes computed by the constructor, such as the hypothetical
+    health, the locked funds or the next health check timestamps.
+    """
+    arguments = {
+        "address": np.array([f"0x{i:040x}" for i in range(1, n + 1)]),
+        "entity": np.full(n, "Other"),
+        "ldo": np.zeros(n, dtype=np.int64),
+        "stETH": np.zeros(n, dtype=object),
+        "wstETH": np.zeros(n, dtype=object),
+        "label": np.full(n, "Other"),
+        "health": np.zeros(n, dtype="int32"),
+        "actor_type": np.full(n, ActorType.HonestActor.value, dtype="uint8"),
+        "reaction_time": np.full(n, ReactionTime.Normal.value),
+        "governance_participation": np.full(n, GovernanceParticipation.Normal.value),
+    }
+    arguments.update(columns)
+
+    if "reaction_delay_generator" not in arguments:
+        arguments["reaction_delay_generator"] = ReactionDelayGenerator()
+
+    actors = Actors(**arguments)
+
+    for name, value in (state or {}).items():
+        setattr(actors, name, value)
+
+    return actors
@@ -0,0 +1,41 @@
+import numpy as np
+from hypothesis import given
+from hypothesis import strategies as st
+
+from model.parts.deposits import allocate_deposits
+
+
+def allocate_deposits_one_by_one(eth_balance: np.ndarray, deposit_cap: int) -> tuple[list[int], list[int]]:
+    actor_indices = []
+    amounts = []
+    total_to_deposit = 0
+
+    for idx in np.where(eth_balance > 0)[0]:
+        if total_to_deposit >= deposit_cap:
+            break
+
+        amount_to_deposit = min(eth_balance[idx], deposit_cap - total_to_deposit)
+
+        if amount_to_deposit <= 0:
+            continue
+
+        actor_indices.append(idx)
+        amounts.append(amount_to_deposit)
+        total_to_deposit += amount_to_deposit
+
+    return actor_indices, amounts
+
+
+@given(
+    eth_balances=st.lists(st.integers(min_value=0, max_value=1000 * 10**18), max_size=30),
+    deposit_cap=st.integers(min_value=0, max_value=5000 * 10**18),
+)
+def test_allocate_deposits_matches_one_by_one(eth_balances, deposit_cap):
+    eth_balance = np.array(eth_balances, dtype=object)
+
+    actor_indices, amounts = allocate_deposits(eth_balance, eth_balance > 0, deposit_cap)
+    expected_indices, expected_amounts = allocate_deposits_one_by_one(eth_balance, deposit_cap)
+
+    assert list(actor_indices) == expected_indices
+    assert list(amounts) == expected_amounts
+    assert sum(amounts) <= deposit_cap
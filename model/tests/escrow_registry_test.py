@@ -0,0 +1,68 @@
+import copy
+import pickle
+
+from model.types.escrow import EscrowLifecycle, EscrowRegistry
+from specs.dual_governance.config import DualGovernanceConfig
+from specs.dual_governance.state import DualGovernanceState
+from specs.escrow.escrow import Escrow
+from specs.lido import Lido
+from specs.tests.utils import sample_stETH_total_supply, test_escrow_address
+from specs.time_manager import TimeManager
+from specs.types.address import Address
+from specs.types.timestamp import Timestamp
+
+
+def create_signalling_escrow() -> Escrow:
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    lido = Lido()
+    lido.initialize(time_manager, Address.wstETH)
+    lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+    lido.set_buffered_ether(sample_stETH_total_supply)
+
+    dgState = DualGovernanceState(DualGovernanceConfig())
+    dgState.initialize(test_escrow_address, time_manager, lido=lido)
+
+    return dgState.signalling_escrow
+
+
+def test_escrow_registry_tracks_escrows_by_identity():
+    escrow = create_signalling_escrow()
+    escrow_copy = copy.deepcopy(escrow)
+
+    registry = EscrowRegistry()
+    assert not registry.track(None)
+    assert registry.track(escrow)
+    assert not registry.track(escrow)
+    assert escrow_copy not in registry
+    assert registry.track(escrow_copy)
+    assert len(registry) == 2
+
+    for registry_copy in (copy.deepcopy(registry), pickle.loads(pickle.dumps(registry))):
+        assert registry_copy.escrows[0] in registry_copy
+        assert escrow not in registry_copy
+        assert not registry_copy.track(registry_copy.escrows[1])
+
+
+def test_escrow_registry_lifecycles():
+    escrow = create_signalling_escrow()
+
+    registry = EscrowRegistry()
+    registry.track(escrow)
+    assert registry.get_lifecycle(escrow) == EscrowLifecycle.Signalling
+
+    escrow.start_rage_quit(Timestamp(0), Timestamp(0))
+    registry.update_lifecycles()
+    assert registry.get_lifecycle(escrow) == EscrowLifecycle.RageQuit
+    assert registry.get_escrows(EscrowLifecycle.Claimed) == []
+
+    escrow.request_next_withdrawals_batch(escrow.max_withdrawal_batch_size)
+    escrow.start_rage_quit_extension_delay()
+    registry.update_lifecycles()
+    assert registry.get_escrows(EscrowLifecycle.Claimed) == [escrow]
+
+    escrow.stETH_drained = True
+    registry.update_lifecycles()
+    assert registry.get_lifecycle(escrow) == EscrowLifecycle.Drained
+    assert registry.get_escrows(EscrowLifecycle.Claimed) == []
@@ -0,0 +1,86 @@
+from hypothesis import given
+from hypothesis import strategies as st
+
+from model.types.finalization_schedule import FinalizationSchedule
+from specs.escrow.escrow import Escrow
+from specs.lido import Lido
+from specs.tests.utils import sample_stETH_total_supply
+from specs.time_manager import TimeManager
+from specs.types.address import Address
+from specs.withdrawals.nft import WithdrawalQueueERC721
+
+escrow_address = "0x0000000000000000000000000000000000000e5c"
+queue_address = "0x0000000000000000000000000000000000000a11"
+
+
+def finalize_day_one_by_one(escrow: Escrow, daily_withdrawal_limit: int) -> tuple[list[int], int]:
+    withdrawal_queue = escrow.withdrawal_queue
+    last_finalized_request = withdrawal_queue.queue[withdrawal_queue.last_finalized_request_id]
+
+    unstETH_ids = []
+    total_to_finalize = 0
+
+    for unstETH_id in withdrawal_queue.get_withdrawal_requests(escrow.address):
+        if unstETH_id <= withdrawal_queue.last_finalized_request_id:
+            continue
+
+        if total_to_finalize >= daily_withdrawal_limit:
+            break
+
+        request_to_finalize = withdrawal_queue.queue[unstETH_id]
+        request_amount = request_to_finalize.cumulative_stETH - last_finalized_request.cumulative_stETH
+
+        if request_amount + total_to_finalize > daily_withdrawal_limit:
+            break
+
+        unstETH_ids.append(unstETH_id)
+        total_to_finalize += request_amount
+        last_finalized_request = request_to_finalize
+
+    return unstETH_ids, total_to_finalize
+
+
+@given(
+    request_batches=st.lists(
+        st.lists(st.integers(min_value=100, max_value=1000 * 10**18), min_size=1, max_size=20), min_size=1, max_size=4
+    ),
+    daily_withdrawal_limit=st.integers(min_value=0, max_value=5000 * 10**18),
+)
+def test_finalization_schedule_matches_one_by_one(request_batches, daily_withdrawal_limit):
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    lido = Lido()
+    lido.initialize(time_manager, Address.wstETH)
+    lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+    lido.set_buffered_ether(sample_stETH_total_supply)
+
+    total_stETH_amount = sum(sum(amounts) for amounts in request_batches)
+    lido._mint_shares(escrow_address, total_stETH_amount)
+    lido.set_buffered_ether(lido.get_buffered_ether() + total_stETH_amount)
+    lido.approve(escrow_address, queue_address, total_stETH_amount)
+
+    withdrawal_queue = WithdrawalQueueERC721()
+    withdrawal_queue.initialize(time_manager, lido, queue_address)
+    withdrawal_queue.resume()
+
+    escrow = Escrow(address=escrow_address, withdrawal_queue=withdrawal_queue)
+    schedule = None
+
+    for amounts in request_batches:
+        withdrawal_queue.request_withdrawals(escrow_address, amounts, escrow_address)
+
+        while True:
+            if schedule is None or not schedule.is_valid_for(escrow, daily_withdrawal_limit):
+                schedule = FinalizationSchedule.build(escrow, daily_withdrawal_limit)
+
+            unstETH_ids, total_to_finalize = schedule.next_withdrawals()
+            assert (unstETH_ids.tolist(), total_to_finalize) == finalize_day_one_by_one(escrow, daily_withdrawal_limit)
+
+            if len(unstETH_ids) == 0:
+                break
+
+            withdrawal_queue.finalize(int(unstETH_ids[-1]), total_to_finalize, 10**27)
+            schedule.advance()
+
+    assert schedule.remaining_days() == 0
@@ -8,6 +8,7 @@ from model.types.proposals import ProposalSubType
 from model.types.reaction_time import ModeledReactions
 from model.types.scenario import Scenario
 from model.utils.initialization import generate_initial_state
+from model.utils.seed import get_address_allocator, initialize_seed
 from specs.parameters import system_parameters
 from specs.utils import percent_base
 
@@ -88,3 +89,19 @@ def test_generate_initial_state(
         if second_rage_quit_threshold is not None
         else system_parameters["second_seal_rage_quit_support"] * percent_base
     )
+
+
+def test_escrow_addresses_are_drawn_from_the_run_seed():
+    escrow_addresses = {}
+
+    for seed in (1, 1, 2):
+        initialize_seed(seed)
+        allocator = get_address_allocator("escrow")
+        assert get_address_allocator("escrow") is allocator
+
+        addresses = allocator.allocate_many(3)
+        assert set(addresses).isdisjoint(get_address_allocator().allocate_many(3))
+        escrow_addresses.setdefault(seed, []).append(addresses)
+
+    assert escrow_addresses[1][0] == escrow_addresses[1][1]
+    assert set(escrow_addresses[1][0]).isdisjoint(escrow_addresses[2][0])
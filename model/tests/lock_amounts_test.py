@@ -0,0 +1,72 @@
+import numpy as np
+from hypothesis import given
+from hypothesis import strategies as st
+
+from model.actors.actors import Actors
+from model.types.actors import ActorType
+from model.types.governance_participation import GovernanceParticipation
+from model.types.reaction_time import ReactionTime
+from model.utils.reactions import ReactionDelayGenerator
+from model.utils.seed import initialize_seed
+
+funds_strategy = st.one_of(st.just(0), st.integers(min_value=1, max_value=1000 * 10**18))
+
+
+def allocate_attacker_funds_one_by_one(actors: Actors, actor_indices: np.ndarray, needed_funds: int):
+    stETH_amounts = np.zeros_like(actors.stETH)
+    wstETH_amounts = np.zeros_like(actors.wstETH)
+    remaining_needed = needed_funds
+
+    for actor_idx in actor_indices:
+        available_stETH = actors.stETH[actor_idx]
+
+        if available_stETH > 0:
+            stETH_to_lock = min(available_stETH, remaining_needed)
+            stETH_amounts[actor_idx] = stETH_to_lock
+            remaining_needed -= stETH_to_lock
+
+            if remaining_needed <= 0:
+                break
+
+            available_wstETH = actors.wstETH[actor_idx]
+
+            if available_wstETH > 0:
+                wstETH_to_lock = min(available_wstETH, remaining_needed)
+                wstETH_amounts[actor_idx] = wstETH_to_lock
+                remaining_needed -= wstETH_to_lock
+
+                if remaining_needed <= 0:
+                    break
+
+    return stETH_amounts[actor_indices], wstETH_amounts[actor_indices]
+
+
+@given(
+    attackers_funds=st.lists(st.tuples(funds_strategy, funds_strategy), min_size=1, max_size=10),
+    needed_funds=st.integers(min_value=1, max_value=5000 * 10**18),
+)
+def test_allocate_attacker_funds_matches_one_by_one(attackers_funds, needed_funds):
+    initialize_seed(1)
+    n = len(attackers_funds)
+    stETH, wstETH = zip(*attackers_funds)
+
+    actors = Actors(
+        address=np.array([f"0x{i:040x}" for i in range(1, n + 1)]),
+        entity=np.full(n, "Other"),
+        ldo=np.zeros(n, dtype=np.int64),
+        stETH=np.array(stETH, dtype=object),
+        wstETH=np.array(wstETH, dtype=object),
+        label=np.full(n, "Other"),
+        health=np.full(n, 50, dtype="int32"),
+        actor_type=np.full(n, ActorType.CoordinatedAttacker.value, dtype="uint8"),
+        reaction_time=np.full(n, ReactionTime.Normal.value),
+        governance_participation=np.full(n, GovernanceParticipation.Normal.value),
+        reaction_delay_generator=ReactionDelayGenerator(),
+    )
+    actor_indices = np.arange(n)
+
+    stETH_to_lock, wstETH_to_lock = actors._allocate_attacker_funds(actor_indices, needed_funds)
+    expected_stETH, expected_wstETH = allocate_attacker_funds_one_by_one(actors, actor_indices, needed_funds)
+
+    assert list(stETH_to_lock) == list(expected_stETH)
+    assert list(wstETH_to_lock) == list(expected_wstETH)
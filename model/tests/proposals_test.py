@@ -0,0 +1,132 @@
+import numpy as np
+from hypothesis import given
+from hypothesis import strategies as st
+
+from model.tests.actors.utils import create_actors
+from model.types.proposal_type import ProposalSubType
+from model.types.proposals import Proposal, ProposalsEffect, SparseFundChanges
+from model.utils.reactions import ReactionDelayGenerator
+from model.utils.seed import initialize_seed
+
+actors_amount = 12
+
+
+def assignment_strategy():
+    return st.tuples(
+        st.lists(st.booleans(), min_size=actors_amount, max_size=actors_amount),
+        st.one_of(
+            st.integers(min_value=-(10**21), max_value=10**21),
+            st.lists(st.integers(min_value=0, max_value=10**21), min_size=actors_amount, max_size=actors_amount),
+        ),
+    )
+
+
+def apply_dense(changes: np.ndarray, assignments):
+    for mask, value in assignments:
+        mask = np.array(mask)
+        changes[mask] = np.array(value, dtype=object)[mask] if isinstance(value, list) else value
+
+
+def apply_sparse(changes: SparseFundChanges, assignments):
+    for mask, value in assignments:
+        value = np.array(value, dtype=object) if isinstance(value, list) else value
+        changes.set(np.array(mask), value, value)
+
+
+@given(st.lists(assignment_strategy(), max_size=4), st.lists(assignment_strategy(), max_size=4))
+def test_sparse_fund_changes_match_dense_changes(first_assignments, second_assignments):
+    dense = np.zeros(actors_amount, dtype=object)
+    apply_dense(dense, first_assignments)
+    apply_dense(dense, second_assignments)
+
+    first = SparseFundChanges(dense.dtype)
+    apply_sparse(first, first_assignments)
+
+    second = SparseFundChanges(dense.dtype)
+    apply_sparse(second, second_assignments)
+    indices, stETH_changes, wstETH_changes = first.to_arrays()
+    second.base = (indices, stETH_changes, wstETH_changes)
+    indices, stETH_changes, wstETH_changes = second.to_arrays()
+
+    sparse = np.zeros(actors_amount, dtype=object)
+    sparse[indices] = stETH_changes
+
+    assert list(sparse) == list(dense)
+    assert list(stETH_changes) == list(wstETH_changes)
+    assert np.all(np.diff(indices) > 0)
+
+
+def create_proposal_actors(health, labels, entities, reaction_delay_generator):
+    n = len(health)
+
+    return create_actors(
+        n,
+        entity=np.array(entities),
+        stETH=np.full(n, 10**18, dtype=object),
+        label=np.array(labels),
+        health=np.array(health, dtype="int32"),
+        reaction_delay_generator=reaction_delay_generator,
+    )
+
+
+@given(
+    actors_data=st.lists(
+        st.tuples(
+            st.integers(min_value=-100, max_value=100),
+            st.sampled_from(["Whale", "Institutional", "Other"]),
+            st.sampled_from(["Contract", "CEX", "Other"]),
+        ),
+        min_size=1,
+        max_size=actors_amount,
+    ),
+    proposals_data=st.lists(
+        st.tuples(
+            st.integers(min_value=-25, max_value=25),
+            st.sampled_from([ProposalSubType.NoEffect, ProposalSubType.FundsStealing]),
+            st.integers(min_value=-30, max_value=30),
+        ),
+        min_size=1,
+        max_size=4,
+    ),
+    masks_seed=st.integers(min_value=0, max_value=2**32 - 1),
+)
+def test_batched_proposals_damage_matches_sequential(actors_data, proposals_data, masks_seed):
+    health, labels, entities = zip(*actors_data)
+    masks = [np.random.default_rng(masks_seed + i).random(len(health)) < 0.7 for i in range(len(proposals_data))]
+
+    def create_proposals():
+        proposals = []
+        for id, (damage, sub_type, whale_damage) in enumerate(proposals_data, start=1):
+            effects = ProposalsEffect()
+            effects.add_effect("Whale", whale_damage)
+            proposals.append(Proposal(id=id, damage=damage, sub_type=sub_type, effects=effects))
+        return proposals
+
+    initialize_seed(1)
+    reaction_delay_generator = ReactionDelayGenerator()
+
+    sequential_actors = create_proposal_actors(health, labels, entities, reaction_delay_generator)
+    sequential_proposals = create_proposals()
+    damage_mask = np.zeros(len(health), dtype=bool)
+    for proposal, mask in zip(sequential_proposals, masks):
+        damage_mask |= sequential_actors.apply_proposal_damage(reaction_delay_generator, 0, proposal, mask)
+
+    batched_actors = create_proposal_actors(health, labels, entities, reaction_delay_generator)
+    batched_proposals = create_proposals()
+    batched_damage_mask = batched_actors.apply_proposals_damage(reaction_delay_generator, 0, batched_proposals, masks)
+
+    assert list(batched_damage_mask) == list(damage_mask)
+    assert list(batched_actors.hypothetical_health) == list(sequential_actors.hypothetical_health)
+    assert list(batched_actors.total_damage) == list(sequential_actors.total_damage)
+    assert list(batched_actors.total_healing) == list(sequential_actors.total_healing)
+
+    for batched, sequential in zip(batched_proposals, sequential_proposals):
+        assert list(batched.damage_indices) == list(sequential.damage_indices)
+        assert list(batched.damage_amounts) == list(sequential.damage_amounts)
+
+    for batched, sequential in zip(reversed(batched_proposals), reversed(sequential_proposals)):
+        batched_actors.remove_proposal_damage(reaction_delay_generator, 0, batched)
+        sequential_actors.remove_proposal_damage(reaction_delay_generator, 0, sequential)
+
+    assert list(batched_actors.hypothetical_health) == list(health)
+    assert list(sequential_actors.hypothetical_health) == list(health)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from model.actors.actors import Actors
+from model.actors.scratch import ScratchBuffers, track_peak_allocation
+from model.tests.actors.utils import create_actors
+from model.types.actors import ActorType
+from model.types.scenario import Scenario
+from model.utils.seed import initialize_seed
+from specs.dual_governance import DualGovernance
+from specs.lido import Lido
+from specs.tests.utils import sample_stETH_total_supply, test_escrow_address
+from specs.time_manager import TimeManager
+from specs.types.address import Address
+
+actors_amount = 20_000
+
+
+def create_dual_governance() -> DualGovernance:
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    lido = Lido()
+    lido.initialize(time_manager, Address.wstETH)
+    lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+    lido.set_buffered_ether(sample_stETH_total_supply)
+
+    dual_governance = DualGovernance()
+    dual_governance.initialize(test_escrow_address, time_manager, lido)
+
+    return dual_governance
+
+
+def create_random_actors(n: int) -> Actors:
+    """
+    Actors with int64 balances: unlocking object balances creates a new Python int per unlocking actor, which is
+    part of the result rather than a temporary array.
+    """
+    initialize_seed(1)
+    rng = np.random.default_rng(1)
+    actor_types = [ActorType.HonestActor, ActorType.SingleDefender, ActorType.CoordinatedAttacker]
+
+    stETH = rng.integers(0, 100, n) * 10**15
+    wstETH = rng.integers(0, 100, n) * 10**15
+    health = rng.integers(-20, 100, n).astype("int32")
+    actor_type = np.array([actor_types[i].value for i in rng.integers(0, 3, n)], dtype="uint8")
+    hypothetical_health = rng.integers(-20, 100, n).astype("int32")
+    stETH_locked = np.where(rng.random(n) < 0.3, 10**15, 0)
+
+    return create_actors(
+        n,
+        stETH=stETH,
+        wstETH=wstETH,
+        health=health,
+        actor_type=actor_type,
+        state={
+            "hypothetical_health": hypothetical_health,
+            "stETH_locked": stETH_locked,
+            "next_hp_check_timestamp": np.zeros(n, dtype=np.int64),
+        },
+    )
+
+
+def test_scratch_buffers_are_reused():
+    scratch = ScratchBuffers(4)
+
+    buffer = scratch.get("mask", np.bool_)
+    assert scratch.get("mask", np.bool_) is buffer
+    assert scratch.allocations == 1
+
+    assert scratch.get("mask", np.uint8).dtype == np.uint8
+    assert scratch.allocations == 2
+
+
+@pytest.mark.parametrize("scenario", [Scenario.HappyPath, Scenario.RageQuitLoop])
+def test_steady_state_reaction_tick_does_not_allocate_per_actor(scenario):
+    dual_governance = create_dual_governance()
+    actors = create_random_actors(actors_amount)
+
+    first_reactions = [
+        np.copy(result) for result in actors.check_hp_and_calculate_reaction(scenario, dual_governance, [])
+    ]
+    allocations = actors.scratch.allocations
+
+    with track_peak_allocation() as peak:
+        reactions = actors.check_hp_and_calculate_reaction(scenario, dual_governance, [])
+
+    assert peak.bytes < actors_amount
+    assert actors.scratch.allocations == allocations
+
+    for first, second in zip(first_reactions, reactions):
+        assert list(first) == list(second)
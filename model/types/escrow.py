@@ -1,7 +1,87 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Iterator, List
+
+from specs.escrow.escrow import Escrow, EscrowState
 
 
 @dataclass
 class ActorLockAmounts:
     stETH_amount: int
     wstETH_amount: int
+
+
+class EscrowLifecycle(Enum):
+    Signalling = 1
+    RageQuit = 2
+    Claimed = 3
+    Drained = 4
+
+
+@dataclass
+class EscrowRegistry:
+    """
+    Rage quit escrows created during a simulation together with their lifecycle.
+
+    Every rage quit escrow of a Dual Governance instance has the same address and escrows are dataclasses compared
+    field by field, so escrows are registered by identity. `indices` maps `id(escrow)` to the position of the escrow
+    and is rebuilt when the registry is copied or unpickled, since the copies are new objects. Escrows only move
+    forward through their lifecycle: a rage quit escrow is claimed once its rage quit timelock started and drained
+    once every holder withdrew the ETH of its locked stETH, after which it has no pending withdrawals.
+    """
+
+    escrows: List[Escrow] = field(default_factory=list)
+    lifecycles: List[EscrowLifecycle] = field(default_factory=list)
+    indices: Dict[int, int] = field(default_factory=dict, repr=False, compare=False)
+
+    def __contains__(self, escrow: Escrow) -> bool:
+        return id(escrow) in self.indices
+
+    def __iter__(self) -> Iterator[Escrow]:
+        return iter(self.escrows)
+
+    def __len__(self) -> int:
+        return len(self.escrows)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["indices"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.indices = {id(escrow): index for index, escrow in enumerate(self.escrows)}
+
+    def track(self, escrow: Escrow) -> bool:
+        if escrow is None or escrow in self:
+            return False
+
+        self.indices[id(escrow)] = len(self.escrows)
+        self.escrows.append(escrow)
+        self.lifecycles.append(get_escrow_lifecycle(escrow))
+
+        return True
+
+    def get_lifecycle(self, escrow: Escrow) -> EscrowLifecycle:
+        return self.lifecycles[self.indices[id(escrow)]]
+
+    def update_lifecycles(self):
+        for index, lifecycle in enumerate(self.lifecycles):
+            if lifecycle != EscrowLifecycle.Drained:
+                self.lifecycles[index] = get_escrow_lifecycle(self.escrows[index])
+
+    def get_escrows(self, lifecycle: EscrowLifecycle) -> List[Escrow]:
+        return [escrow for escrow, state in zip(self.escrows, self.lifecycles) if state == lifecycle]
+
+
+def get_escrow_lifecycle(escrow: Escrow) -> EscrowLifecycle:
+    if escrow.state != EscrowState.RageQuitEscrow:
+        return EscrowLifecycle.Signalling
+
+    if escrow.stETH_drained:
+        return EscrowLifecycle.Drained
+
+    if escrow.is_withdrawals_claimed():
+        return EscrowLifecycle.Claimed
+
+    return EscrowLifecycle.RageQuit
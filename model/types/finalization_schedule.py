@@ -0,0 +1,93 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from specs.escrow.escrow import Escrow
+
+
+@dataclass
+class FinalizationSchedule:
+    """
+    Daily finalization plan for the withdrawal requests of a rage quit escrow under a constant daily withdrawal limit.
+
+    Requests are finalized in id order, so every day finalizes the longest run of the remaining requests whose stETH
+    since the last finalized request fits into the limit. The cumulative stETH of the withdrawal queue already is the
+    running sum of request amounts, so the end of each day is a single `searchsorted` and a day applies a slice of
+    `unstETH_ids`. The plan stays valid until the escrow adds requests or the queue is finalized outside of it.
+    """
+
+    daily_withdrawal_limit: int = 0
+    last_request_id: int = 0
+    last_finalized_request_id: int = 0
+    unstETH_ids: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    cumulative_stETH: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    base_stETH: int = 0
+    day_ends: list[int] = field(default_factory=list)
+    day: int = 0
+
+    @staticmethod
+    def build(escrow: Escrow, daily_withdrawal_limit: int) -> "FinalizationSchedule":
+        withdrawal_queue = escrow.withdrawal_queue
+        last_finalized_request_id = withdrawal_queue.last_finalized_request_id
+
+        unstETH_ids = np.array(withdrawal_queue.get_withdrawal_requests(escrow.address), dtype=np.int64)
+        unstETH_ids = np.sort(unstETH_ids[unstETH_ids > last_finalized_request_id])
+
+        schedule = FinalizationSchedule(
+            daily_withdrawal_limit=daily_withdrawal_limit,
+            last_request_id=withdrawal_queue.last_request_id,
+            last_finalized_request_id=last_finalized_request_id,
+            unstETH_ids=unstETH_ids,
+            cumulative_stETH=withdrawal_queue.queue.cumulative_stETH[unstETH_ids],
+            base_stETH=withdrawal_queue.queue.cumulative_stETH[last_finalized_request_id],
+        )
+        schedule._calculate_day_ends()
+
+        return schedule
+
+    def is_valid_for(self, escrow: Escrow, daily_withdrawal_limit: int) -> bool:
+        withdrawal_queue = escrow.withdrawal_queue
+
+        return (
+            self.daily_withdrawal_limit == daily_withdrawal_limit
+            and self.last_request_id == withdrawal_queue.last_request_id
+            and self.last_finalized_request_id == withdrawal_queue.last_finalized_request_id
+        )
+
+    def remaining_days(self) -> int:
+        return len(self.day_ends) - self.day
+
+    def next_withdrawals(self) -> tuple[np.ndarray, int]:
+        """Returns the request ids finalized on the next day and their total stETH amount."""
+        if self.remaining_days() == 0:
+            return self.unstETH_ids[:0], 0
+
+        start, end = self._get_day_range(self.day)
+
+        return self.unstETH_ids[start:end], self.cumulative_stETH[end - 1] - self._get_stETH_before(start)
+
+    def advance(self):
+        _, end = self._get_day_range(self.day)
+
+        self.last_finalized_request_id = int(self.unstETH_ids[end - 1])
+        self.day += 1
+
+    def _calculate_day_ends(self):
+        start = 0
+
+        while start < len(self.unstETH_ids):
+            limit = self._get_stETH_before(start) + self.daily_withdrawal_limit
+            end = int(np.searchsorted(self.cumulative_stETH, limit, side="right"))
+
+            if end == start:
+                break
+
+            self.day_ends.append(end)
+            start = end
+
+    def _get_day_range(self, day: int) -> tuple[int, int]:
+        start = self.day_ends[day - 1] if day > 0 else 0
+        return start, self.day_ends[day]
+
+    def _get_stETH_before(self, index: int) -> int:
+        return self.cumulative_stETH[index - 1] if index > 0 else self.base_stETH
@@ -1,14 +1,12 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Set
+from typing import Any, Dict, List, Set, Tuple
 
 import numpy as np
 
 from model.types.actors import ActorType
 from model.types.proposal_type import ProposalSubType, ProposalType
 from model.types.scenario import Scenario
-from model.utils.proposals import (determine_proposal_damage,
-                                   determine_proposal_subtype,
-                                   determine_proposal_type)
+from model.utils.proposals import determine_proposal_damage, determine_proposal_subtype, determine_proposal_type
 
 
 @dataclass
@@ -22,6 +20,48 @@ class ProposalsEffect:
         return self.effects.get(label, 0)
 
 
+@dataclass
+class SparseFundChanges:
+    """
+    Builds the stETH and wstETH changes of a proposal for the actors they apply to only.
+
+    `set` records masked assignments, each overwriting the earlier ones like assignments into full-length arrays
+    would, and `to_arrays` resolves them into the sorted indices of the assigned actors and their changes. Changes
+    already registered for the proposal are passed as `base` and kept wherever they are not assigned again.
+    """
+
+    dtype: np.dtype
+    assignments: List[Tuple[np.ndarray, Any, Any]] = field(default_factory=list)
+    base: Tuple[np.ndarray, np.ndarray, np.ndarray] = None
+
+    def set(self, mask: np.ndarray, stETH: Any, wstETH: Any):
+        """Sets the changes of the actors in `mask` to `stETH` and `wstETH`, scalars or full-length arrays"""
+        self.assignments.append((mask, stETH, wstETH))
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        indices = np.zeros(0, dtype=np.int64)
+        for mask, _, _ in self.assignments:
+            indices = np.union1d(indices, np.flatnonzero(mask))
+
+        if self.base is not None:
+            indices = np.union1d(indices, self.base[0])
+
+        stETH_changes = np.zeros(len(indices), dtype=self.dtype)
+        wstETH_changes = np.zeros(len(indices), dtype=self.dtype)
+
+        if self.base is not None:
+            base_positions = np.searchsorted(indices, self.base[0])
+            stETH_changes[base_positions] = self.base[1]
+            wstETH_changes[base_positions] = self.base[2]
+
+        for mask, stETH, wstETH in self.assignments:
+            selected = mask[indices]
+            stETH_changes[selected] = stETH[indices[selected]] if isinstance(stETH, np.ndarray) else stETH
+            wstETH_changes[selected] = wstETH[indices[selected]] if isinstance(wstETH, np.ndarray) else wstETH
+
+        return indices, stETH_changes, wstETH_changes
+
+
 @dataclass
 class Proposal:
     id: int = 0
@@ -34,55 +74,51 @@ class Proposal:
     attack_targets: Set[str] = field(default_factory=lambda: set())
     attack_targets_determination: bool = False
     cancelable: bool = True
-    damage_amounts: np.ndarray = None
+    damage_indices: np.ndarray = None  # Actors that received damage
+    damage_amounts: np.ndarray = None  # Damage of the actors in damage_indices
     is_active: bool = False
-    stETH_changes: np.ndarray = None  # Tracks stETH changes per actor
-    wstETH_changes: np.ndarray = None  # Tracks wstETH changes per actor
-
-    def store_damage_effect(self, damage_amounts: np.ndarray):
-        """Store only damage amounts - zeros implicitly represent the mask"""
-        self.damage_amounts = damage_amounts.copy()
+    fund_change_indices: np.ndarray = None  # Actors whose funds are changed
+    stETH_changes: np.ndarray = None  # stETH changes of the actors in fund_change_indices
+    wstETH_changes: np.ndarray = None  # wstETH changes of the actors in fund_change_indices
+
+    def store_damage_effect(self, damage_indices: np.ndarray, damage_amounts: np.ndarray):
+        """Store only the non-zero damage amounts and the indices of the actors they apply to"""
+        self.damage_indices = damage_indices
+        self.damage_amounts = damage_amounts
         self.is_active = True
 
-    def get_damage_mask(self) -> np.ndarray:
-        """Get mask of actors that received damage"""
-        return self.damage_amounts != 0 if self.damage_amounts is not None else None
-
     def clear_damage_effect(self):
+        self.damage_indices = None
         self.damage_amounts = None
         self.is_active = False
 
     def register_fund_changes(
         self,
-        actors_amount: int,
+        actors_amount: np.ndarray,
         victims_mask: np.ndarray,
         victims_stETH: np.ndarray,
         victims_wstETH: np.ndarray,
         attackers_mask: np.ndarray = None,
     ):
-        if self.stETH_changes is None:
-            self.stETH_changes = np.zeros_like(actors_amount)
-        if self.wstETH_changes is None:
-            self.wstETH_changes = np.zeros_like(actors_amount)
-
-        self.stETH_changes[victims_mask] = -victims_stETH[victims_mask]
-        self.wstETH_changes[victims_mask] = -victims_wstETH[victims_mask]
-
         total_stolen_stETH = np.sum(victims_stETH[victims_mask])
         total_stolen_wstETH = np.sum(victims_wstETH[victims_mask])
 
+        changes = SparseFundChanges(actors_amount.dtype)
+        changes.set(victims_mask, -victims_stETH, -victims_wstETH)
+
         if attackers_mask is not None:
             num_attackers = np.sum(attackers_mask)
             if num_attackers > 0:
                 stETH_per_attacker = total_stolen_stETH / num_attackers
                 wstETH_per_attacker = total_stolen_wstETH / num_attackers
 
-                self.stETH_changes[attackers_mask] = stETH_per_attacker
-                self.wstETH_changes[attackers_mask] = wstETH_per_attacker
+                changes.set(attackers_mask, stETH_per_attacker, wstETH_per_attacker)
+
+        self._store_fund_changes(changes)
 
     def register_bribe_changes(
         self,
-        actors_amount: int,
+        actors_amount: np.ndarray,
         bribed_mask: np.ndarray,
         victims_mask: np.ndarray,
         attackers_mask: np.ndarray,
@@ -90,17 +126,12 @@ class Proposal:
         current_wstETH: np.ndarray,
     ):
         """Calculate and register both bribes and stolen funds"""
-        if self.stETH_changes is None:
-            self.stETH_changes = np.zeros_like(actors_amount)
-        if self.wstETH_changes is None:
-            self.wstETH_changes = np.zeros_like(actors_amount)
-
-        self.stETH_changes[victims_mask] = -current_stETH[victims_mask]
-        self.wstETH_changes[victims_mask] = -current_wstETH[victims_mask]
-
         total_stolen_stETH = np.sum(current_stETH[victims_mask])
         total_stolen_wstETH = np.sum(current_wstETH[victims_mask])
 
+        changes = SparseFundChanges(actors_amount.dtype)
+        changes.set(victims_mask, -current_stETH, -current_wstETH)
+
         honest_bribed_mask = bribed_mask & ~attackers_mask
         num_honest_bribed = np.sum(honest_bribed_mask)
 
@@ -108,8 +139,7 @@ class Proposal:
             honest_bribe_stETH = (total_stolen_stETH // 2) // num_honest_bribed
             honest_bribe_wstETH = (total_stolen_wstETH // 2) // num_honest_bribed
 
-            self.stETH_changes[honest_bribed_mask] = honest_bribe_stETH
-            self.wstETH_changes[honest_bribed_mask] = honest_bribe_wstETH
+            changes.set(honest_bribed_mask, honest_bribe_stETH, honest_bribe_wstETH)
 
         if np.any(attackers_mask):
             num_attackers = np.sum(attackers_mask)
@@ -122,8 +152,15 @@ class Proposal:
             #     attacker_share_wstETH = total_stolen_wstETH // 2
             attacker_share_stETH = 0
             attacker_share_wstETH = 0
-            self.stETH_changes[attackers_mask] = attacker_share_stETH
-            self.wstETH_changes[attackers_mask] = attacker_share_wstETH
+            changes.set(attackers_mask, attacker_share_stETH, attacker_share_wstETH)
+
+        self._store_fund_changes(changes)
+
+    def _store_fund_changes(self, changes: "SparseFundChanges"):
+        if self.fund_change_indices is not None:
+            changes.base = (self.fund_change_indices, self.stETH_changes, self.wstETH_changes)
+
+        self.fund_change_indices, self.stETH_changes, self.wstETH_changes = changes.to_arrays()
 
     def get_victims_mask(self, actors: any, include_contracts: bool = True) -> np.ndarray:
         """
@@ -212,7 +249,63 @@ def new_proposal(
     return proposal
 
 
+class ProposalList(list):
+    """
+    List of model proposals indexed by id and by timestep.
+
+    The model only appends to its proposal lists and rebuilds them when proposals are removed, so the indexes are
+    extended lazily with the proposals appended since the last lookup. Ids are assigned to non-initialized proposals
+    after they are appended, so an id lookup checks the indexed proposal and falls back to a scan.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.by_id: Dict[int, Proposal] = {}
+        self.by_timestep: Dict[int, List[Proposal]] = {}
+        self.indexed_count: int = 0
+
+    def get_by_id(self, id: int) -> Proposal:
+        self._update_index()
+
+        proposal = self.by_id.get(id)
+        if proposal is not None and proposal.id == id:
+            return proposal
+
+        return _find_proposal_by_id(self, id)
+
+    def get_by_timestep(self, timestep: int) -> List[Proposal]:
+        self._update_index()
+
+        return self.by_timestep.get(timestep, [])
+
+    def _update_index(self):
+        if self.indexed_count > len(self):
+            self.by_id.clear()
+            self.by_timestep.clear()
+            self.indexed_count = 0
+
+        for proposal in self[self.indexed_count :]:
+            self.by_id.setdefault(proposal.id, proposal)
+            self.by_timestep.setdefault(proposal.timestep, []).append(proposal)
+
+        self.indexed_count = len(self)
+
+
+def get_proposals_by_timestep(proposals: List[Proposal], timestep: int) -> List[Proposal]:
+    if isinstance(proposals, ProposalList):
+        return proposals.get_by_timestep(timestep)
+
+    return [proposal for proposal in proposals if proposal.timestep == timestep]
+
+
 def get_proposal_by_id(proposals: List[Proposal], id: int) -> Proposal:
+    if isinstance(proposals, ProposalList):
+        return proposals.get_by_id(id)
+
+    return _find_proposal_by_id(proposals, id)
+
+
+def _find_proposal_by_id(proposals: List[Proposal], id: int) -> Proposal:
     for proposal in proposals:
         if proposal.id == id:
             return proposal
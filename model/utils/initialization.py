@@ -10,9 +10,10 @@ from model.actors.actors import Actors
 from model.parts.actors import actor_update_health
 from model.sys_params import CustomDelays
 from model.types.actors import ActorType
+from model.types.escrow import EscrowRegistry
 from model.types.governance_participation import GovernanceParticipation
 from model.types.proposal_type import ProposalGeneration, ProposalType
-from model.types.proposals import Proposal, ProposalSubType
+from model.types.proposals import Proposal, ProposalList, ProposalSubType
 from model.types.reaction_time import ModeledReactions, ReactionTime
 from model.types.scenario import Scenario
 from model.utils.numbers import calculate_time_to_prepare_funds_deposit
@@ -22,7 +23,7 @@ from model.utils.reactions import (
     determine_governance_participation_vector,
     determine_reaction_time_vector,
 )
-from model.utils.seed import initialize_seed
+from model.utils.seed import get_address_allocator, initialize_seed
 from specs.dual_governance import DualGovernance
 from specs.dual_governance.proposals import ExecutorCall
 from specs.lido import Lido
@@ -60,11 +61,12 @@ def generate_initial_state(
     deposit_cap: int = 300_000,
     process_deposits: bool = False,
     normalize_funds: int = 0,
+    batch_proposals: bool = False,
 ) -> Any:
     initialize_seed(seed)
 
-    proposals: List[Proposal] = []
-    non_initialized_proposals: List[Proposal] = []
+    proposals: List[Proposal] = ProposalList()
+    non_initialized_proposals: List[Proposal] = ProposalList()
     reaction_delay_generator = ReactionDelayGenerator(custom_delays)
     actors = generate_actors(
         reaction_delay_generator=reaction_delay_generator,
@@ -113,6 +115,7 @@ def generate_initial_state(
         protection_duration=Timestamp(0),
         emergency_mode_duration=Timestamp(0),
         after_schedule_delay=after_schedule_delay,
+        escrow_address_allocator=get_address_allocator("escrow"),
         **filtered_params,
     )
 
@@ -184,11 +187,13 @@ def generate_initial_state(
         "churn_rate": churn_rate,
         "timedelta_tick": timedelta_tick,
         "last_withdrawal_day": simulation_starting_time.date(),
+        "finalization_schedule": None,
         "deposit_cap": deposit_cap * ether_base,
         "last_deposit_day": simulation_starting_time.date(),
-        "rage_quit_escrows": [],
+        "rage_quit_escrows": EscrowRegistry(),
         "process_deposits": process_deposits,
         "normalize_funds": normalize_funds,
+        "batch_proposals": batch_proposals,
     }
 
 
@@ -371,7 +376,7 @@ def generate_initial_proposals(
     determining_factor: int = 0,
 ) -> Tuple[List[Proposal], List[Proposal]]:
     if not dual_governance.state.is_proposals_creation_allowed():
-        return [], initial_proposals
+        return ProposalList(), ProposalList(initial_proposals)
 
     if (
         scenario
@@ -384,10 +389,10 @@ def generate_initial_proposals(
         ]
         and total_attackers <= 0
     ):
-        return [], initial_proposals
+        return ProposalList(), ProposalList(initial_proposals)
 
-    proposals: List[Proposal] = []
-    non_initialized_proposals: List[Proposal] = []
+    proposals: List[Proposal] = ProposalList()
+    non_initialized_proposals: List[Proposal] = ProposalList()
 
     for proposal in initial_proposals:
         new_proposal_id = (
@@ -1,3 +1,5 @@
+import numpy as np
+
 from specs.utils import ether_base
 
 
@@ -32,3 +34,15 @@ def calculate_time_for_withdrawal(amount_of_steth: int, lido_exit_share: int, ch
 def max_withdrawal_per_day(churn_rate: int, lido_exit_share: int):
     daily_withdrawal_limit = churn_rate * 32 * 225
     return int(daily_withdrawal_limit * lido_exit_share) * 10**18
+
+
+def allocate_up_to(amounts: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Takes the non-negative `amounts` in order until their total reaches `limit`, the amount crossing the limit only
+    partially, and returns the part taken of every amount. That is the difference of the cumulative sums of the
+    amounts before and after each of them, both clipped to the limit, so nothing is taken once the limit is reached.
+    """
+    taken_after = np.cumsum(amounts)
+    taken_before = taken_after - amounts
+
+    return np.minimum(taken_after, limit) - np.minimum(taken_before, limit)
@@ -1,14 +1,31 @@
+from typing import Dict
+
 from numpy.random import Generator, default_rng
 
+from specs.utils import AddressAllocator
+
 rng: Generator = None
+address_allocators: Dict[str, AddressAllocator] = None
 
 
 def initialize_seed(seed):
-    global rng
+    global rng, address_allocators
     rng = default_rng(seed)
+    address_allocators = {}
 
 
 def get_rng() -> Generator:
     if rng is None:
         raise ValueError("Random number generator is not initialized. Call initialize_rng first.")
     return rng
+
+
+def get_address_allocator(namespace: str = "actors") -> AddressAllocator:
+    """Address allocator of `namespace` seeded from the seed of the run, created on first use"""
+    if address_allocators is None:
+        raise ValueError("Address allocator is not initialized. Call initialize_seed first.")
+
+    if namespace not in address_allocators:
+        address_allocators[namespace] = AddressAllocator(rng.bit_generator.seed_seq.entropy, namespace=namespace)
+
+    return address_allocators[namespace]
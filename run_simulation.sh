@@ -5,7 +5,7 @@ set -euo pipefail
 
 # Function to display usage
 usage() {
-  echo "Usage: $0 <simulation_name> [--post_processing] [--time_profiling] [--execute] [--processes <num>] [--save_files] [--batch_size <num>]"
+  echo "Usage: $0 <simulation_name> | --plan <file> [--post_processing] [--time_profiling] [--execute] [--processes <num>] [--save_files] [--batch_size <num>] [--compile_plan]"
   exit 1
 }
 
@@ -14,6 +14,8 @@ post_processing=""
 time_profiling=""
 execute=""
 save_files=""
+compile_plan=""
+plan=""
 processes=""
 batch_size=""
 simulation_name=""
@@ -28,6 +30,7 @@ while [[ "$#" -gt 0 ]]; do
     --time_profiling) time_profiling=true ;;
     --execute) execute=true ;;
     --save_files) save_files=true ;;
+    --compile_plan) compile_plan=true ;;
     --processes) 
       shift
       processes=$1 
@@ -36,6 +39,10 @@ while [[ "$#" -gt 0 ]]; do
       shift
       batch_size=$1 
       ;;
+    --plan)
+      shift
+      plan=$1
+      ;;
     *)
       [[ -z "$simulation_name" ]] && simulation_name=$1 || usage 
       ;;
@@ -43,8 +50,8 @@ while [[ "$#" -gt 0 ]]; do
   shift
 done
 
-# Check if simulation_name is set
-[[ -z "$simulation_name" ]] && usage
+# Check if simulation_name or a plan is set
+[[ -z "$simulation_name" && -z "$plan" ]] && usage
 
 # Add input validation for numeric parameters
 if [[ -n "$processes" ]] && ! [[ "$processes" =~ ^[0-9]+$ ]]; then
@@ -58,10 +65,12 @@ if [[ -n "$batch_size" ]] && ! [[ "$batch_size" =~ ^[0-9]+$ ]]; then
 fi
 
 # Run the simulation with the provided name and flags
-python3 -m experiments.run --simulation_name "$simulation_name" \
+python3 -m experiments.run ${simulation_name:+--simulation_name "$simulation_name"} \
+  ${plan:+--plan "$plan"} \
   ${post_processing:+--post_processing} \
   ${time_profiling:+--time_profiling} \
   ${execute:+--execute} \
   ${processes:+--processes "$processes"} \
   ${save_files:+--save_files} \
-  ${batch_size:+--batch_size "$batch_size"}
\ No newline at end of file
+  ${batch_size:+--batch_size "$batch_size"} \
+  ${compile_plan:+--compile_plan}
\ No newline at end of file
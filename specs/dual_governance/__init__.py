@@ -11,6 +11,7 @@ from specs.escrow.escrow import Escrow
 from specs.lido import Lido
 from specs.time_manager import TimeManager
 from specs.types.timestamp import Timestamp
+from specs.utils import AddressAllocator
 
 
 @dataclass
@@ -31,6 +32,7 @@ class DualGovernance:
         protection_duration: Timestamp = Timestamp(0),
         emergency_mode_duration: Timestamp = Timestamp(0),
         after_schedule_delay: int = 0,
+        escrow_address_allocator: AddressAllocator = None,
         **config_overrides,
     ):
         self.time_manager = time_manager
@@ -47,6 +49,8 @@ class DualGovernance:
 
         config = DualGovernanceConfig(**config_overrides)
         dgState = DualGovernanceState(config)
+        if escrow_address_allocator is not None:
+            dgState.escrow_address_allocator = escrow_address_allocator
         dgState.initialize(escrow_address, time_manager, lido=lido)
         self.state = dgState
 
@@ -1,6 +1,8 @@
+import heapq
+from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 
 from specs.time_manager import TimeManager
 from specs.types.timestamp import Timestamp
@@ -66,11 +68,67 @@ class ProposalState:
     proposals: List[Proposal] = field(default_factory=list)
 
 
+@dataclass
+class ProposalsIndex:
+    """
+    Proposal ids bucketed by status, plus min-heaps of `(submittedAt, id)` for submitted and `(scheduledAt, id)` for
+    scheduled proposals. Delays are the same for every proposal, so the heap order is the order in which proposals
+    become schedulable or executable. Heap entries of proposals that moved on to another status are counted as stale
+    and dropped once they make up more than half of their heap.
+    """
+
+    ids_by_status: Dict[ProposalStatus, Set[int]] = field(default_factory=lambda: defaultdict(set))
+    submitted: List[Tuple[int, int]] = field(default_factory=list)
+    scheduled: List[Tuple[int, int]] = field(default_factory=list)
+    stale_entries: Dict[ProposalStatus, int] = field(default_factory=lambda: defaultdict(int))
+
+    def set_status(self, proposal_id: int, previous_status: ProposalStatus, status: ProposalStatus):
+        self.ids_by_status[previous_status].discard(proposal_id)
+        self.ids_by_status[status].add(proposal_id)
+
+        heap = self.get_heap(previous_status)
+        if heap is not None:
+            self.stale_entries[previous_status] += 1
+            if 2 * self.stale_entries[previous_status] > len(heap):
+                self._compact(previous_status)
+
+    def get_heap(self, status: ProposalStatus) -> Optional[List[Tuple[int, int]]]:
+        if status == ProposalStatus.Submitted:
+            return self.submitted
+        if status == ProposalStatus.Scheduled:
+            return self.scheduled
+        return None
+
+    def _compact(self, status: ProposalStatus):
+        heap = self.get_heap(status)
+        ids = self.ids_by_status[status]
+
+        heap[:] = [entry for entry in heap if entry[1] in ids]
+        heapq.heapify(heap)
+        self.stale_entries[status] = 0
+
+
+def _heap_ids_up_to(heap: List[Tuple[int, int]], limit: int) -> List[int]:
+    """Ids of all heap entries with a key of at most `limit`, visiting only those entries and their children."""
+    ids = []
+    positions = [0]
+
+    while positions:
+        position = positions.pop()
+
+        if position < len(heap) and heap[position][0] <= limit:
+            ids.append(heap[position][1])
+            positions.extend((2 * position + 1, 2 * position + 2))
+
+    return ids
+
+
 @dataclass
 class Proposals:
     state: ProposalState = field(default_factory=lambda: ProposalState())
     time_manager: TimeManager = None
     proposal_id_offset: int = 1
+    index: ProposalsIndex = field(default_factory=ProposalsIndex, compare=False, repr=False)
 
     def initialize(self, time_manager: TimeManager):
         self.time_manager = time_manager
@@ -90,12 +148,15 @@ class Proposals:
             id=new_proposal_id,
             status=ProposalStatus.Submitted,
             executor=executor,
-            submittedAt=Timestamp.from_uint256(self.time_manager.get_current_timestamp()),
+            submittedAt=self.time_manager.get_current_timestamp_value(),
             calls=calls,
         )
 
         self.state.proposals.append(new_proposal)
 
+        self.index.set_status(new_proposal_id, ProposalStatus.NotExist, ProposalStatus.Submitted)
+        heapq.heappush(self.index.submitted, (new_proposal.submittedAt.value, new_proposal_id))
+
         return new_proposal_id
 
     def schedule(self, proposal_id: int, after_submit_delay: int):
@@ -105,8 +166,9 @@ class Proposals:
         self._check_after_submit_delay_passed(proposal_id, after_submit_delay)
 
         proposal = self._get_proposal(proposal_id)
-        proposal.scheduledAt = Timestamp.from_uint256(self.time_manager.get_current_timestamp())
-        proposal.status = ProposalStatus.Scheduled
+        proposal.scheduledAt = self.time_manager.get_current_timestamp_value()
+        self._set_status(proposal, ProposalStatus.Scheduled)
+        heapq.heappush(self.index.scheduled, (proposal.scheduledAt.value, proposal_id))
 
     def execute(self, proposal_id: int, after_schedule_delay: int):
         self._check_proposal_scheduled(proposal_id)
@@ -115,8 +177,8 @@ class Proposals:
         self._check_after_schedule_delay_passed(proposal_id, after_schedule_delay)
 
         proposal = self._get_proposal(proposal_id)
-        proposal.executedAt = Timestamp.from_uint256(self.time_manager.get_current_timestamp())
-        proposal.status = ProposalStatus.Executed
+        proposal.executedAt = self.time_manager.get_current_timestamp_value()
+        self._set_status(proposal, ProposalStatus.Executed)
 
     def cancel(self, proposal_id: int):
         proposal = self._get_proposal(proposal_id)
@@ -124,13 +186,18 @@ class Proposals:
             return
         elif proposal.status == ProposalStatus.Cancelled:
             return
-        proposal.cancelledAt = Timestamp.from_uint256(self.time_manager.get_current_timestamp())
-        proposal.status = ProposalStatus.Cancelled
+        proposal.cancelledAt = self.time_manager.get_current_timestamp_value()
+        self._set_status(proposal, ProposalStatus.Cancelled)
 
     def cancel_all(self):
         last_proposal_id = len(self.state.proposals) + self.proposal_id_offset - 1
-        for proposal_id in range(self.state.last_canceled_proposal_id + 1, last_proposal_id + 1):
-            self.cancel(proposal_id)
+        pending_ids = self.get_proposal_ids_by_status(ProposalStatus.Submitted) + self.get_proposal_ids_by_status(
+            ProposalStatus.Scheduled
+        )
+
+        for proposal_id in sorted(pending_ids):
+            if proposal_id > self.state.last_canceled_proposal_id:
+                self.cancel(proposal_id)
 
         self.state.last_canceled_proposal_id = last_proposal_id
 
@@ -150,6 +217,17 @@ class Proposals:
     def count(self) -> int:
         return len(self.state.proposals)
 
+    def get_proposal_ids_by_status(self, status: ProposalStatus) -> List[int]:
+        return sorted(self.index.ids_by_status[status])
+
+    def get_schedulable_proposal_ids(self, after_submit_delay: int) -> List[int]:
+        """Ids of all proposals `can_schedule` is true for, in id order, without visiting the other proposals."""
+        return self._get_ready_proposal_ids(ProposalStatus.Submitted, after_submit_delay)
+
+    def get_executable_proposal_ids(self, after_schedule_delay: int) -> List[int]:
+        """Ids of all proposals `can_execute` is true for, in id order, without visiting the other proposals."""
+        return self._get_ready_proposal_ids(ProposalStatus.Scheduled, after_schedule_delay)
+
     ## ---
     ## external checks
     ## ---
@@ -160,7 +238,7 @@ class Proposals:
             return False
 
         return (proposal.status == ProposalStatus.Scheduled) and (
-            Timestamp.from_uint256(self.time_manager.get_current_timestamp())
+            self.time_manager.get_current_timestamp_value()
             >= proposal.scheduledAt + Timestamp.from_uint256(after_schedule_delay)
         )
 
@@ -170,7 +248,7 @@ class Proposals:
             return False
 
         return (proposal.status == ProposalStatus.Submitted) and (
-            Timestamp.from_uint256(self.time_manager.get_current_timestamp())
+            self.time_manager.get_current_timestamp_value()
             >= proposal.submittedAt + Timestamp.from_uint256(after_submit_delay)
         )
 
@@ -206,6 +284,20 @@ class Proposals:
         ) < proposal.scheduledAt + Timestamp.from_uint256(after_schedule_delay):
             raise ProposalErrors.AfterScheduleDelayNotPassed
 
+    def _set_status(self, proposal: Proposal, status: ProposalStatus):
+        self.index.set_status(proposal.id, proposal.status, status)
+        proposal.status = status
+
+    def _get_ready_proposal_ids(self, status: ProposalStatus, delay: int) -> List[int]:
+        limit = self.time_manager.get_current_timestamp() - delay
+        ids = self.index.ids_by_status[status]
+
+        return sorted(
+            proposal_id
+            for proposal_id in _heap_ids_up_to(self.index.get_heap(status), limit)
+            if proposal_id in ids and not self._is_proposal_marked_cancelled(proposal_id)
+        )
+
     def _get_proposal(self, proposal_id: int) -> Proposal:
         return self.state.proposals[proposal_id - self.proposal_id_offset]
 
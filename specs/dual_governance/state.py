@@ -6,7 +6,7 @@ from specs.escrow.escrow import Escrow
 from specs.lido import Lido
 from specs.time_manager import TimeManager
 from specs.types.timestamp import Timestamp
-from specs.utils import generate_address
+from specs.utils import AddressAllocator, generate_address
 
 from .config import DualGovernanceConfig
 from .errors import Errors
@@ -32,6 +32,9 @@ class DualGovernanceState:
     rage_quit_escrow: Escrow = None
     rage_quit_round: int = 0
     time_manager: TimeManager = None
+    escrow_address_allocator: AddressAllocator = field(default_factory=lambda: AddressAllocator(namespace="escrow"))
+    dynamic_timelock_duration_cache: tuple[tuple, Timestamp] = field(default=None, repr=False, compare=False)
+    state_evaluation_cache: tuple[tuple, int, int] = field(default=None, repr=False, compare=False)
 
     def initialize(self, escrow_master_copy, time_manager: TimeManager, lido: Lido):
         if self.signalling_escrow is not None:
@@ -40,6 +43,19 @@ class DualGovernanceState:
         self._deploy_new_signalling_escrow(escrow_master_copy, time_manager, lido)
 
     def activate_next_state(self):
+        """
+        The state machine is only re-evaluated when the state, the signalling escrow rage quit support version or
+        the time since the last evaluation could change the outcome. Time-based guards can only flip at the next
+        deadline recorded by `_get_next_state_deadline`, so calls before it with unchanged support are skipped.
+        """
+        timestamp = self.time_manager.get_current_timestamp()
+        evaluation_key = (self.state, self.signalling_escrow.get_rage_quit_support_version())
+
+        if self.state_evaluation_cache is not None:
+            cache_key, evaluated_at, deadline = self.state_evaluation_cache
+            if cache_key == evaluation_key and evaluated_at <= timestamp and (deadline is None or timestamp < deadline):
+                return
+
         old_state = self.state
         if old_state == State.Normal:
             new_state = self._from_normal_state()
@@ -57,6 +73,9 @@ class DualGovernanceState:
         if old_state != new_state:
             self.state = new_state
             self._handle_state_transition_side_effects(old_state, new_state)
+            self.state_evaluation_cache = None
+        elif old_state != State.RageQuit:
+            self.state_evaluation_cache = (evaluation_key, timestamp, self._get_next_state_deadline(timestamp))
 
     def check_proposals_creation_allowed(self):
         ## TODO: Add additional checks from the actual specification
@@ -237,8 +256,42 @@ class DualGovernanceState:
     def _is_veto_cooldown_duration_passed(self):
         return self.time_manager.get_current_timestamp_value() > self.config.veto_cooldown_duration + self.entered_at
 
+    def _get_next_state_deadline(self, timestamp: int) -> int:
+        """
+        Returns the first timestamp at which one of the time-based guards of the current state can flip, or None
+        when the state has no such guards. Guards compare with a strict inequality, so a guard on `deadline`
+        flips at `deadline + 1`. The rage quit state also depends on the rage quit escrow and is never skipped.
+        """
+        config = self.config
+        state = self.state
+
+        if state == State.VetoSignalling:
+            rage_quit_support = self.signalling_escrow.get_rage_quit_support()
+            deadlines = [
+                self._calc_dynamic_timelock_duration(rage_quit_support) + self.veto_signalling_activation_time,
+                config.veto_signalling_min_active_duration + self.veto_signalling_reactivation_time,
+            ]
+        elif state == State.VetoSignallingDeactivation:
+            rage_quit_support = self.signalling_escrow.get_rage_quit_support()
+            deadlines = [
+                self._calc_dynamic_timelock_duration(rage_quit_support) + self.veto_signalling_activation_time,
+                config.veto_signalling_deactivation_max_duration + self.entered_at,
+            ]
+        elif state == State.VetoCooldown:
+            deadlines = [config.veto_cooldown_duration + self.entered_at]
+        else:
+            deadlines = []
+
+        upcoming_deadlines = [deadline.value + 1 for deadline in deadlines if deadline.value >= timestamp]
+
+        return min(upcoming_deadlines) if upcoming_deadlines else None
+
     def _deploy_new_signalling_escrow(self, escrow_master_copy, time_manager: TimeManager, lido: Lido):
-        address = generate_address() if not escrow_master_copy or escrow_master_copy == "" else escrow_master_copy
+        address = (
+            generate_address(self.escrow_address_allocator)
+            if not escrow_master_copy or escrow_master_copy == ""
+            else escrow_master_copy
+        )
 
         clone = Escrow(address)
         clone.initialize(address, lido, self, time_manager)
@@ -253,6 +306,23 @@ class DualGovernanceState:
         return min(left, right)
 
     def _calc_dynamic_timelock_duration(self, rage_quit_support) -> Timestamp:
+        config = self.config
+        cache_key = (
+            rage_quit_support,
+            config.first_seal_rage_quit_support,
+            config.second_seal_rage_quit_support,
+            config.dynamic_timelock_min_duration,
+            config.dynamic_timelock_max_duration,
+        )
+        if self.dynamic_timelock_duration_cache is not None and self.dynamic_timelock_duration_cache[0] == cache_key:
+            return self.dynamic_timelock_duration_cache[1]
+
+        duration = self._compute_dynamic_timelock_duration(rage_quit_support)
+        self.dynamic_timelock_duration_cache = (cache_key, duration)
+
+        return duration
+
+    def _compute_dynamic_timelock_duration(self, rage_quit_support) -> Timestamp:
         first_seal_rage_quit_support = self.config.first_seal_rage_quit_support
         second_seal_rage_quit_support = self.config.second_seal_rage_quit_support
         dynamic_timelock_min_duration = self.config.dynamic_timelock_min_duration
@@ -61,6 +61,15 @@ class EmergencyProtectedTimelock:
     def can_schedule(self, proposal_id: int) -> bool:
         return self.proposals.can_schedule(proposal_id, self.after_submit_delay)
 
+    def get_schedulable_proposal_ids(self) -> List[int]:
+        return self.proposals.get_schedulable_proposal_ids(self.after_submit_delay)
+
+    def get_executable_proposal_ids(self) -> List[int]:
+        if self.emergency_protection.is_emergency_mode_activated():
+            return []
+
+        return self.proposals.get_executable_proposal_ids(self.after_schedule_delay)
+
     def can_execute(self, proposal_id: int) -> bool:
         return self.emergency_protection.is_emergency_mode_activated() is not True and self.proposals.can_execute(
             proposal_id, self.after_schedule_delay
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
 
 from specs.time_manager import TimeManager
 from specs.types.eth_value import ETHValue
@@ -65,18 +67,315 @@ class UnstETHRecord:
     claimableAmount: ETHValue = field(default_factory=lambda: ETHValue(0))
 
 
+class HolderAssetsView:
+    """Attribute access to the assets of a single holder kept in `HoldersAssets`, writes go to the arrays."""
+
+    __slots__ = ("holders", "holder_id")
+
+    def __init__(self, holders: "HoldersAssets", holder_id: int):
+        self.holders = holders
+        self.holder_id = holder_id
+
+    @property
+    def stETHLockedShares(self) -> SharesValue:
+        return SharesValue(self.holders.stETH_locked_shares[self.holder_id])
+
+    @stETHLockedShares.setter
+    def stETHLockedShares(self, shares: SharesValue):
+        self.holders.stETH_locked_shares[self.holder_id] = shares.value
+
+    @property
+    def unstETHLockedShares(self) -> SharesValue:
+        return SharesValue(self.holders.unstETH_locked_shares[self.holder_id])
+
+    @unstETHLockedShares.setter
+    def unstETHLockedShares(self, shares: SharesValue):
+        self.holders.unstETH_locked_shares[self.holder_id] = shares.value
+
+    @property
+    def lastAssetsLockTimestamp(self) -> Timestamp:
+        return Timestamp(int(self.holders.last_assets_lock_timestamp[self.holder_id]))
+
+    @lastAssetsLockTimestamp.setter
+    def lastAssetsLockTimestamp(self, timestamp: Timestamp):
+        self.holders.last_assets_lock_timestamp[self.holder_id] = timestamp.value
+
+    @property
+    def unstETHIds(self) -> List[int]:
+        return self.holders.unstETH_ids.setdefault(self.holder_id, [])
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros(capacity, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+@dataclass(eq=False)
+class HoldersAssets:
+    """
+    Assets of all holders stored as growable column arrays indexed by holder id, in the order holders first locked.
+    Shares are kept as Python integers in object arrays and the unstETH ids only exist for holders that locked
+    unstETH. Item access by address returns a `HolderAssetsView`, which keeps the storage usable as the mapping of
+    `HolderAssets` it replaces, while the batch operations of `AssetsAccounting` work on the ids directly.
+    """
+
+    INITIAL_CAPACITY: int = 64
+
+    length: int = 0
+    ids: Dict[str, int] = field(default_factory=dict)
+    holder: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    stETH_locked_shares: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    unstETH_locked_shares: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    last_assets_lock_timestamp: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    unstETH_ids: Dict[int, List[int]] = field(default_factory=dict)
+
+    def add(self, holder: str) -> int:
+        """Returns the id of `holder`, adding it with empty assets if it is not known yet."""
+        holder_id = self.ids.get(holder)
+
+        if holder_id is None:
+            holder_id = self.length
+            self._reserve(1)
+            self.ids[holder] = holder_id
+            self.holder[holder_id] = holder
+            self.length += 1
+
+        return holder_id
+
+    def add_many(self, holders: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.add(holder) for holder in holders), dtype=np.int64, count=len(holders))
+
+    def find_ids(self, holders: Sequence[str]) -> np.ndarray:
+        """Returns the ids of the holders, -1 for unknown ones."""
+        ids = self.ids
+        return np.fromiter((ids.get(holder, -1) for holder in holders), dtype=np.int64, count=len(holders))
+
+    def get_ids(self, holders: Sequence[str]) -> np.ndarray:
+        """Returns the ids of known holders, raising `KeyError` for the first unknown one like item access."""
+        ids = self.ids
+        return np.fromiter((ids[holder] for holder in holders), dtype=np.int64, count=len(holders))
+
+    def get(self, holder: str, default: HolderAssets = None) -> HolderAssetsView:
+        holder_id = self.ids.get(holder)
+        if holder_id is None:
+            return default
+        return HolderAssetsView(self, holder_id)
+
+    def __getitem__(self, holder: str) -> HolderAssetsView:
+        return HolderAssetsView(self, self.ids[holder])
+
+    def __setitem__(self, holder: str, assets: HolderAssets):
+        holder_id = self.add(holder)
+
+        self.stETH_locked_shares[holder_id] = assets.stETHLockedShares.value
+        self.unstETH_locked_shares[holder_id] = assets.unstETHLockedShares.value
+        self.last_assets_lock_timestamp[holder_id] = assets.lastAssetsLockTimestamp.value
+        self.unstETH_ids[holder_id] = assets.unstETHIds
+
+    def __contains__(self, holder: str) -> bool:
+        return holder in self.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, HoldersAssets) or self.ids.keys() != other.ids.keys():
+            return False
+
+        other_ids = other.get_ids(list(self.ids))
+
+        return (
+            np.array_equal(self.stETH_locked_shares[: self.length], other.stETH_locked_shares[other_ids])
+            and np.array_equal(self.unstETH_locked_shares[: self.length], other.unstETH_locked_shares[other_ids])
+            and np.array_equal(
+                self.last_assets_lock_timestamp[: self.length], other.last_assets_lock_timestamp[other_ids]
+            )
+            and all(
+                self.unstETH_ids.get(holder_id, []) == other.unstETH_ids.get(int(other_id), [])
+                for holder_id, other_id in enumerate(other_ids)
+            )
+        )
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+
+        for name in ("holder", "stETH_locked_shares", "unstETH_locked_shares", "last_assets_lock_timestamp"):
+            state[name] = state[name][: self.length]
+
+        return state
+
+    def _reserve(self, count: int):
+        required = self.length + count
+        if required <= len(self.last_assets_lock_timestamp):
+            return
+
+        capacity = max(required, 2 * len(self.last_assets_lock_timestamp), self.INITIAL_CAPACITY)
+        self.holder = _grow(self.holder, capacity)
+        self.stETH_locked_shares = _grow(self.stETH_locked_shares, capacity)
+        self.unstETH_locked_shares = _grow(self.unstETH_locked_shares, capacity)
+        self.last_assets_lock_timestamp = _grow(self.last_assets_lock_timestamp, capacity)
+
+
+class UnstETHRecordView:
+    """Attribute access to a single record kept in `UnstETHRecords`, writes go to the underlying arrays."""
+
+    __slots__ = ("records", "unstETH_id")
+
+    def __init__(self, records: "UnstETHRecords", unstETH_id: int):
+        self.records = records
+        self.unstETH_id = unstETH_id
+
+    @property
+    def index(self) -> IndexOneBased:
+        return IndexOneBased(int(self.records.index[self.unstETH_id]))
+
+    @index.setter
+    def index(self, index: IndexOneBased):
+        self.records.index[self.unstETH_id] = index.value
+
+    @property
+    def lockedBy(self) -> str:
+        return self.records.locked_by[self.unstETH_id]
+
+    @property
+    def status(self) -> UnstETHRecordStatus:
+        return UnstETHRecordStatus(int(self.records.status[self.unstETH_id]))
+
+    @status.setter
+    def status(self, status: UnstETHRecordStatus):
+        self.records.status[self.unstETH_id] = status.value
+
+    @property
+    def shares(self) -> SharesValue:
+        return SharesValue(self.records.shares[self.unstETH_id])
+
+    @property
+    def claimableAmount(self) -> ETHValue:
+        return ETHValue(self.records.claimable_amount[self.unstETH_id])
+
+    @claimableAmount.setter
+    def claimableAmount(self, amount: ETHValue):
+        self.records.claimable_amount[self.unstETH_id] = amount.value
+
+
+@dataclass(eq=False)
+class UnstETHRecords:
+    """
+    Records of locked unstETH stored as column arrays indexed by the unstETH id. Withdrawal request ids are
+    consecutive, so the arrays grow up to the largest locked id and `exists` marks the ids that have a record.
+    Item access returns an `UnstETHRecordView`, like the mapping of `UnstETHRecord`s it replaces.
+    """
+
+    INITIAL_CAPACITY: int = 64
+
+    exists: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.bool_))
+    index: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    locked_by: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    status: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int8))
+    shares: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    claimable_amount: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+
+    def get(self, unstETH_id: int, default: UnstETHRecord = None) -> UnstETHRecordView:
+        if unstETH_id in self:
+            return UnstETHRecordView(self, unstETH_id)
+        return default
+
+    def __getitem__(self, unstETH_id: int) -> UnstETHRecordView:
+        if unstETH_id not in self:
+            raise KeyError(unstETH_id)
+        return UnstETHRecordView(self, unstETH_id)
+
+    def __setitem__(self, unstETH_id: int, record: UnstETHRecord):
+        self._reserve(unstETH_id + 1)
+
+        self.exists[unstETH_id] = True
+        self.index[unstETH_id] = record.index.value
+        self.locked_by[unstETH_id] = record.lockedBy
+        self.status[unstETH_id] = record.status.value
+        self.shares[unstETH_id] = record.shares.value
+        self.claimable_amount[unstETH_id] = record.claimableAmount.value
+
+    def __delitem__(self, unstETH_id: int):
+        if unstETH_id not in self:
+            raise KeyError(unstETH_id)
+
+        self.exists[unstETH_id] = False
+        self.index[unstETH_id] = 0
+        self.locked_by[unstETH_id] = 0
+        self.status[unstETH_id] = UnstETHRecordStatus.NotLocked.value
+        self.shares[unstETH_id] = 0
+        self.claimable_amount[unstETH_id] = 0
+
+    def __contains__(self, unstETH_id: int) -> bool:
+        return 0 <= unstETH_id < len(self.exists) and bool(self.exists[unstETH_id])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(np.flatnonzero(self.exists).tolist())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.exists))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, UnstETHRecords):
+            return False
+
+        size = min(len(self.exists), len(other.exists))
+
+        return (
+            not self.exists[size:].any()
+            and not other.exists[size:].any()
+            and all(
+                np.array_equal(getattr(self, name)[:size], getattr(other, name)[:size])
+                for name in ("exists", "index", "locked_by", "status", "shares", "claimable_amount")
+            )
+        )
+
+    def exist(self, unstETH_ids: np.ndarray) -> np.ndarray:
+        exist = np.zeros(len(unstETH_ids), dtype=np.bool_)
+        known = (unstETH_ids >= 0) & (unstETH_ids < len(self.exists))
+        exist[known] = self.exists[unstETH_ids[known]]
+
+        return exist
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        size = int(np.flatnonzero(self.exists)[-1]) + 1 if self.exists.any() else 0
+
+        for name in ("exists", "index", "locked_by", "status", "shares", "claimable_amount"):
+            state[name] = state[name][:size]
+
+        return state
+
+    def _reserve(self, size: int):
+        if size <= len(self.exists):
+            return
+
+        capacity = max(size, 2 * len(self.exists), self.INITIAL_CAPACITY)
+        self.exists = _grow(self.exists, capacity)
+        self.index = _grow(self.index, capacity)
+        self.locked_by = _grow(self.locked_by, capacity)
+        self.status = _grow(self.status, capacity)
+        self.shares = _grow(self.shares, capacity)
+        self.claimable_amount = _grow(self.claimable_amount, capacity)
+
+
 @dataclass
 class AssetsAccountingState:
     stETHTotals: StETHAccounting = field(default_factory=lambda: StETHAccounting())
     unstETHTotals: UnstETHAccounting = field(default_factory=lambda: UnstETHAccounting())
-    assets: Dict[str, HolderAssets] = field(default_factory=dict)
-    unstETHRecords: Dict[int, UnstETHRecord] = field(default_factory=dict)
+    assets: HoldersAssets = field(default_factory=HoldersAssets)
+    unstETHRecords: UnstETHRecords = field(default_factory=UnstETHRecords)
 
 
 @dataclass
 class AssetsAccounting:
     state: AssetsAccountingState = field(default_factory=lambda: AssetsAccountingState())
     time_manager: TimeManager = None
+    version: int = field(default=0, compare=False)
 
     def initialize(self, time_manager: TimeManager):
         self.time_manager = time_manager
@@ -90,12 +389,13 @@ class AssetsAccounting:
             shares (int): The number of shares to lock.
         """
 
+        self.version += 1
+
         self._checkNonZeroShares(shares)
 
         self.state.stETHTotals.lockedShares += shares
 
-        if holder not in self.state.assets:
-            self.state.assets[holder] = HolderAssets()
+        self.state.assets.add(holder)
 
         self.state.assets[holder].stETHLockedShares += shares
         self.state.assets[holder].lastAssetsLockTimestamp = Timestamp(self.time_manager.get_current_timestamp())
@@ -107,6 +407,8 @@ class AssetsAccounting:
     #     return shares
 
     def accountStETHSharesUnlock(self, holder: str, shares: SharesValue):
+        self.version += 1
+
         self._checkNonZeroShares(shares)
 
         if self.state.assets[holder].stETHLockedShares < shares:
@@ -116,6 +418,8 @@ class AssetsAccounting:
         self.state.assets[holder].stETHLockedShares -= shares
 
     def accountStETHSharesWithdraw(self, holder: str) -> ETHValue:
+        self.version += 1
+
         assets = self.state.assets[holder]
         stETHSharesToWithdraw = assets.stETHLockedShares
 
@@ -129,7 +433,79 @@ class AssetsAccounting:
 
         return ethWithdrawn
 
+    def accountStETHSharesLockBatch(self, holders: Sequence[str], shares: Sequence[int]):
+        """
+        Same as `accountStETHSharesLock` of every holder and amount of shares in order, with the holder columns
+        updated at once. As with one-by-one locks, the locks before the first zero amount are accounted before
+        `InvalidSharesValue` is raised.
+        """
+        self.version += 1
+
+        shares = np.asarray(shares, dtype=object)
+        count = _count_valid(shares != 0)
+        locked_shares = shares[:count]
+
+        assets = self.state.assets
+        holder_ids = assets.add_many(holders[:count])
+
+        self.state.stETHTotals.lockedShares += SharesValue.from_uint256(int(locked_shares.sum()))
+        np.add.at(assets.stETH_locked_shares, holder_ids, locked_shares)
+        assets.last_assets_lock_timestamp[holder_ids] = self.time_manager.get_current_timestamp()
+
+        if count < len(shares):
+            raise Errors.InvalidSharesValue
+
+    def accountStETHSharesUnlockBatch(self, holders: Sequence[str], shares: Sequence[int]):
+        """
+        Same as `accountStETHSharesUnlock` of every holder and amount of shares in order. A holder unlocking
+        several times is checked against the shares left by its earlier unlocks, and the unlocks before the first
+        failing one are accounted before its error is raised.
+        """
+        self.version += 1
+
+        shares = np.asarray(shares, dtype=object)
+        holder_ids, known = self._get_holder_ids(holders)
+        locked_shares = self._get_stETH_locked_shares(holder_ids, known)
+        unlocked_before = _exclusive_cumsum_by_id(holder_ids, shares)
+
+        count = _count_valid((shares != 0) & known & (locked_shares - unlocked_before >= shares))
+        unlocked_shares = shares[:count]
+
+        self.state.stETHTotals.lockedShares -= SharesValue.from_uint256(int(unlocked_shares.sum()))
+        np.subtract.at(self.state.assets.stETH_locked_shares, holder_ids[:count], unlocked_shares)
+
+        if count < len(shares):
+            if shares[count] != 0 and not known[count]:
+                raise KeyError(holders[count])
+            raise Errors.InvalidSharesValue
+
+    def accountStETHSharesWithdrawBatch(self, holders: Sequence[str]) -> np.ndarray:
+        """
+        Same as `accountStETHSharesWithdraw` of every holder in order and returns the withdrawn ETH of each holder
+        as integers. The withdrawals before the first failing one are accounted before its error is raised.
+        """
+        self.version += 1
+
+        holder_ids, known = self._get_holder_ids(holders)
+        shares = self._get_stETH_locked_shares(holder_ids, known)
+
+        count = _count_valid(known & (shares != 0) & _first_occurrences(holder_ids))
+        withdrawn_shares = shares[:count]
+
+        self.state.assets.stETH_locked_shares[holder_ids[:count]] = 0
+
+        if count < len(holder_ids):
+            if not known[count]:
+                raise KeyError(holders[count])
+            raise Errors.InvalidSharesValue
+
+        stETHTotals = self.state.stETHTotals
+
+        return stETHTotals.claimedETH.value * withdrawn_shares // stETHTotals.lockedShares.value
+
     def accountClaimedStETH(self, amount: ETHValue):
+        self.version += 1
+
         self.state.stETHTotals.claimedETH += amount
 
     ## ---
@@ -137,15 +513,13 @@ class AssetsAccounting:
     ## ---
 
     def accountUnstETHLock(self, holder: str, unstETHIds: List[int], statuses: List[WithdrawalRequestStatus]):
+        self.version += 1
+
         if len(unstETHIds) != len(statuses):
             raise Errors.IncorrectParameters
 
-        totalUnstETHLocked = SharesValue(0)
-        for i in range(len(unstETHIds)):
-            totalUnstETHLocked += self._addUnstETHRecord(holder, unstETHIds[i], statuses[i])
-
-        if holder not in self.state.assets:
-            self.state.assets[holder] = HolderAssets()
+        totalUnstETHLocked = self._addUnstETHRecords(holder, unstETHIds, statuses)
+        self.state.assets.add(holder)
 
         self.state.assets[holder].lastAssetsLockTimestamp = Timestamp.from_uint256(
             self.time_manager.get_current_timestamp()
@@ -154,6 +528,8 @@ class AssetsAccounting:
         self.state.unstETHTotals.unfinalizedShares += totalUnstETHLocked
 
     def accountUnstETHUnlock(self, holder: str, unstETHIds: List[int]):
+        self.version += 1
+
         totalSharesUnlocked = SharesValue(0)
         totalFinalizedSharesUnlocked = SharesValue(0)
         totalFinalizedAmountUnlocked = ETHValue(0)
@@ -174,24 +550,19 @@ class AssetsAccounting:
         self.state.unstETHTotals.unfinalizedShares -= totalSharesUnlocked - totalFinalizedSharesUnlocked
 
     def accountUnstETHFinalized(self, unstETHIds: List[int], claimableAmounts: List[int]):
+        self.version += 1
+
         if len(unstETHIds) != len(claimableAmounts):
             raise Errors.IncorrectParameters
 
-        totalAmountFinalized = ETHValue(0)
-        totalSharesFinalized = SharesValue(0)
-
-        for i in range(len(unstETHIds)):
-            values: tuple[SharesValue, ETHValue] = self._finalizeUnstETHRecord(unstETHIds[i], claimableAmounts[i])
-            sharesFinalized = values[0]
-            amountFinalized = values[1]
-
-            totalSharesFinalized = totalSharesFinalized + sharesFinalized
-            totalAmountFinalized = totalAmountFinalized + amountFinalized
+        totalSharesFinalized, totalAmountFinalized = self._finalizeUnstETHRecords(unstETHIds, claimableAmounts)
 
         self.state.unstETHTotals.finalizedETH += totalAmountFinalized
         self.state.unstETHTotals.unfinalizedShares -= totalSharesFinalized
 
     def accountUnstETHClaimed(self, unstETHIds: List[int], claimableAmounts: List[int]) -> ETHValue:
+        self.version += 1
+
         if len(unstETHIds) != len(claimableAmounts):
             raise Errors.IncorrectParameters
 
@@ -205,9 +576,34 @@ class AssetsAccounting:
         return totalAmountClaimed
 
     def accountUnstETHWithdraw(self, holder: str, unstETHIds: List[int]) -> ETHValue:
-        amountWithdrawn = ETHValue(0)
-        for unstETHId in unstETHIds:
-            amountWithdrawn += self._withdrawUnstETHRecord(holder, unstETHId)
+        """
+        Marks the claimed records of the holder as withdrawn at once and returns their total claimable amount. The
+        records before the first failing one are withdrawn before its error is raised.
+        """
+        self.version += 1
+
+        records = self.state.unstETHRecords
+        unstETHIds = np.asarray(unstETHIds, dtype=np.int64)
+        exist = records.exist(unstETHIds)
+
+        status = np.full(len(unstETHIds), UnstETHRecordStatus.NotLocked.value, dtype=np.int8)
+        status[exist] = records.status[unstETHIds[exist]]
+        lockedBy = np.zeros(len(unstETHIds), dtype=object)
+        lockedBy[exist] = records.locked_by[unstETHIds[exist]]
+
+        claimed = (status == UnstETHRecordStatus.Claimed.value) & _first_occurrences(unstETHIds)
+        count = _count_valid(exist & claimed & (lockedBy == holder))
+        withdrawnIds = unstETHIds[:count]
+
+        records.status[withdrawnIds] = UnstETHRecordStatus.Withdrawn.value
+        amountWithdrawn = ETHValue.from_uint256(int(records.claimable_amount[withdrawnIds].sum()))
+
+        if count < len(unstETHIds):
+            if not exist[count]:
+                raise KeyError(int(unstETHIds[count]))
+            if not claimed[count]:
+                raise Errors.InvalidUnstETHStatus
+            raise Errors.InvalidUnstETHHolder
 
         return amountWithdrawn
 
@@ -226,7 +622,7 @@ class AssetsAccounting:
             self.state.assets[holder].lastAssetsLockTimestamp.value + assetsUnlockDelay
         )
 
-        time_now = Timestamp.from_uint256(self.time_manager.get_current_timestamp())
+        time_now = self.time_manager.get_current_timestamp_value()
 
         if time_now <= assetsUnlockAllowedAfter:
             raise Errors.AssetsUnlockDelayNotPassed
@@ -235,41 +631,71 @@ class AssetsAccounting:
     ## Internal methods
     ## ---
 
+    def _get_holder_ids(self, holders: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the ids of the holders, zero for unknown ones, and the mask of known holders."""
+        holder_ids = self.state.assets.find_ids(holders)
+        known = holder_ids >= 0
+
+        return np.where(known, holder_ids, 0), known
+
+    def getStETHLockedShares(self, holders: Sequence[str]) -> np.ndarray:
+        """Returns the locked stETH shares of every holder as integers, zero for unknown holders."""
+        return self._get_stETH_locked_shares(*self._get_holder_ids(holders))
+
+    def hasStETHLockedShares(self) -> bool:
+        assets = self.state.assets
+        return bool(assets.stETH_locked_shares[: assets.length].any())
+
+    def _get_stETH_locked_shares(self, holder_ids: np.ndarray, known: np.ndarray) -> np.ndarray:
+        shares = np.zeros(len(holder_ids), dtype=object)
+        shares[known] = self.state.assets.stETH_locked_shares[holder_ids[known]]
+
+        return shares
+
     def _checkNonZeroShares(self, shares: SharesValue):
         if shares.value == 0:
             raise Errors.InvalidSharesValue
 
-    def _addUnstETHRecord(self, holder: str, unstETHId: int, status: WithdrawalRequestStatus) -> SharesValue:
-        if status.is_finalized:
-            raise Errors.InvalidUnstETHStatus
-
-        assert status.is_claimed is not True
+    def _addUnstETHRecords(
+        self, holder: str, unstETHIds: List[int], statuses: List[WithdrawalRequestStatus]
+    ) -> SharesValue:
+        """
+        Adds the records of all locked unstETH ids and returns their total shares, summed as plain integers. Records
+        before the first invalid id are added, as when adding them one by one, and the holder is only added once its
+        first id is valid.
+        """
+        assets: HolderAssetsView = None
+        records = self.state.unstETHRecords
+        totalShares = 0
 
-        if unstETHId not in self.state.unstETHRecords:
-            self.state.unstETHRecords[unstETHId] = UnstETHRecord()
+        for unstETHId, status in zip(unstETHIds, statuses):
+            if status.is_finalized:
+                raise Errors.InvalidUnstETHStatus
 
-        if self.state.unstETHRecords[unstETHId].status != UnstETHRecordStatus.NotLocked:
-            raise Errors.InvalidUnstETHStatus
+            assert status.is_claimed is not True
 
-        if holder not in self.state.assets:
-            self.state.assets[holder] = HolderAssets()
+            record = records.get(unstETHId)
+            if record is not None and record.status != UnstETHRecordStatus.NotLocked:
+                raise Errors.InvalidUnstETHStatus
 
-        assets: HolderAssets = self.state.assets[holder]
-        assets.unstETHIds.append(unstETHId)
+            if assets is None:
+                self.state.assets.add(holder)
+                assets = self.state.assets[holder]
 
-        shares = SharesValue(status.amount_of_shares)
-        self.state.unstETHRecords[unstETHId] = UnstETHRecord(
-            index=IndexOneBased.fromValue(len(assets.unstETHIds)),
-            lockedBy=holder,
-            status=UnstETHRecordStatus.Locked,
-            shares=shares,
-            claimableAmount=ETHValue(0),
-        )
+            assets.unstETHIds.append(unstETHId)
+            records[unstETHId] = UnstETHRecord(
+                index=IndexOneBased.fromValue(len(assets.unstETHIds)),
+                lockedBy=holder,
+                status=UnstETHRecordStatus.Locked,
+                shares=SharesValue(status.amount_of_shares),
+                claimableAmount=ETHValue(0),
+            )
+            totalShares += status.amount_of_shares
 
-        return shares
+        return SharesValue(totalShares)
 
     def _removeUnstETHRecord(self, holder: str, unstETHId: int) -> tuple[SharesValue, ETHValue]:
-        unstETHRecord: UnstETHRecord = self.state.unstETHRecords[unstETHId]
+        unstETHRecord: UnstETHRecordView = self.state.unstETHRecords[unstETHId]
 
         if unstETHRecord.lockedBy != holder:
             raise Errors.InvalidUnstETHHolder
@@ -283,7 +709,7 @@ class AssetsAccounting:
         if unstETHRecord.status == UnstETHRecordStatus.Finalized:
             finalizedAmountUnlocked = unstETHRecord.claimableAmount
 
-        assets: HolderAssets = self.state.assets[holder]
+        assets: HolderAssetsView = self.state.assets[holder]
         unstETHIdIndex: IndexOneBased = unstETHRecord.index
         lastUnstETHIdIndex: IndexOneBased = IndexOneBased.fromValue(len(assets.unstETHIds))
 
@@ -297,24 +723,30 @@ class AssetsAccounting:
 
         return sharesUnlocked, finalizedAmountUnlocked
 
-    def _finalizeUnstETHRecord(self, unstETHId: int, claimableAmount: int) -> tuple[SharesValue, ETHValue]:
-        unstETHRecord: UnstETHRecord = self.state.unstETHRecords[unstETHId]
+    def _finalizeUnstETHRecords(
+        self, unstETHIds: List[int], claimableAmounts: List[int]
+    ) -> tuple[SharesValue, ETHValue]:
+        """Marks the locked records with a non-zero claimable amount as finalized and returns their totals."""
+        records = self.state.unstETHRecords
+        totalShares = 0
+        totalAmount = 0
 
-        if claimableAmount == 0 or unstETHRecord.status != UnstETHRecordStatus.Locked:
-            return SharesValue(0), ETHValue(0)
+        for unstETHId, claimableAmount in zip(unstETHIds, claimableAmounts):
+            unstETHRecord: UnstETHRecordView = records[unstETHId]
 
-        sharesFinalized = unstETHRecord.shares
-        amountFinalized = ETHValue.from_uint256(claimableAmount)
+            if claimableAmount == 0 or unstETHRecord.status != UnstETHRecordStatus.Locked:
+                continue
 
-        unstETHRecord.status = UnstETHRecordStatus.Finalized
-        unstETHRecord.claimableAmount = amountFinalized
+            unstETHRecord.status = UnstETHRecordStatus.Finalized
+            unstETHRecord.claimableAmount = ETHValue.from_uint256(claimableAmount)
 
-        self.state.unstETHRecords[unstETHId] = unstETHRecord
+            totalShares += unstETHRecord.shares.value
+            totalAmount += claimableAmount
 
-        return sharesFinalized, amountFinalized
+        return SharesValue(totalShares), ETHValue.from_uint256(totalAmount)
 
     def _claimUnstETHRecord(self, unstETHId: int, claimableAmount: ETHValue):
-        unstETHRecord: UnstETHRecord = self.state.unstETHRecords[unstETHId]
+        unstETHRecord: UnstETHRecordView = self.state.unstETHRecords[unstETHId]
 
         if (unstETHRecord.status != UnstETHRecordStatus.Locked) and (
             unstETHRecord.status != UnstETHRecordStatus.Finalized
@@ -329,18 +761,32 @@ class AssetsAccounting:
 
         unstETHRecord.status = UnstETHRecordStatus.Claimed
 
-        self.state.unstETHRecords[unstETHId] = unstETHRecord
 
-    def _withdrawUnstETHRecord(self, holder: str, unstETHId: int) -> ETHValue:
-        unstETHRecord: UnstETHRecord = self.state.unstETHRecords[unstETHId]
+def _count_valid(valid: np.ndarray) -> int:
+    """Returns the number of items before the first invalid one."""
+    invalid = np.flatnonzero(~valid)
+    return int(invalid[0]) if len(invalid) > 0 else len(valid)
 
-        if unstETHRecord.status != UnstETHRecordStatus.Claimed:
-            raise Errors.InvalidUnstETHStatus
 
-        if unstETHRecord.lockedBy != holder:
-            raise Errors.InvalidUnstETHHolder
+def _first_occurrences(ids: np.ndarray) -> np.ndarray:
+    first = np.zeros(len(ids), dtype=np.bool_)
+    first[np.unique(ids, return_index=True)[1]] = True
+    return first
 
-        unstETHRecord.status = UnstETHRecordStatus.Withdrawn
-        amountWithdrawn = unstETHRecord.claimableAmount
 
-        return amountWithdrawn
+def _exclusive_cumsum_by_id(ids: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+    """Returns the sum of the amounts of every earlier item with the same id."""
+    if len(ids) == 0:
+        return np.zeros(0, dtype=object)
+
+    order = np.argsort(ids, kind="stable")
+    sorted_amounts = amounts[order]
+    cumulative = np.cumsum(sorted_amounts)
+
+    group_starts = np.flatnonzero(np.r_[True, ids[order][1:] != ids[order][:-1]])
+    group_start = np.repeat(group_starts, np.diff(np.r_[group_starts, len(ids)]))
+
+    exclusive = np.empty(len(ids), dtype=object)
+    exclusive[order] = cumulative - sorted_amounts - (cumulative[group_start] - sorted_amounts[group_start])
+
+    return exclusive
@@ -1,7 +1,9 @@
 from dataclasses import dataclass, field
 from datetime import timedelta
 from enum import Enum
-from typing import List
+from typing import List, Sequence
+
+import numpy as np
 
 from specs.escrow.accounting import AssetsAccounting
 from specs.escrow.withdrawal_batches import WithdrawalsBatchesQueue
@@ -62,6 +64,9 @@ class Escrow:
 
     signaling_escrow_min_lock_time: timedelta = default(timedelta(hours=5))
 
+    rage_quit_support_cache: tuple[tuple[int, int], int] = field(default=None, repr=False, compare=False)
+    stETH_drained: bool = field(default=False, repr=False, compare=False)
+
     def initialize(self, address, lido: Lido, dual_governance: any, time_manager: TimeManager):
         accounting = AssetsAccounting()
         accounting.initialize(time_manager)
@@ -147,9 +152,7 @@ class Escrow:
         self._check_escrow_state(EscrowState.SignallingEscrow)
         statuses = self.withdrawal_queue.get_withdrawal_status(unstETH_ids)
         self.accounting.accountUnstETHLock(holder, unstETH_ids, statuses)
-
-        for unstETH_id in unstETH_ids:
-            self.withdrawal_queue.transferFrom(holder, holder, self.address, unstETH_id)
+        self.withdrawal_queue.batchTransferFrom(holder, holder, self.address, unstETH_ids)
 
         self._activate_next_governance_state()
 
@@ -158,9 +161,7 @@ class Escrow:
         self._check_escrow_state(EscrowState.SignallingEscrow)
         self.accounting.checkAssetsUnlockDelayPassed(holder, self.signaling_escrow_min_lock_time.total_seconds())
         self.accounting.accountUnstETHUnlock(holder, unstETH_ids)
-
-        for unstETH_id in unstETH_ids:
-            self.withdrawal_queue.transferFrom(self.address, self.address, holder, unstETH_id)
+        self.withdrawal_queue.batchTransferFrom(self.address, self.address, holder, unstETH_ids)
 
         self._activate_next_governance_state()
 
@@ -213,12 +214,9 @@ class Escrow:
         if self.rage_quit_timelock_started_at.is_not_zero():
             raise Errors.ClaimingIsFinished
 
-        unstETH_ids = self.batches_queue.claim_next_batch(max_unstETH_ids_count)
-        hints = self.withdrawal_queue.find_checkpoint_hints(
-            unstETH_ids, 1, self.withdrawal_queue.get_last_checkpoint_index()
-        )
+        unstETH_id_ranges = self.batches_queue.claim_next_batch_ranges(max_unstETH_ids_count)
 
-        self._claim_next_withdrawals_batch(unstETH_ids, hints)
+        self._claim_next_withdrawals_batch(unstETH_id_ranges)
 
     def claim_next_withdrawals_batch_with_hints(self, from_unstETH_id: int, hints: List[int]):
         self._check_escrow_state(EscrowState.RageQuitEscrow)
@@ -226,15 +224,17 @@ class Escrow:
         if self.rage_quit_timelock_started_at.is_not_zero():
             raise Errors.ClaimingIsFinished
 
-        unstETH_ids = self.batches_queue.claim_next_batch(len(hints))
+        ## checked before claiming, so a rejected call leaves the batches queue as it was
+        unstETH_id_ranges = self.batches_queue.get_next_batch_ranges(len(hints))
+        unstETH_ids_count = sum(len(unstETH_id_range) for unstETH_id_range in unstETH_id_ranges)
 
-        if len(unstETH_ids) > 0 and from_unstETH_id != unstETH_ids[0]:
+        if unstETH_ids_count > 0 and from_unstETH_id != unstETH_id_ranges[0].start:
             raise Errors.UnexpectedUnstETHId
 
-        if len(hints) != len(unstETH_ids):
-            Errors.InvalidHintsLength
+        if len(hints) != unstETH_ids_count:
+            raise Errors.InvalidHintsLength
 
-        self._claim_next_withdrawals_batch(unstETH_ids, hints)
+        self._claim_next_withdrawals_batch(self.batches_queue.claim_next_batch_ranges(len(hints)), hints)
 
     def claim_unstETH(self, unstETH_ids: List[int], hints: List[int]):
         self._check_escrow_state(EscrowState.RageQuitEscrow)
@@ -253,9 +253,25 @@ class Escrow:
         self._check_escrow_state(EscrowState.RageQuitEscrow)
         self._check_withdrawals_timelock_passed()
         eth_to_withdraw = self.accounting.accountStETHSharesWithdraw(holder)
+        self.stETH_drained = not self.accounting.hasStETHLockedShares()
 
         return eth_to_withdraw
 
+    def withdraw_ETH_bulk(self, holders: Sequence[str]) -> np.ndarray:
+        """
+        Withdraws the ETH of every holder at once, computed from the claimed ETH and locked shares totals like
+        `withdraw_ETH`, and returns the amounts as integers. Once no holder has locked stETH shares left the escrow
+        is marked as `stETH_drained`, since a rage quit escrow doesn't accept new locks. Holders before the first one
+        without locked shares are withdrawn even if the batch raises.
+        """
+        self._check_escrow_state(EscrowState.RageQuitEscrow)
+        self._check_withdrawals_timelock_passed()
+
+        try:
+            return self.accounting.accountStETHSharesWithdrawBatch(holders)
+        finally:
+            self.stETH_drained = not self.accounting.hasStETHLockedShares()
+
     def withdraw_eth_from_unstETH_ids(self, holder: str, unstETH_ids: List[int]) -> ETHValue:
         self._check_escrow_state(EscrowState.RageQuitEscrow)
         self._check_withdrawals_timelock_passed()
@@ -268,6 +284,23 @@ class Escrow:
     ## ---
 
     def get_rage_quit_support(self) -> int:
+        """
+        Rage quit support is cached until the escrow accounting or the stETH supply changes, both of which bump
+        their version counters on every mutation.
+        """
+        cache_key = self.get_rage_quit_support_version()
+        if self.rage_quit_support_cache is not None and self.rage_quit_support_cache[0] == cache_key:
+            return self.rage_quit_support_cache[1]
+
+        rage_quit_support = self._calc_rage_quit_support()
+        self.rage_quit_support_cache = (cache_key, rage_quit_support)
+
+        return rage_quit_support
+
+    def get_rage_quit_support_version(self) -> tuple[int, int]:
+        return (self.accounting.version, self.lido.supply_version)
+
+    def _calc_rage_quit_support(self) -> int:
         stETH_totals = self.accounting.state.stETHTotals
         unstETH_totals = self.accounting.state.unstETHTotals
 
@@ -359,8 +392,8 @@ class Escrow:
         if self.state != expected_state:
             raise Errors.InvalidState
 
-    def _claim_next_withdrawals_batch(self, unstETH_ids: List[int], hints: List[int]):
-        total_claimed = self.withdrawal_queue.claim_withdrawals(self.address, unstETH_ids, hints)
+    def _claim_next_withdrawals_batch(self, unstETH_id_ranges: List[range], hints: List[int] = None):
+        total_claimed = self.withdrawal_queue.claim_withdrawal_ranges(self.address, unstETH_id_ranges, hints)
 
         if total_claimed > 0:
             self.accounting.accountClaimedStETH(ETHValue.from_uint256(total_claimed))
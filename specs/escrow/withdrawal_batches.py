@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+import numpy as np
 
 from specs.types.sequential_batches import SequentialBatch, SequentialBatches
+from specs.withdrawals.queue_base import request_ids_from_ranges
 
 
 class Status(Enum):
@@ -70,17 +73,22 @@ class WithdrawalsBatchesQueue:
     def check_opened(self):
         self._check_status(Status.Opened)
 
-    def add(self, unstETH_ids: List[int]):
+    def add(self, unstETH_ids: Sequence[int]):
         unstETH_ids_count = len(unstETH_ids)
         if unstETH_ids_count == 0:
             return
 
-        for i in range(unstETH_ids_count - 1):
-            assert unstETH_ids[i + 1] == unstETH_ids[i] + 1
+        if isinstance(unstETH_ids, range):
+            assert unstETH_ids.step == 1
+        else:
+            assert np.all(np.diff(np.asarray(unstETH_ids)) == 1)
+
+        self.add_range(unstETH_ids[0], unstETH_ids_count)
 
+    def add_range(self, first_unstETH_id: int, unstETH_ids_count: int):
         last_batch_index = len(self.state.batches) - 1
         last_withdrawals_batch = self.state.batches[last_batch_index]
-        new_withdrawals_batch = SequentialBatches.create(unstETH_ids[0], unstETH_ids_count)
+        new_withdrawals_batch = SequentialBatches.create(first_unstETH_id, unstETH_ids_count)
 
         if SequentialBatches.can_merge(last_withdrawals_batch, new_withdrawals_batch):
             self.state.batches[last_batch_index] = SequentialBatches.merge(
@@ -92,39 +100,55 @@ class WithdrawalsBatchesQueue:
         self.state.total_unstETH_count = self.state.total_unstETH_count + new_withdrawals_batch.size()
 
     def claim_next_batch(self, max_unstETH_ids_count: int) -> List[int]:
-        unstETH_ids, self.state.last_claimed_unstETH_id_index = self._get_next_claimable_unstETH_ids(
+        return request_ids_from_ranges(self.claim_next_batch_ranges(max_unstETH_ids_count)).tolist()
+
+    def claim_next_batch_ranges(self, max_unstETH_ids_count: int) -> List[range]:
+        unstETH_id_ranges, self.state.last_claimed_unstETH_id_index = self._get_next_claimable_unstETH_ranges(
             max_unstETH_ids_count
         )
-        self.state.total_unstETH_claimed += len(unstETH_ids)
+        self.state.total_unstETH_claimed += sum(len(unstETH_id_range) for unstETH_id_range in unstETH_id_ranges)
 
-        return unstETH_ids
+        return unstETH_id_ranges
 
     def get_next_withdrawals_batches(self, limit: int) -> List[int]:
-        unstETH_ids, _ = self._get_next_claimable_unstETH_ids(limit)
-        return unstETH_ids
+        return request_ids_from_ranges(self.get_next_batch_ranges(limit)).tolist()
 
-    def _get_next_claimable_unstETH_ids(self, max_unstETH_ids_count: int) -> Tuple[List[int], QueueIndex]:
-        unstETH_ids_count = min(
-            self.state.total_unstETH_count - self.state.total_unstETH_claimed, max_unstETH_ids_count
-        )
+    def get_next_batch_ranges(self, limit: int) -> List[range]:
+        unstETH_id_ranges, _ = self._get_next_claimable_unstETH_ranges(limit)
+        return unstETH_id_ranges
+
+    def _get_next_claimable_unstETH_ranges(self, max_unstETH_ids_count: int) -> Tuple[List[range], QueueIndex]:
+        """
+        Returns the next claimable unstETH ids as ranges of consecutive ids and the queue index of the last of them.
+        Every batch is a run of consecutive ids, so this takes one step per batch instead of one per id.
+        """
+        remaining_count = min(self.state.total_unstETH_count - self.state.total_unstETH_claimed, max_unstETH_ids_count)
 
-        unstETH_ids = [0] * unstETH_ids_count
-        last_claimed_unstETH_id_index = self.state.last_claimed_unstETH_id_index
+        batch_index = self.state.last_claimed_unstETH_id_index.batch_index
+        value_index = self.state.last_claimed_unstETH_id_index.value_index
+        unstETH_id_ranges: List[range] = []
 
-        current_batch = self.state.batches[last_claimed_unstETH_id_index.batch_index]
+        while remaining_count > 0:
+            current_batch = self.state.batches[batch_index]
+            value_index += 1
 
-        for i in range(unstETH_ids_count):
-            last_claimed_unstETH_id_index.value_index += 1
+            if value_index == current_batch.size():
+                batch_index += 1
+                value_index = 0
+                current_batch = self.state.batches[batch_index]
 
-            if current_batch.size() == last_claimed_unstETH_id_index.value_index:
-                last_claimed_unstETH_id_index.batch_index += 1
-                last_claimed_unstETH_id_index.value_index = 0
+            count = min(remaining_count, current_batch.size() - value_index)
+            first_unstETH_id = current_batch.value_at(value_index)
 
-                current_batch = self.state.batches[last_claimed_unstETH_id_index.batch_index]
+            if unstETH_id_ranges and unstETH_id_ranges[-1].stop == first_unstETH_id:
+                unstETH_id_ranges[-1] = range(unstETH_id_ranges[-1].start, first_unstETH_id + count)
+            else:
+                unstETH_id_ranges.append(range(first_unstETH_id, first_unstETH_id + count))
 
-            unstETH_ids[i] = current_batch.value_at(last_claimed_unstETH_id_index.value_index)
+            value_index += count - 1
+            remaining_count -= count
 
-        return unstETH_ids, last_claimed_unstETH_id_index
+        return unstETH_id_ranges, QueueIndex(batch_index, value_index)
 
     def _check_status(self, expected_status: Status):
         if self.state.status != expected_status:
@@ -56,12 +56,14 @@ class Lido(stETH_Token):
         return self.buffered_ether
 
     def set_buffered_ether(self, buffered_eth: int):
+        self.supply_version += 1
         self.buffered_ether = buffered_eth
 
     def get_cl_ether(self) -> int:
         return self.consensus_layer_ether
 
     def set_cl_ether(self, cl_ether: int):
+        self.supply_version += 1
         self.consensus_layer_ether = cl_ether
 
     def _get_transient_balance(self) -> int:
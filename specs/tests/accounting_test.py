@@ -1,7 +1,8 @@
+from datetime import timedelta
 from typing import Dict, List
 
 import pytest
-from hypothesis import given
+from hypothesis import assume, given
 from hypothesis import strategies as st
 
 from specs.escrow.accounting import (
@@ -218,6 +219,25 @@ def test_accountUnstETHLock(holder, params):
             assert accounting.state.unstETHTotals.unfinalizedShares == total_unfinalized_shares
 
 
+@given(holder=ethereum_address_strategy(), other_holder=ethereum_address_strategy(), params=generate_unstETH_lists())
+def test_accountUnstETHLock_failing_on_first_id_adds_no_holder(holder, other_holder, params):
+    assume(holder != other_holder)
+    time_manager = TimeManager()
+    time_manager.initialize()
+    accounting = AssetsAccounting()
+    accounting.initialize(time_manager)
+    unstETHids: List[int] = params[0]
+    withdrawal_requests: List[WithdrawalRequestStatus] = params[1]
+    assume(len(unstETHids) > 0 and len(unstETHids) == len(withdrawal_requests))
+
+    accounting.accountUnstETHLock(holder, unstETHids, withdrawal_requests)
+
+    with pytest.raises(Errors.InvalidUnstETHStatus):
+        accounting.accountUnstETHLock(other_holder, unstETHids, withdrawal_requests)
+
+    assert other_holder not in accounting.state.assets
+
+
 @given(holder=ethereum_address_strategy(), params=generate_unstETH_lists())
 def test_accountUnstETHUnlock(holder, params):
     repeated_ids: bool = False
@@ -459,3 +479,59 @@ def test_accountUnstETHWithdraw(holder, params):
                 id = unstETHids[i]
                 assert accounting.state.unstETHRecords[id].status == UnstETHRecordStatus.Withdrawn
                 assert accounting.state.unstETHRecords[id].claimableAmount.value == claimable_amounts[i]
+
+
+def run_accounting_operation(accounting: AssetsAccounting, operation, batch: bool):
+    kind, holders, shares = operation
+
+    try:
+        match kind:
+            case "lock" if batch:
+                accounting.accountStETHSharesLockBatch(holders, shares)
+            case "lock":
+                for holder, holder_shares in zip(holders, shares):
+                    accounting.accountStETHSharesLock(holder, SharesValue(holder_shares))
+            case "unlock" if batch:
+                accounting.accountStETHSharesUnlockBatch(holders, shares)
+            case "unlock":
+                for holder, holder_shares in zip(holders, shares):
+                    accounting.accountStETHSharesUnlock(holder, SharesValue(holder_shares))
+            case "withdraw" if batch:
+                return list(accounting.accountStETHSharesWithdrawBatch(holders))
+            case "withdraw":
+                return [accounting.accountStETHSharesWithdraw(holder).value for holder in holders]
+    except (Errors.Error, KeyError) as error:
+        return repr(error)
+
+
+@given(
+    st.lists(
+        st.tuples(
+            st.sampled_from(["lock", "unlock", "withdraw"]),
+            st.lists(st.sampled_from(["0x01", "0x02", "0x03"]), max_size=5),
+            st.lists(st.integers(min_value=0, max_value=100), min_size=5, max_size=5),
+        ),
+        max_size=10,
+    ),
+    st.integers(min_value=0, max_value=1000),
+)
+def test_stETH_batch_operations_match_sequential(operations, claimed):
+    time_manager = TimeManager()
+    time_manager.initialize()
+    batch_accounting = AssetsAccounting()
+    batch_accounting.initialize(time_manager)
+    sequential_accounting = AssetsAccounting()
+    sequential_accounting.initialize(time_manager)
+
+    for kind, holders, shares in operations:
+        if kind == "withdraw" and claimed > 0:
+            batch_accounting.accountClaimedStETH(ETHValue(claimed))
+            sequential_accounting.accountClaimedStETH(ETHValue(claimed))
+
+        operation = (kind, holders, shares[: len(holders)])
+        assert run_accounting_operation(batch_accounting, operation, batch=True) == run_accounting_operation(
+            sequential_accounting, operation, batch=False
+        )
+        assert batch_accounting.state == sequential_accounting.state
+
+        time_manager.shift_current_time(timedelta(minutes=1))
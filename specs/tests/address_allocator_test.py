@@ -0,0 +1,34 @@
+from eth_utils import is_checksum_address
+from hypothesis import given
+from hypothesis import strategies as st
+
+from specs.utils import AddressAllocator, generate_address
+
+
+@given(seed=st.integers(min_value=0, max_value=2**64), count=st.integers(min_value=1, max_value=200))
+def test_allocate_is_checksummed_and_unique(seed, count):
+    allocator = AddressAllocator(seed)
+    addresses = allocator.allocate_many(count)
+
+    assert len(set(addresses)) == count
+    assert all(is_checksum_address(address) for address in addresses)
+
+
+@given(seed=st.integers(min_value=0, max_value=2**64), count=st.integers(min_value=1, max_value=50))
+def test_allocate_is_deterministic(seed, count):
+    assert AddressAllocator(seed).allocate_many(count) == AddressAllocator(seed).allocate_many(count)
+
+
+@given(seed=st.integers(min_value=0, max_value=2**64), count=st.integers(min_value=1, max_value=50))
+def test_namespaces_do_not_collide(seed, count):
+    actors = AddressAllocator(seed, namespace="actors").allocate_many(count)
+    escrows = AddressAllocator(seed, namespace="escrow").allocate_many(count)
+
+    assert set(actors).isdisjoint(escrows)
+
+
+def test_generate_address_with_allocator():
+    allocator = AddressAllocator(1)
+    expected = AddressAllocator(1).allocate_many(2)
+
+    assert [generate_address(allocator), generate_address(allocator)] == expected
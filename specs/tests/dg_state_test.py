@@ -1,3 +1,4 @@
+from copy import deepcopy
 from datetime import datetime, timedelta
 
 import pytest
@@ -171,3 +172,49 @@ def test_state_transitions(holder_addr, lock):
     else:
         dgState.activate_next_state()
         assert dgState.state == State.Normal
+
+
+@given(
+    ethereum_address_strategy(),
+    st.lists(
+        st.tuples(st.integers(min_value=0, max_value=20_000 * 10**18), st.integers(min_value=0, max_value=24 * 60)),
+        min_size=1,
+        max_size=30,
+    ),
+)
+@settings(deadline=None)
+def test_skipped_state_evaluation_matches_full_evaluation(holder_addr, steps):
+    assume(holder_addr != Address.ZERO)
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    lido = Lido()
+    lido.initialize(time_manager, Address.wstETH)
+    lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+    lido.set_buffered_ether(sample_stETH_total_supply)
+
+    config = DualGovernanceConfig()
+    dgState = DualGovernanceState(config)
+    dgState.initialize(test_escrow_address, time_manager, lido=lido)
+
+    for lock, shift_minutes in steps:
+        escrow: Escrow = dgState.signalling_escrow
+
+        if lock > 0:
+            buffered_ether = lido.get_buffered_ether()
+            lido._mint_shares(holder_addr, lock)
+            lido.set_buffered_ether(buffered_ether + lock)
+            lido.approve(holder_addr, escrow.address, lock)
+            escrow.lock_stETH(holder_addr, lock)
+
+        time_manager.shift_current_time(timedelta(minutes=shift_minutes, seconds=1))
+
+        uncached_dgState = deepcopy(dgState)
+        uncached_dgState.state_evaluation_cache = None
+        uncached_dgState.activate_next_state()
+
+        dgState.activate_next_state()
+        dgState.activate_next_state()
+
+        assert dgState.state == uncached_dgState.state
+        assert dgState.entered_at == uncached_dgState.entered_at
@@ -254,6 +254,51 @@ def test_get_rage_quit_support(holder_addr, lock):
         assert test_calc == rage_quit_support
 
 
+@given(
+    ethereum_address_strategy(),
+    st.integers(min_value=1, max_value=sample_stETH_total_supply),
+    st.integers(min_value=1, max_value=sample_stETH_total_supply),
+)
+def test_rage_quit_support_cache_invalidation(holder_addr, lock, deposit):
+    assume(holder_addr != Address.ZERO)
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    lido = Lido()
+    lido.initialize(time_manager, Address.wstETH)
+    lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+    lido.set_buffered_ether(sample_stETH_total_supply)
+
+    config = DualGovernanceConfig()
+    dgState = DualGovernanceState(config)
+    dgState.initialize(test_escrow_address, time_manager, lido)
+    escrow: Escrow = dgState.signalling_escrow
+
+    assert escrow.get_rage_quit_support() == calc_rage_quit_support(escrow) == 0
+
+    buffered_ether = lido.get_buffered_ether()
+    lido._mint_shares(holder_addr, lock)
+    lido.set_buffered_ether(buffered_ether + lock)
+    lido.approve(holder_addr, test_escrow_address, lock)
+
+    escrow.lock_stETH(holder_addr, lock)
+    rage_quit_support = escrow.get_rage_quit_support()
+    assert rage_quit_support == calc_rage_quit_support(escrow)
+    assert escrow.get_rage_quit_support() == rage_quit_support
+    assert dgState._calc_dynamic_timelock_duration(rage_quit_support) == dgState._compute_dynamic_timelock_duration(
+        rage_quit_support
+    )
+
+    buffered_ether = lido.get_buffered_ether()
+    lido._mint_shares(Address.DEAD, deposit)
+    lido.set_buffered_ether(buffered_ether + deposit)
+    assert escrow.get_rage_quit_support() == calc_rage_quit_support(escrow)
+
+    time_manager.shift_current_time(escrow.signaling_escrow_min_lock_time + timedelta(seconds=1))
+    escrow.unlock_stETH(holder_addr)
+    assert escrow.get_rage_quit_support() == calc_rage_quit_support(escrow) == 0
+
+
 @given(st.integers(min_value=1, max_value=Timestamp.MAX_VALUE), st.integers(min_value=1, max_value=Timestamp.MAX_VALUE))
 def test_start_rage_quit(delay, timelock):
     time_manager = TimeManager()
@@ -482,6 +527,51 @@ def test_full_stETH_to_unstETH_to_withdraw_ETH_flow(holder_addr, withdrawal_amou
     assert eth_to_withdraw.value == total_stETH_amount
 
 
+@given(ethereum_address_strategy(), withdrawal_amounts_strategy(100, 1000 * 10**18, 8))
+def test_claim_next_withdrawals_batch_with_hints(holder_addr, withdrawal_amounts):
+    assume(holder_addr != Address.ZERO)
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    lido = Lido()
+    lido.initialize(time_manager, Address.wstETH)
+    lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+    lido.set_buffered_ether(sample_stETH_total_supply)
+
+    config = DualGovernanceConfig()
+    dgState = DualGovernanceState(config)
+    dgState.initialize(test_escrow_address, time_manager, lido=lido)
+    escrow: Escrow = dgState.signalling_escrow
+
+    total_stETH_amount = sum(withdrawal_amounts)
+    lido._mint_shares(holder_addr, total_stETH_amount)
+    lido.set_buffered_ether(lido.get_buffered_ether() + total_stETH_amount)
+    lido.approve(holder_addr, test_escrow_address, total_stETH_amount)
+
+    escrow.lock_stETH(holder_addr, total_stETH_amount)
+    escrow.start_rage_quit(Timestamp(1), Timestamp(1))
+    escrow.request_next_withdrawals_batch(len(withdrawal_amounts))
+
+    unstETH_ids = escrow.withdrawal_queue.get_withdrawal_requests(test_escrow_address)
+    escrow.withdrawal_queue.finalize(unstETH_ids[-1], total_stETH_amount, 1 * 10**27)
+    hints = escrow.withdrawal_queue.find_checkpoint_hints(
+        unstETH_ids, 1, escrow.withdrawal_queue.get_last_checkpoint_index()
+    )
+
+    with pytest.raises(Errors.InvalidHintsLength):
+        escrow.claim_next_withdrawals_batch_with_hints(unstETH_ids[0], hints + [hints[-1]])
+
+    with pytest.raises(Errors.UnexpectedUnstETHId):
+        escrow.claim_next_withdrawals_batch_with_hints(unstETH_ids[0] + 1, hints)
+
+    assert escrow.batches_queue.get_next_withdrawals_batches(len(unstETH_ids)) == unstETH_ids
+
+    escrow.claim_next_withdrawals_batch_with_hints(unstETH_ids[0], hints)
+
+    assert escrow.batches_queue.is_all_unstETH_claimed()
+    assert escrow.withdrawal_queue.get_withdrawal_requests(test_escrow_address) == []
+
+
 @given(
     ethereum_address_strategy(),
     withdrawal_amounts_strategy(100, 1000 * 10**18, 8),
@@ -537,3 +627,61 @@ def test_lock_unstETH_to_withdraw_from_unstETH_flow(holder_addr, withdrawal_amou
 
     eth_to_withdraw = escrow.withdraw_eth_from_unstETH_ids(holder_addr, request_ids)
     assert eth_to_withdraw.value == total_stETH_amount
+
+
+@given(
+    st.lists(st.integers(min_value=10**17, max_value=1000 * 10**18), min_size=2, max_size=4),
+    limited_time_strategy(),
+    limited_time_strategy(),
+)
+def test_withdraw_ETH_bulk(lock_amounts, delay, timelock):
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    lido = Lido()
+    lido.initialize(time_manager, Address.wstETH)
+    lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+    lido.set_buffered_ether(sample_stETH_total_supply)
+
+    config = DualGovernanceConfig()
+    dgState = DualGovernanceState(config)
+    dgState.initialize(test_escrow_address, time_manager, lido=lido)
+    escrow: Escrow = dgState.signalling_escrow
+
+    holders = [f"0x{i:040x}" for i in range(1, len(lock_amounts) + 1)]
+    total_stETH_amount = sum(lock_amounts)
+
+    for holder, amount in zip(holders, lock_amounts):
+        buffered_ether = lido.get_buffered_ether()
+        lido._mint_shares(holder, amount)
+        lido.set_buffered_ether(buffered_ether + amount)
+        lido.approve(holder, test_escrow_address, amount)
+        escrow.lock_stETH(holder, amount)
+
+    escrow.start_rage_quit(Timestamp(delay), Timestamp(timelock))
+    escrow.min_withdrawal_batch_size = 1
+
+    while not escrow.batches_queue.is_closed():
+        escrow.request_next_withdrawals_batch(escrow.max_withdrawal_batch_size)
+
+    unstETH_ids = escrow.withdrawal_queue.get_withdrawal_requests(test_escrow_address)
+    escrow.withdrawal_queue.finalize(unstETH_ids[-1], total_stETH_amount, 1 * 10**27)
+    escrow.claim_next_withdrawals_batch(len(unstETH_ids))
+    escrow.start_rage_quit_extension_delay()
+
+    time_manager.shift_current_timestamp(Timestamp(delay) + Timestamp(timelock) + Timestamp(1))
+
+    claimed_ETH = escrow.accounting.state.stETHTotals.claimedETH.value
+    locked_shares = escrow.accounting.state.stETHTotals.lockedShares.value
+
+    assert not escrow.stETH_drained
+
+    eth_to_withdraw = escrow.withdraw_ETH_bulk(holders[1:])
+    assert list(eth_to_withdraw) == [claimed_ETH * amount // locked_shares for amount in lock_amounts[1:]]
+    assert not escrow.stETH_drained
+
+    with pytest.raises(Errors.InvalidSharesValue):
+        escrow.withdraw_ETH_bulk(holders[:2])
+
+    assert escrow.accounting.state.assets[holders[0]].stETHLockedShares == SharesValue(0)
+    assert escrow.stETH_drained
@@ -134,3 +134,56 @@ def test_cancel_all(params):
         proposals.cancel_all()
 
         assert proposals.state.last_canceled_proposal_id == last_proposal_id
+
+
+@given(
+    st.lists(
+        st.tuples(
+            st.sampled_from(["submit", "schedule", "execute", "cancel_all"]), st.integers(0, 20), st.integers(0, 30)
+        ),
+        max_size=60,
+    )
+)
+def test_indexed_proposal_ids_match_checks(operations):
+    time_manager = TimeManager()
+    time_manager.initialize()
+    proposals = Proposals()
+    proposals.initialize(time_manager)
+
+    after_submit_delay = int(timedelta(minutes=10).total_seconds())
+    after_schedule_delay = int(timedelta(minutes=20).total_seconds())
+
+    for operation, index, minutes in operations:
+        ids = range(proposals.proposal_id_offset, proposals.count() + proposals.proposal_id_offset)
+
+        match operation:
+            case "submit":
+                proposals.submit("", [ExecutorCall("", "", [])])
+            case "schedule" if ids:
+                proposal_id = ids[index % len(ids)]
+                if proposals.can_schedule(proposal_id, after_submit_delay):
+                    proposals.schedule(proposal_id, after_submit_delay)
+            case "execute" if ids:
+                proposal_id = ids[index % len(ids)]
+                if proposals.can_execute(proposal_id, after_schedule_delay):
+                    proposals.execute(proposal_id, after_schedule_delay)
+            case "cancel_all":
+                proposals.cancel_all()
+
+        time_manager.shift_current_time(timedelta(minutes=minutes))
+        ids = range(proposals.proposal_id_offset, proposals.count() + proposals.proposal_id_offset)
+
+        assert proposals.get_schedulable_proposal_ids(after_submit_delay) == [
+            proposal_id for proposal_id in ids if proposals.can_schedule(proposal_id, after_submit_delay)
+        ]
+        assert proposals.get_executable_proposal_ids(after_schedule_delay) == [
+            proposal_id for proposal_id in ids if proposals.can_execute(proposal_id, after_schedule_delay)
+        ]
+        for status in (ProposalStatus.Submitted, ProposalStatus.Scheduled):
+            heap = proposals.index.get_heap(status)
+            assert 2 * proposals.index.stale_entries[status] <= len(heap)
+            assert len(heap) - proposals.index.stale_entries[status] == len(proposals.index.ids_by_status[status])
+        for status in ProposalStatus:
+            assert proposals.get_proposal_ids_by_status(status) == [
+                proposal_id for proposal_id in ids if proposals.get(proposal_id).status == status
+            ]
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from specs.time_manager import TimeManager
+from specs.types.timestamp import Timestamp
+
+
+@given(
+    st.lists(
+        st.tuples(st.booleans(), st.integers(min_value=0, max_value=30 * 24 * 3600)),
+        max_size=20,
+    )
+)
+def test_cached_clock_follows_current_time(shifts):
+    time_manager = TimeManager(current_time=datetime(2024, 9, 1), simulation_start_time=datetime(2024, 9, 1))
+
+    for is_timestamp_shift, seconds in shifts:
+        if is_timestamp_shift:
+            time_manager.shift_current_timestamp(Timestamp(seconds))
+        else:
+            time_manager.shift_current_time(timedelta(seconds=seconds))
+
+        expected_timestamp = int(time_manager.get_current_time().timestamp())
+        assert time_manager.get_current_timestamp() == expected_timestamp
+        assert time_manager.get_current_timestamp_value() == Timestamp(expected_timestamp)
+        assert time_manager.get_current_timestamp_value() is time_manager.get_current_timestamp_value()
+
+
+def test_initialize_sets_cached_clock():
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    assert time_manager.get_current_timestamp() == int(time_manager.get_current_time().timestamp())
+    assert time_manager.get_starting_timestamp_value() == time_manager.get_current_timestamp_value()
@@ -0,0 +1,61 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from specs.types.eth_value import ETHValue, ETHValueOverflow, ETHValueUnderflow
+from specs.types.fast_mode import disable_fast_mode, enable_fast_mode, is_fast_mode_enabled
+from specs.types.shares_value import SharesValue, SharesValueOverflow, SharesValueUnderflow
+from specs.types.timestamp import Timestamp
+
+value_strategy = st.integers(min_value=0, max_value=2**38)
+
+
+@given(v1=value_strategy, v2=value_strategy)
+def test_fast_mode_arithmetic(v1, v2):
+    checked_results = [
+        (cls(v1) + cls(v2), cls(v1) - cls(v2) if v1 >= v2 else None) for cls in (Timestamp, SharesValue, ETHValue)
+    ]
+
+    enable_fast_mode()
+    try:
+        assert is_fast_mode_enabled()
+        fast_results = [
+            (cls(v1) + cls(v2), cls(v1) - cls(v2) if v1 >= v2 else None) for cls in (Timestamp, SharesValue, ETHValue)
+        ]
+    finally:
+        disable_fast_mode()
+
+    for (checked_sum, checked_difference), (fast_sum, fast_difference) in zip(checked_results, fast_results):
+        assert type(fast_sum) is type(checked_sum)
+        assert fast_sum == checked_sum
+        assert fast_sum.value == checked_sum.value
+        assert hash(fast_sum) == hash(checked_sum)
+        assert (fast_difference is None) == (checked_difference is None)
+        if fast_difference is not None:
+            assert fast_difference == checked_difference
+
+
+def test_fast_mode_keeps_boundary_checks():
+    enable_fast_mode()
+    try:
+        with pytest.raises(ValueError):
+            Timestamp(-1)
+        with pytest.raises(ValueError) as first_underflow:
+            Timestamp(1) - Timestamp(2)
+        with pytest.raises(ValueError) as second_underflow:
+            Timestamp(1) - Timestamp(2)
+        assert first_underflow.value is not second_underflow.value
+        with pytest.raises(SharesValueOverflow):
+            SharesValue.from_uint256(2**128)
+        with pytest.raises(SharesValueUnderflow):
+            SharesValue(1) - SharesValue(2)
+        with pytest.raises(ETHValueOverflow):
+            ETHValue.from_uint256(2**128)
+        with pytest.raises(ETHValueUnderflow):
+            ETHValue(1) - ETHValue(2)
+    finally:
+        disable_fast_mode()
+
+    assert not is_fast_mode_enabled()
+    with pytest.raises(ValueError):
+        Timestamp(Timestamp.MAX_VALUE) + Timestamp(1)
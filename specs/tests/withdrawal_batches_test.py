@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -73,3 +75,53 @@ def test_claim_next_batch(max_unstETH_ids_count):
 
     assert queue.state.total_unstETH_claimed == last_claimed + len(claimed_ids)
     assert len(claimed_ids) <= max_unstETH_ids_count
+
+
+def claim_next_ids_one_by_one(queue: WithdrawalsBatchesQueue, max_unstETH_ids_count: int) -> list[int]:
+    count = min(queue.state.total_unstETH_count - queue.state.total_unstETH_claimed, max_unstETH_ids_count)
+    index = queue.state.last_claimed_unstETH_id_index
+    unstETH_ids = []
+
+    for _ in range(count):
+        index.value_index += 1
+
+        if queue.state.batches[index.batch_index].size() == index.value_index:
+            index.batch_index += 1
+            index.value_index = 0
+
+        unstETH_ids.append(queue.state.batches[index.batch_index].value_at(index.value_index))
+
+    queue.state.total_unstETH_claimed += count
+
+    return unstETH_ids
+
+
+@given(
+    batch_sizes=st.lists(st.integers(min_value=1, max_value=300), min_size=1, max_size=10),
+    claim_sizes=st.lists(st.integers(min_value=1, max_value=500), min_size=1, max_size=10),
+)
+def test_claim_next_batch_ranges_match_one_by_one(batch_sizes, claim_sizes):
+    queues = [WithdrawalsBatchesQueue(), WithdrawalsBatchesQueue()]
+    first_unstETH_id = 1
+
+    for queue in queues:
+        queue.open()
+
+    for batch_size in batch_sizes:
+        for queue in queues:
+            queue.add(range(first_unstETH_id, first_unstETH_id + batch_size))
+        first_unstETH_id += batch_size
+
+    ranges_queue, reference_queue = queues
+
+    for claim_size in claim_sizes:
+        assert ranges_queue.get_next_withdrawals_batches(claim_size) == claim_next_ids_one_by_one(
+            WithdrawalsBatchesQueue(deepcopy(reference_queue.state)), claim_size
+        )
+
+        unstETH_id_ranges = ranges_queue.claim_next_batch_ranges(claim_size)
+        unstETH_ids = claim_next_ids_one_by_one(reference_queue, claim_size)
+
+        assert [unstETH_id for unstETH_id_range in unstETH_id_ranges for unstETH_id in unstETH_id_range] == unstETH_ids
+        assert len(unstETH_id_ranges) <= len(batch_sizes)
+        assert ranges_queue.state == reference_queue.state
@@ -211,3 +211,60 @@ def test_claimed_nft_transfer_fails(queue_address, owner_address, withdrawal_amo
                     queue.safeTransferFrom(owner_address, owner_address, address_to, request_id)
 
         assert queue.balanceOf(owner_address) == 0
+
+
+@given(
+    ethereum_address_strategy(),
+    ethereum_address_strategy(),
+    withdrawal_amounts_strategy(100, 1000 * 10**18),
+    ethereum_address_strategy(),
+)
+def test_batch_request_and_transfer_match_sequential(queue_address, owner_address, withdrawal_amounts, address_to):
+    assume(owner_address != Address.ZERO and queue_address != Address.ZERO and owner_address != queue_address)
+    assume(address_to != Address.ZERO and address_to != owner_address)
+    total_stETH_amount = sum(withdrawal_amounts)
+
+    queues = []
+    for _ in range(2):
+        time_manager = TimeManager()
+        time_manager.initialize()
+        lido = Lido()
+        lido.initialize(time_manager, Address.wstETH)
+        lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+        lido.set_buffered_ether(sample_stETH_total_supply)
+        lido._mint_shares(owner_address, total_stETH_amount)
+        lido.set_buffered_ether(lido.get_buffered_ether() + total_stETH_amount)
+        lido.approve(owner_address, queue_address, total_stETH_amount)
+
+        queue = WithdrawalQueueERC721()
+        queue.initialize(time_manager, lido, queue_address)
+        queue.resume()
+        queues.append(queue)
+
+    batch_queue, sequential_queue = queues
+
+    request_ids = batch_queue.request_withdrawals(owner_address, withdrawal_amounts)
+    sequential_ids = [
+        sequential_queue._request_withdrawal(owner_address, amount, owner_address) for amount in withdrawal_amounts
+    ]
+
+    assert request_ids == sequential_ids
+    assert batch_queue.queue == sequential_queue.queue
+    assert batch_queue.lido.shares == sequential_queue.lido.shares
+    assert batch_queue.get_withdrawal_status(request_ids) == [
+        sequential_queue._get_status(request_id) for request_id in request_ids
+    ]
+
+    transferred_ids = request_ids[::2]
+    batch_queue.batchTransferFrom(owner_address, owner_address, address_to, transferred_ids)
+    for request_id in transferred_ids:
+        sequential_queue.transferFrom(owner_address, owner_address, address_to, request_id)
+
+    assert batch_queue.queue == sequential_queue.queue
+    assert batch_queue.requests_by_owner == sequential_queue.requests_by_owner
+
+    with pytest.raises(ValueError, match="TransferFromIncorrectOwner"):
+        batch_queue.batchTransferFrom(owner_address, owner_address, address_to, request_ids[1::2] + request_ids[:1])
+
+    assert batch_queue.balanceOf(address_to) == len(request_ids)
+    assert batch_queue.balanceOf(owner_address) == 0
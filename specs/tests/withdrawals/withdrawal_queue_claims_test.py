@@ -1,5 +1,8 @@
+import copy
+
 import pytest
 from hypothesis import assume, given
+from hypothesis import strategies as st
 
 from specs.lido import Lido
 from specs.tests.accounting_test import ethereum_address_strategy
@@ -177,3 +180,82 @@ def test_claim_withdrawals_to(queue_address, owner_address, withdrawal_amounts):
             for withdrawal_request in withdrawal_request_statuses:
                 assert withdrawal_request.is_claimed
                 assert withdrawal_request.is_finalized
+
+
+@given(
+    ethereum_address_strategy(),
+    ethereum_address_strategy(),
+    withdrawal_amounts_strategy(100, 1000 * 10**18),
+    st.lists(st.integers(min_value=base_share_rate // 2, max_value=base_share_rate * 2), min_size=1, max_size=5),
+)
+def test_batch_hints_and_claims_match_sequential(queue_address, owner_address, withdrawal_amounts, share_rates):
+    assume(owner_address != Address.ZERO and queue_address != Address.ZERO and owner_address != queue_address)
+    time_manager = TimeManager()
+    time_manager.initialize()
+
+    lido = Lido()
+    lido.initialize(time_manager, Address.wstETH)
+    lido._mint_shares(Address.DEAD, sample_stETH_total_supply)
+    lido.set_buffered_ether(sample_stETH_total_supply)
+
+    total_shares_amount = sum(lido.get_shares_by_pooled_eth(amount) for amount in withdrawal_amounts)
+
+    queue = WithdrawalQueueERC721()
+    queue.initialize(time_manager, lido, queue_address)
+    queue.resume()
+
+    lido._mint_shares(owner_address, total_shares_amount)
+    lido.set_buffered_ether(lido.get_buffered_ether() + total_shares_amount)
+    lido.approve(owner_address, queue_address, total_shares_amount)
+
+    request_ids = queue.request_withdrawals(owner_address, withdrawal_amounts)
+    batch_size = max(1, len(request_ids) // len(share_rates))
+
+    for index, share_rate in enumerate(share_rates):
+        last_request_id = request_ids[min((index + 1) * batch_size, len(request_ids)) - 1]
+        if last_request_id <= queue.get_last_finalized_request_id():
+            break
+
+        _, eth_to_lock = queue.prefinalize([last_request_id], share_rate)
+        queue.finalize(last_request_id, eth_to_lock, share_rate)
+
+    last_checkpoint_index = queue.get_last_checkpoint_index()
+    finalized_ids = [request_id for request_id in request_ids if request_id <= queue.get_last_finalized_request_id()]
+    hints = queue.find_checkpoint_hints(finalized_ids, 1, last_checkpoint_index)
+
+    sequential_hints = [
+        queue._find_checkpoint_hint(request_id, 1, last_checkpoint_index) for request_id in finalized_ids
+    ]
+    assert hints == sequential_hints
+
+    if len(request_ids) - len(finalized_ids) > 1:
+        with pytest.raises(Errors.InvalidRequestIdRange):
+            queue.find_checkpoint_hints(request_ids, 1, last_checkpoint_index)
+
+    sequential_claimable = [
+        queue._calculate_claimable_ether(queue.queue[request_id], request_id, hint)
+        for request_id, hint in zip(finalized_ids, hints)
+    ]
+    assert queue.get_claimable_ether(finalized_ids, hints) == sequential_claimable
+
+    ranges_queue = copy.deepcopy(queue)
+    locked_ether_amount = queue.get_locked_ether_amount()
+    claimed = queue.claim_withdrawals(owner_address, finalized_ids, hints)
+
+    if finalized_ids:
+        middle_id = finalized_ids[len(finalized_ids) // 2]
+        finalized_id_ranges = [range(finalized_ids[0], middle_id), range(middle_id, finalized_ids[-1] + 1)]
+    else:
+        finalized_id_ranges = []
+
+    assert ranges_queue.claim_withdrawal_ranges(owner_address, finalized_id_ranges) == claimed
+    assert ranges_queue.queue == queue.queue
+    assert ranges_queue.requests_by_owner == queue.requests_by_owner
+    assert ranges_queue.get_locked_ether_amount() == queue.get_locked_ether_amount()
+
+    assert claimed == sum(sequential_claimable)
+    assert queue.get_locked_ether_amount() == locked_ether_amount - claimed
+    assert queue.balanceOf(owner_address) == len(request_ids) - len(finalized_ids)
+
+    with pytest.raises(Errors.RequestAlreadyClaimed):
+        queue.claim_withdrawals_to(finalized_ids[:1], hints[:1], owner_address)
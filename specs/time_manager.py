@@ -6,31 +6,53 @@ from specs.types.timestamp import Timestamp
 
 @dataclass
 class TimeManager:
+    """
+    Simulation clock. Besides the datetime it keeps the current epoch seconds and their Timestamp, which are only
+    recomputed when the time is shifted, so `current_time` must be changed through `initialize` or the shift methods.
+    """
+
     current_time: datetime = field(default_factory=lambda: datetime.min)
     simulation_start_time: datetime = field(default_factory=lambda: datetime.min)
+    current_timestamp: int = field(default=None, init=False, repr=False, compare=False)
+    current_timestamp_value: Timestamp = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.current_time != datetime.min:
+            self._set_current_time(self.current_time)
 
     def initialize(self):
-        self.current_time = datetime.now()
+        self._set_current_time(datetime.now())
         self.simulation_start_time = self.current_time
 
     def shift_current_time(self, delta: timedelta):
-        self.current_time = self.current_time + delta
+        self._set_current_time(self.current_time + delta)
 
     def shift_current_timestamp(self, delta: Timestamp):
         current_timestamp = self.get_current_timestamp_value()
-        self.current_time = datetime.fromtimestamp((current_timestamp + delta).value)
+        self._set_current_time(datetime.fromtimestamp((current_timestamp + delta).value))
 
     def get_current_time(self):
         return self.current_time
 
     def get_current_timestamp_value(self) -> Timestamp:
-        return Timestamp.from_uint256(int(self.current_time.timestamp()))
+        if self.current_timestamp_value is None:
+            self._set_current_time(self.current_time)
+        return self.current_timestamp_value
 
     def get_current_timestamp(self) -> int:
-        return int(self.current_time.timestamp())
+        if self.current_timestamp is None:
+            self._set_current_time(self.current_time)
+        return self.current_timestamp
 
     def get_starting_time(self):
         return self.simulation_start_time
 
     def get_starting_timestamp_value(self) -> Timestamp:
         return Timestamp.from_uint256(int(self.simulation_start_time.timestamp()))
+
+    def _set_current_time(self, current_time: datetime):
+        current_timestamp = int(current_time.timestamp())
+
+        self.current_time = current_time
+        self.current_timestamp = current_timestamp
+        self.current_timestamp_value = Timestamp.from_uint256(current_timestamp)
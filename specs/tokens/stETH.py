@@ -8,6 +8,7 @@ from specs.tokens.token_base import TokenBase
 class stETH_Token(TokenBase):
     total_shares: int = 0
     shares: Dict[str, int] = field(default_factory=dict)
+    supply_version: int = field(default=0, compare=False)
 
     def __post_init__(self):
         super().setup("Liquid Staked Ether 2.0", "stETH", 18)
@@ -69,11 +70,13 @@ class stETH_Token(TokenBase):
     ## ---
 
     def _mint_shares(self, recipient: str, shares: int) -> int:
+        self.supply_version += 1
         self.total_shares = self._mint(recipient, shares, self.shares, self.total_shares)
 
         return self.total_shares
 
     def _burn_shares(self, account: str, shares: int) -> int:
+        self.supply_version += 1
         self.total_shares = self._burn(account, shares, self.shares, self.total_shares)
 
         return self.total_shares
@@ -0,0 +1,3 @@
+from .fast_mode import set_fast_mode_from_env
+
+set_fast_mode_from_env()
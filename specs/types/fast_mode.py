@@ -0,0 +1,79 @@
+import os
+
+from .eth_value import ETHValue, ETHValueUnderflow
+from .shares_value import SharesValue, SharesValueUnderflow
+from .timestamp import Timestamp
+
+FAST_MODE_ENV_VARIABLE = "DG_SPECS_FAST_MODE"
+
+_new = object.__new__
+_set = object.__setattr__
+
+_checked_methods: dict[type, dict[str, object]] = {}
+
+
+def _unchecked(cls, value: int):
+    instance = _new(cls)
+    _set(instance, "value", value)
+    return instance
+
+
+def _timestamp_underflow() -> ValueError:
+    return ValueError("Timestamp value underflow")
+
+
+def _fast_arithmetic(cls, underflow_error):
+    """`underflow_error` creates the error raised on underflow, so every raise gets a new exception"""
+
+    def __add__(self, other):
+        return _unchecked(cls, self.value + other.value)
+
+    def __sub__(self, other):
+        if self.value < other.value:
+            raise underflow_error()
+        return _unchecked(cls, self.value - other.value)
+
+    return {"__add__": __add__, "__sub__": __sub__}
+
+
+def _get_fast_methods() -> dict[type, dict[str, object]]:
+    return {
+        Timestamp: _fast_arithmetic(Timestamp, _timestamp_underflow),
+        SharesValue: _fast_arithmetic(SharesValue, SharesValueUnderflow),
+        ETHValue: _fast_arithmetic(ETHValue, ETHValueUnderflow),
+    }
+
+
+def enable_fast_mode():
+    """
+    Switches Timestamp, SharesValue and ETHValue arithmetic to unchecked results for the whole process.
+
+    Values still get their bounds checked when they are created from plain integers through the constructor or
+    `from_uint256`, which is where model inputs enter the specs. Sums and differences of already valid values skip
+    the overflow and `__post_init__` checks and are built without going through the dataclass constructor.
+    Subtraction keeps its underflow check. Spawned worker processes enable it through `FAST_MODE_ENV_VARIABLE`.
+    """
+    if is_fast_mode_enabled():
+        return
+
+    for cls, methods in _get_fast_methods().items():
+        _checked_methods[cls] = {name: cls.__dict__[name] for name in methods}
+        for name, method in methods.items():
+            setattr(cls, name, method)
+
+
+def disable_fast_mode():
+    for cls, methods in _checked_methods.items():
+        for name, method in methods.items():
+            setattr(cls, name, method)
+
+    _checked_methods.clear()
+
+
+def is_fast_mode_enabled() -> bool:
+    return bool(_checked_methods)
+
+
+def set_fast_mode_from_env():
+    if os.environ.get(FAST_MODE_ENV_VARIABLE, "") not in ("", "0"):
+        enable_fast_mode()
@@ -1,7 +1,7 @@
 import copy
 from dataclasses import field
 
-from eth_account import Account
+from eth_utils import keccak, to_checksum_address
 
 
 def default(obj):
@@ -11,8 +11,36 @@ def default(obj):
 ether_base = 10**18
 percent_base = ether_base // 100
 
+ADDRESS_PREFIX_LENGTH = 12
+ADDRESS_COUNTER_LENGTH = 8
 
-def generate_address():
-    acc = Account.create()
-    addr = acc.address
-    return addr
+
+class AddressAllocator:
+    """
+    Deterministic, collision-free address allocator.
+
+    Every address is a 12-byte prefix derived from keccak(namespace:seed) followed by an 8-byte
+    big-endian counter, returned in EIP-55 checksum format. Addresses from the same allocator never
+    collide, and allocators with different namespaces or seeds draw from disjoint prefixes.
+    """
+
+    def __init__(self, seed: int = 0, namespace: str = ""):
+        self.prefix = keccak(text=f"{namespace}:{seed}")[:ADDRESS_PREFIX_LENGTH]
+        self.counter = 0
+
+    def allocate(self) -> str:
+        self.counter += 1
+        return to_checksum_address(self.prefix + self.counter.to_bytes(ADDRESS_COUNTER_LENGTH, "big"))
+
+    def allocate_many(self, count: int) -> list[str]:
+        return [self.allocate() for _ in range(count)]
+
+
+default_address_allocator = AddressAllocator()
+
+
+def generate_address(allocator: AddressAllocator = None) -> str:
+    if allocator is None:
+        allocator = default_address_allocator
+
+    return allocator.allocate()
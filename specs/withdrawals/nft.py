@@ -1,6 +1,8 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+import numpy as np
 
 from specs.lido import Lido
 from specs.time_manager import TimeManager
@@ -121,6 +123,66 @@ class WithdrawalQueueERC721(WithdrawalQueue):
         self.requests_by_owner[_from].remove(request_id)
         self.requests_by_owner.setdefault(to, []).append(request_id)
 
+    def batchTransferFrom(self, sender: str, _from: str, to: str, request_ids: List[int]):
+        self._transfer_batch(sender, _from, to, request_ids)
+
+    def _transfer_batch(self, sender: str, _from: str, to: str, request_ids: List[int]):
+        """
+        Transfers several requests with one ownership update. Requests before the first one that fails the checks
+        of `_transfer` are transferred and its error is raised, as when transferring them one by one.
+        """
+        if len(request_ids) == 0:
+            return
+
+        if to == Address.ZERO:
+            raise ValueError("TransferToZeroAddress")
+
+        if to == _from:
+            raise ValueError("TransferToThemselves")
+
+        request_ids = np.asarray(request_ids, dtype=np.int64)
+        invalid_ids = (request_ids == 0) | (request_ids > self.get_last_request_id())
+        existing_ids = np.where(invalid_ids, 0, request_ids)
+
+        repeated = np.ones(len(request_ids), dtype=np.bool_)
+        repeated[np.unique(request_ids, return_index=True)[1]] = False
+
+        claimed = ~invalid_ids & self.queue.claimed[existing_ids]
+        incorrect_owner = ~invalid_ids & ~claimed & ((self.queue.owner[existing_ids] != _from) | repeated)
+
+        if _from == sender or self.isApprovedForAll(_from, sender):
+            not_approved = np.zeros(len(request_ids), dtype=np.bool_)
+        else:
+            not_approved = np.array(
+                [self.token_approvals.get(request_id) != sender for request_id in request_ids.tolist()]
+            )
+
+        errors = np.flatnonzero(invalid_ids | claimed | incorrect_owner | not_approved)
+        transferred_count = errors[0] if len(errors) else len(request_ids)
+        transferred_ids = request_ids[:transferred_count]
+
+        if len(transferred_ids):
+            if self.token_approvals:
+                for request_id in transferred_ids.tolist():
+                    self.token_approvals.pop(request_id, None)
+
+            self.queue.owner[transferred_ids] = to
+
+            transferred = set(transferred_ids.tolist())
+            from_requests = self.requests_by_owner[_from]
+            from_requests[:] = [request_id for request_id in from_requests if request_id not in transferred]
+            self.requests_by_owner.setdefault(to, []).extend(transferred_ids.tolist())
+
+        if transferred_count < len(request_ids):
+            index = transferred_count
+            if invalid_ids[index]:
+                raise ValueError("InvalidRequestId")
+            if claimed[index]:
+                raise ValueError("RequestAlreadyClaimed")
+            if incorrect_owner[index]:
+                raise ValueError("TransferFromIncorrectOwner")
+            raise ValueError("NotOwnerOrApproved")
+
     def _existsAndNotClaimed(self, request_id: int) -> bool:
         return (
             request_id > 0
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Dict, List
 
+import numpy as np
+
 from specs.time_manager import TimeManager
 from specs.types.timestamp import Timestamp
 from specs.withdrawals.errors import Errors
@@ -32,6 +34,217 @@ class WithdrawalRequestStatus:
     is_claimed: bool = field(default_factory=lambda: False)
 
 
+class WithdrawalRequestView:
+    """Attribute access to a single request kept in `WithdrawalRequests`, writes go to the underlying arrays."""
+
+    __slots__ = ("requests", "request_id")
+
+    def __init__(self, requests: "WithdrawalRequests", request_id: int):
+        self.requests = requests
+        self.request_id = request_id
+
+    @property
+    def cumulative_stETH(self) -> int:
+        return self.requests.cumulative_stETH[self.request_id]
+
+    @property
+    def cumulative_shares(self) -> int:
+        return self.requests.cumulative_shares[self.request_id]
+
+    @property
+    def owner(self) -> str:
+        return self.requests.owner[self.request_id]
+
+    @owner.setter
+    def owner(self, owner: str):
+        self.requests.owner[self.request_id] = owner
+
+    @property
+    def timestamp(self) -> Timestamp:
+        return Timestamp(int(self.requests.timestamp[self.request_id]))
+
+    @property
+    def claimed(self) -> bool:
+        return bool(self.requests.claimed[self.request_id])
+
+    @claimed.setter
+    def claimed(self, claimed: bool):
+        self.requests.claimed[self.request_id] = claimed
+
+    @property
+    def report_timestamp(self) -> Timestamp:
+        return Timestamp(int(self.requests.report_timestamp[self.request_id]))
+
+
+def request_ids_from_ranges(request_id_ranges: List[range]) -> np.ndarray:
+    if not request_id_ranges:
+        return np.zeros(0, dtype=np.int64)
+
+    return np.concatenate(
+        [
+            np.arange(request_id_range.start, request_id_range.stop, dtype=np.int64)
+            for request_id_range in request_id_ranges
+        ]
+    )
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros(capacity, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+@dataclass(eq=False)
+class WithdrawalRequests:
+    """
+    Withdrawal requests stored as growable column arrays indexed by request id. Cumulative amounts are in wei and do
+    not fit into int64, so they are kept as Python integers in object arrays. Item access returns a
+    `WithdrawalRequestView`, which keeps the storage usable as the mapping of `WithdrawalRequest`s it replaces.
+    """
+
+    INITIAL_CAPACITY: int = 64
+
+    length: int = 0
+    cumulative_stETH: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    cumulative_shares: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    owner: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+    timestamp: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    claimed: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.bool_))
+    report_timestamp: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+
+    def append(self, request: WithdrawalRequest) -> int:
+        request_id = self.length
+        self._reserve(1)
+        self._write(request_id, request)
+        self.length += 1
+
+        return request_id
+
+    def extend(
+        self,
+        cumulative_stETH: np.ndarray,
+        cumulative_shares: np.ndarray,
+        owner: str,
+        timestamp: Timestamp,
+        report_timestamp: Timestamp,
+    ) -> int:
+        """Appends requests of a single owner created at the same time and returns the id of the first one."""
+        first_request_id = self.length
+        count = len(cumulative_stETH)
+        self._reserve(count)
+
+        requests = slice(first_request_id, first_request_id + count)
+        self.cumulative_stETH[requests] = cumulative_stETH
+        self.cumulative_shares[requests] = cumulative_shares
+        self.owner[requests] = owner
+        self.timestamp[requests] = timestamp.value
+        self.claimed[requests] = False
+        self.report_timestamp[requests] = report_timestamp.value
+        self.length += count
+
+        return first_request_id
+
+    def get(self, request_id: int, default: WithdrawalRequest = None) -> WithdrawalRequestView:
+        if request_id in self:
+            return WithdrawalRequestView(self, request_id)
+        return default
+
+    def __getitem__(self, request_id: int) -> WithdrawalRequestView:
+        if request_id not in self:
+            raise KeyError(request_id)
+        return WithdrawalRequestView(self, request_id)
+
+    def __setitem__(self, request_id: int, request: WithdrawalRequest):
+        if request_id == self.length:
+            self.append(request)
+        elif request_id in self:
+            self._write(request_id, request)
+        else:
+            raise KeyError(request_id)
+
+    def __contains__(self, request_id: int) -> bool:
+        return 0 <= request_id < self.length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, WithdrawalRequests) or self.length != other.length:
+            return False
+
+        return all(
+            np.array_equal(getattr(self, name)[: self.length], getattr(other, name)[: other.length])
+            for name in ("cumulative_stETH", "cumulative_shares", "owner", "timestamp", "claimed", "report_timestamp")
+        )
+
+    def _write(self, request_id: int, request: WithdrawalRequest):
+        self.cumulative_stETH[request_id] = request.cumulative_stETH
+        self.cumulative_shares[request_id] = request.cumulative_shares
+        self.owner[request_id] = request.owner
+        self.timestamp[request_id] = request.timestamp.value
+        self.claimed[request_id] = request.claimed
+        self.report_timestamp[request_id] = request.report_timestamp.value
+
+    def _reserve(self, count: int):
+        required = self.length + count
+        if required <= len(self.timestamp):
+            return
+
+        capacity = max(required, 2 * len(self.timestamp), self.INITIAL_CAPACITY)
+        self.cumulative_stETH = _grow(self.cumulative_stETH, capacity)
+        self.cumulative_shares = _grow(self.cumulative_shares, capacity)
+        self.owner = _grow(self.owner, capacity)
+        self.timestamp = _grow(self.timestamp, capacity)
+        self.claimed = _grow(self.claimed, capacity)
+        self.report_timestamp = _grow(self.report_timestamp, capacity)
+
+
+@dataclass(eq=False)
+class Checkpoints:
+    """Finalization checkpoints stored as growable arrays, indexed by checkpoint index."""
+
+    INITIAL_CAPACITY: int = 16
+
+    length: int = 0
+    from_request_id: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    max_share_rate: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=object))
+
+    def append(self, checkpoint: Checkpoint) -> int:
+        index = self.length
+
+        if index == len(self.from_request_id):
+            capacity = max(2 * index, self.INITIAL_CAPACITY)
+            self.from_request_id = _grow(self.from_request_id, capacity)
+            self.max_share_rate = _grow(self.max_share_rate, capacity)
+
+        self.from_request_id[index] = checkpoint.from_request_id
+        self.max_share_rate[index] = checkpoint.max_share_rate
+        self.length += 1
+
+        return index
+
+    def __getitem__(self, index: int) -> Checkpoint:
+        if not 0 <= index < self.length:
+            raise KeyError(index)
+        return Checkpoint(int(self.from_request_id[index]), self.max_share_rate[index])
+
+    def __setitem__(self, index: int, checkpoint: Checkpoint):
+        if index != self.length:
+            raise KeyError(index)
+        self.append(checkpoint)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Checkpoints)
+            and self.length == other.length
+            and np.array_equal(self.from_request_id[: self.length], other.from_request_id[: other.length])
+            and np.array_equal(self.max_share_rate[: self.length], other.max_share_rate[: other.length])
+        )
+
+
 class BatchesCalculationState:
     remaining_eth_budget: int
     finished: bool
@@ -47,18 +260,20 @@ class WithdrawalQueueBase:
 
     time_manager: TimeManager = None
 
-    queue: Dict[int, WithdrawalRequest] = field(default_factory=dict)
+    queue: WithdrawalRequests = field(default_factory=WithdrawalRequests)
     last_request_id: int = field(default_factory=lambda: 0)
     last_finalized_request_id: int = field(default_factory=lambda: 0)
-    checkpoints: Dict[int, Checkpoint] = field(default_factory=dict)
+    checkpoints: Checkpoints = field(default_factory=Checkpoints)
     last_checkpoint_index: int = field(default_factory=lambda: 0)
     locked_ether_amount: int = field(default_factory=lambda: 0)
     requests_by_owner: Dict[str, List[int]] = field(default_factory=dict)
     last_report_timestamp: Timestamp = field(default_factory=lambda: Timestamp(0))
 
     def _initialize_queue(self, time_manager: TimeManager):
-        self.queue[0] = WithdrawalRequest(0, 0, "0x0000000000000000000000000000000000000000", 0, True, 0)
-        self.checkpoints[self.last_checkpoint_index] = Checkpoint(0, 0)
+        self.queue.append(
+            WithdrawalRequest(0, 0, "0x0000000000000000000000000000000000000000", Timestamp(0), True, Timestamp(0))
+        )
+        self.checkpoints.append(Checkpoint(0, 0))
         self.time_manager = time_manager
 
     ## ---
@@ -198,7 +413,7 @@ class WithdrawalQueueBase:
             raise Errors.TooMuchEtherToFinalize(amount_of_ETH, steth_to_finalize)
 
         first_request_id_to_finalize = self.last_finalized_request_id + 1
-        self.checkpoints[self.last_checkpoint_index + 1] = Checkpoint(first_request_id_to_finalize, max_share_rate)
+        self.checkpoints.append(Checkpoint(first_request_id_to_finalize, max_share_rate))
         self.last_checkpoint_index += 1
 
         self.locked_ether_amount += amount_of_ETH
@@ -223,7 +438,7 @@ class WithdrawalQueueBase:
             self.last_report_timestamp,
         )
 
-        self.queue[request_id] = new_request
+        self.queue.append(new_request)
 
         if owner not in self.requests_by_owner:
             self.requests_by_owner[owner] = []
@@ -232,6 +447,34 @@ class WithdrawalQueueBase:
 
         return request_id
 
+    def _enqueue_batch(self, amounts_of_stETH: List[int], amounts_of_shares: List[int], owner: str) -> List[int]:
+        """
+        Enqueues requests of a single owner at once, their cumulative amounts being one running sum over the batch.
+        Gives the same queue state as calling `_enqueue` for every amount in order.
+        """
+        if len(amounts_of_stETH) == 0:
+            return []
+
+        last_request_id = self.last_request_id
+        cumulative_stETH = np.cumsum(np.array(amounts_of_stETH, dtype=object))
+        cumulative_shares = np.cumsum(np.array(amounts_of_shares, dtype=object))
+        cumulative_stETH += self.queue.cumulative_stETH[last_request_id]
+        cumulative_shares += self.queue.cumulative_shares[last_request_id]
+
+        first_request_id = self.queue.extend(
+            cumulative_stETH,
+            cumulative_shares,
+            owner,
+            self.time_manager.get_current_timestamp_value(),
+            self.last_report_timestamp,
+        )
+
+        request_ids = list(range(first_request_id, first_request_id + len(amounts_of_stETH)))
+        self.last_request_id = request_ids[-1]
+        self.requests_by_owner.setdefault(owner, []).extend(request_ids)
+
+        return request_ids
+
     def _get_status(self, request_id: int) -> WithdrawalRequestStatus:
         if request_id == 0 or request_id > self.last_request_id:
             raise Errors.InvalidRequestId(request_id)
@@ -284,32 +527,195 @@ class WithdrawalQueueBase:
 
         return min_idx
 
-    def _claim(self, request_id: int, hint: int, recipient: str) -> int:
-        if request_id == 0:
-            raise Errors.InvalidRequestId(request_id)
+    def _find_checkpoint_hints(self, request_ids: np.ndarray, first_index: int, last_index: int) -> np.ndarray:
+        """
+        Vectorized `_find_checkpoint_hint` over sorted request ids, where each search starts from the previous hint.
+        Checkpoints are sorted by `from_request_id`, so the hint of a finalized request is the last checkpoint of the
+        range starting at or before it. The first invalid request id raises the same error as a sequential search.
+        """
+        hints = np.full(len(request_ids), self.NOT_FOUND, dtype=np.int64)
+        if len(request_ids) == 0:
+            return hints
+
+        last_checkpoint_index = self.last_checkpoint_index
+        from_request_ids = self.checkpoints.from_request_id
+
+        if last_checkpoint_index != 0 and 0 < first_index <= last_index <= last_checkpoint_index:
+            positions = (
+                first_index
+                - 1
+                + np.searchsorted(from_request_ids[first_index : last_index + 1], request_ids, side="right")
+            )
+            found = (positions >= first_index) & (request_ids <= self.last_finalized_request_id)
+
+            if last_index < last_checkpoint_index:
+                found &= request_ids < from_request_ids[last_index + 1]
+
+            hints[found] = positions[found]
+
+        starts = np.empty_like(hints)
+        starts[0] = first_index
+        starts[1:] = hints[:-1]
+
+        unsorted = np.empty(len(request_ids), dtype=np.bool_)
+        unsorted[0] = request_ids[0] < 0
+        unsorted[1:] = request_ids[1:] < request_ids[:-1]
+
+        invalid_ids = (request_ids == 0) | (request_ids > self.last_request_id)
+        invalid_ranges = (starts == 0) | (last_index > last_checkpoint_index)
+        errors = np.flatnonzero(unsorted | invalid_ids | invalid_ranges)
+
+        if len(errors):
+            index = errors[0]
+            if unsorted[index]:
+                raise Errors.RequestIdsNotSorted
+            if invalid_ids[index]:
+                raise Errors.InvalidRequestId(int(request_ids[index]))
+            raise Errors.InvalidRequestIdRange(int(starts[index]), last_index)
+
+        return hints
 
-        if request_id > self.last_finalized_request_id:
-            raise Errors.RequestNotFoundOrNotFinalized(request_id)
+    def _claim(self, request_id: int, hint: int, recipient: str) -> int:
+        return self._claim_batch(np.array([request_id], dtype=np.int64), np.array([hint], dtype=np.int64), recipient)
+
+    def _claim_batch(
+        self, request_ids: np.ndarray, hints: np.ndarray, recipient: str, request_id_ranges: List[range] = None
+    ) -> int:
+        """
+        Claims finalized requests of `recipient` in one pass. Requests before the first failing one are claimed and
+        the error of that request is raised, so the queue ends up in the same state as after claiming one by one.
+        `request_id_ranges` are the ranges of consecutive ids `request_ids` were expanded from, if any, and are used
+        to mark all requests claimed at once when none of them fails.
+        """
+        if len(request_ids) == 0:
+            return 0
+
+        queue = self.queue
+        finalized = (request_ids > 0) & (request_ids <= self.last_finalized_request_id)
+        finalized_ids = np.where(finalized, request_ids, 0)
+
+        repeated = np.ones(len(request_ids), dtype=np.bool_)
+        repeated[np.unique(request_ids, return_index=True)[1]] = False
+
+        already_claimed = finalized & (queue.claimed[finalized_ids] | repeated)
+        not_owner = finalized & ~already_claimed & (queue.owner[finalized_ids] != recipient)
+        rejected = ~finalized | already_claimed | not_owner
+
+        eth = np.zeros(len(request_ids), dtype=object)
+        invalid_hints = np.zeros(len(request_ids), dtype=np.bool_)
+        accepted = ~rejected
+        eth[accepted], invalid_hints[accepted] = self._calculate_claimable_ether_batch(
+            request_ids[accepted], hints[accepted]
+        )
 
-        request = self.queue[request_id]
+        not_enough_ether = np.zeros(len(request_ids), dtype=np.bool_)
+        not_enough_ether[accepted] = np.cumsum(eth[accepted]) > self.locked_ether_amount
 
-        if request.claimed:
-            raise Errors.RequestAlreadyClaimed(request_id)
-        if request.owner != recipient:
-            raise Errors.NotOwner(recipient, request.owner)
+        errors = np.flatnonzero(rejected | invalid_hints | not_enough_ether)
+        claimed_count = errors[0] if len(errors) else len(request_ids)
+        marked_count = (
+            claimed_count + 1 if claimed_count < len(request_ids) and accepted[claimed_count] else claimed_count
+        )
 
-        request.claimed = True
-        self.requests_by_owner[request.owner].remove(request_id)
+        if request_id_ranges is not None and marked_count == len(request_ids):
+            self._mark_claimed_ranges(request_id_ranges, recipient)
+        else:
+            self._mark_claimed(request_ids[:marked_count], recipient)
+
+        total_claimed = int(np.sum(eth[:claimed_count])) if claimed_count else 0
+        self.locked_ether_amount -= total_claimed
+        self._send_value(recipient, total_claimed)
+
+        if claimed_count < len(request_ids):
+            index = claimed_count
+            request_id = int(request_ids[index])
+
+            if request_id == 0:
+                raise Errors.InvalidRequestId(request_id)
+            if not finalized[index]:
+                raise Errors.RequestNotFoundOrNotFinalized(request_id)
+            if already_claimed[index]:
+                raise Errors.RequestAlreadyClaimed(request_id)
+            if not_owner[index]:
+                raise Errors.NotOwner(recipient, queue.owner[request_id])
+            if invalid_hints[index]:
+                raise Errors.InvalidHint(int(hints[index]))
+            raise Errors.NotEnoughEther
 
-        eth_with_discount = self._calculate_claimable_ether(request, request_id, hint)
+        return total_claimed
+
+    def _mark_claimed(self, request_ids: np.ndarray, owner: str):
+        if len(request_ids) == 0:
+            return
+
+        self.queue.claimed[request_ids] = True
+
+        claimed_ids = request_ids.tolist()
+        owner_requests = self.requests_by_owner[owner]
+
+        if owner_requests[: len(claimed_ids)] == claimed_ids:
+            del owner_requests[: len(claimed_ids)]
+        else:
+            claimed_ids = set(claimed_ids)
+            owner_requests[:] = [request_id for request_id in owner_requests if request_id not in claimed_ids]
+
+    def _mark_claimed_ranges(self, request_id_ranges: List[range], owner: str):
+        """
+        `_mark_claimed` for ranges of consecutive request ids, writing the claimed flags one slice per range. An owner
+        holds every request id at most once, so a segment of its requests lies within a range of the same length
+        exactly when it holds the ids of that range.
+        """
+        owner_requests = self.requests_by_owner[owner]
+        position = 0
+        claimed_prefix = True
+
+        for request_id_range in request_id_ranges:
+            self.queue.claimed[request_id_range.start : request_id_range.stop] = True
+
+            segment = owner_requests[position : position + len(request_id_range)]
+            claimed_prefix = (
+                claimed_prefix
+                and len(segment) == len(request_id_range)
+                and (not segment or (min(segment) >= request_id_range.start and max(segment) < request_id_range.stop))
+            )
+            position += len(request_id_range)
+
+        if claimed_prefix:
+            del owner_requests[:position]
+        else:
+            owner_requests[:] = [
+                request_id
+                for request_id in owner_requests
+                if not any(request_id in request_id_range for request_id_range in request_id_ranges)
+            ]
+
+    def _calculate_claimable_ether_batch(
+        self, request_ids: np.ndarray, hints: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized `_calculate_claimable_ether` for finalized request ids. Returns the claimable ether of every
+        request and a mask of the requests with an invalid hint, whose ether value is meaningless.
+        """
+        last_checkpoint_index = self.last_checkpoint_index
+        from_request_ids = self.checkpoints.from_request_id
+        checkpoint_indexes = np.clip(hints, 0, last_checkpoint_index)
+        next_checkpoint_indexes = np.minimum(checkpoint_indexes + 1, last_checkpoint_index)
+
+        invalid_hints = (
+            (hints == 0)
+            | (hints > last_checkpoint_index)
+            | (request_ids < from_request_ids[checkpoint_indexes])
+            | ((hints < last_checkpoint_index) & (from_request_ids[next_checkpoint_indexes] <= request_ids))
+        )
 
-        if self.locked_ether_amount < eth_with_discount:
-            raise Errors.NotEnoughEther
+        stETH = self.queue.cumulative_stETH[request_ids] - self.queue.cumulative_stETH[request_ids - 1]
+        shares = self.queue.cumulative_shares[request_ids] - self.queue.cumulative_shares[request_ids - 1]
+        max_share_rates = self.checkpoints.max_share_rate[checkpoint_indexes]
 
-        self.locked_ether_amount -= eth_with_discount
-        self._send_value(recipient, eth_with_discount)
+        discounted = (stETH * self.E27_PRECISION_BASE) // shares > max_share_rates
+        eth = np.where(discounted, (shares * max_share_rates) // self.E27_PRECISION_BASE, stETH)
 
-        return eth_with_discount
+        return eth, invalid_hints
 
     def _calculate_claimable_ether(self, request: WithdrawalRequest, request_id: int, hint: int) -> int:
         if hint == 0:
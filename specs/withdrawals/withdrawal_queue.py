@@ -1,13 +1,15 @@
 from dataclasses import dataclass, field
 from typing import Dict, List
 
+import numpy as np
+
 from specs.lido import Lido
 from specs.time_manager import TimeManager
 from specs.types.address import Address
 from specs.types.timestamp import Timestamp, Timestamps
 from specs.withdrawals.errors import Errors
 from specs.withdrawals.pausable import Pausable
-from specs.withdrawals.queue_base import WithdrawalQueueBase, WithdrawalRequestStatus
+from specs.withdrawals.queue_base import WithdrawalQueueBase, WithdrawalRequestStatus, request_ids_from_ranges
 
 
 @dataclass
@@ -51,13 +53,10 @@ class WithdrawalQueue(WithdrawalQueueBase, Pausable):
         if owner == Address.ZERO:
             owner = holder_addr
 
-        request_ids = []
-
         for amount in amounts:
             self._check_withdrawal_request_amount(amount)
-            request_ids.append(self._request_withdrawal(holder_addr, amount, owner))
 
-        return request_ids
+        return self._request_withdrawals_batch(holder_addr, amounts, owner)
 
     def request_withdrawals_wsteth(self, holder_addr: str, amounts: List[int], owner: str = Address.ZERO) -> List[int]:
         self._check_resumed()
@@ -94,20 +93,54 @@ class WithdrawalQueue(WithdrawalQueueBase, Pausable):
         return self.requests_by_owner[owner]
 
     def get_withdrawal_status(self, request_ids: List[int]) -> List[WithdrawalRequestStatus]:
-        statuses = []
+        request_ids = np.asarray(request_ids, dtype=np.int64)
+        invalid_ids = np.flatnonzero((request_ids == 0) | (request_ids > self.get_last_request_id()))
+
+        if len(invalid_ids):
+            raise Errors.InvalidRequestId(int(request_ids[invalid_ids[0]]))
+
+        queue = self.queue
+        amounts_of_stETH = queue.cumulative_stETH[request_ids] - queue.cumulative_stETH[request_ids - 1]
+        amounts_of_shares = queue.cumulative_shares[request_ids] - queue.cumulative_shares[request_ids - 1]
+        is_finalized = request_ids <= self.get_last_finalized_request_id()
+
+        return [
+            WithdrawalRequestStatus(
+                amounts_of_stETH[i],
+                amounts_of_shares[i],
+                queue.owner[request_id],
+                Timestamp(int(queue.timestamp[request_id])),
+                bool(is_finalized[i]),
+                bool(queue.claimed[request_id]),
+            )
+            for i, request_id in enumerate(request_ids.tolist())
+        ]
+
+    def get_claimable_ether(self, request_ids: List[int], hints: List[int]) -> List[int]:
+        if len(request_ids) != len(hints):
+            raise Errors.ArraysLengthMismatch(len(request_ids), len(hints))
 
-        for request_id in request_ids:
-            statuses.append(self._get_status(request_id))
+        request_ids = np.asarray(request_ids, dtype=np.int64)
+        hints = np.asarray(hints, dtype=np.int64)
 
-        return statuses
+        invalid_ids = (request_ids == 0) | (request_ids > self.get_last_request_id())
+        finalized = ~invalid_ids & (request_ids <= self.get_last_finalized_request_id())
+        claimable = finalized & ~self.queue.claimed[np.where(finalized, request_ids, 0)]
 
-    def get_claimable_ether(self, request_ids: List[int], hints: List[int]) -> List[int]:
-        claimable_eth_values = []
+        claimable_eth_values = np.zeros(len(request_ids), dtype=object)
+        invalid_hints = np.zeros(len(request_ids), dtype=np.bool_)
+        claimable_eth_values[claimable], invalid_hints[claimable] = self._calculate_claimable_ether_batch(
+            request_ids[claimable], hints[claimable]
+        )
 
-        for i in range(len(request_ids)):
-            claimable_eth_values.append(self._get_claimable_ether(request_ids[i], hints[i]))
+        errors = np.flatnonzero(invalid_ids | invalid_hints)
+        if len(errors):
+            index = errors[0]
+            if invalid_ids[index]:
+                raise Errors.InvalidRequestId(int(request_ids[index]))
+            raise Errors.InvalidHint(int(hints[index]))
 
-        return claimable_eth_values
+        return claimable_eth_values.tolist()
 
     ## ---
     ## claims section
@@ -120,20 +153,29 @@ class WithdrawalQueue(WithdrawalQueueBase, Pausable):
         if len(request_ids) != len(hints):
             raise Errors.ArraysLengthMismatch(len(request_ids), len(hints))
 
-        for i in range(len(request_ids)):
-            self._claim(request_ids[i], hints[i], _recipient)
+        self._claim_batch(np.asarray(request_ids, dtype=np.int64), np.asarray(hints, dtype=np.int64), _recipient)
 
     def claim_withdrawals(self, holder_addr: str, request_ids: List[int], hints: List[int]) -> int:
         if len(request_ids) != len(hints):
             raise Errors.ArraysLengthMismatch(len(request_ids), len(hints))
 
-        total_claimed: int = 0
+        return self._claim_batch(
+            np.asarray(request_ids, dtype=np.int64), np.asarray(hints, dtype=np.int64), holder_addr
+        )
+
+    def claim_withdrawal_ranges(self, holder_addr: str, request_id_ranges: List[range], hints: List[int] = None) -> int:
+        """
+        `claim_withdrawals` for ranges of consecutive request ids. The hints are found from the first checkpoint on
+        when not given.
+        """
+        request_ids = request_ids_from_ranges(request_id_ranges)
 
-        for i in range(len(request_ids)):
-            claimed = self._claim(request_ids[i], hints[i], holder_addr)
-            total_claimed += claimed
+        if hints is None:
+            hints = self._find_checkpoint_hints(request_ids, 1, self.get_last_checkpoint_index())
+        elif len(request_ids) != len(hints):
+            raise Errors.ArraysLengthMismatch(len(request_ids), len(hints))
 
-        return total_claimed
+        return self._claim_batch(request_ids, np.asarray(hints, dtype=np.int64), holder_addr, request_id_ranges)
 
     def claim_withdrawal(self, holder_addr: str, request_id: int):
         self._claim(
@@ -145,18 +187,7 @@ class WithdrawalQueue(WithdrawalQueueBase, Pausable):
     ## ---
 
     def find_checkpoint_hints(self, request_ids: List[int], first_index: int, last_index: int) -> List[int]:
-        hint_ids = []
-        prev_request_id = 0
-
-        for request_id in request_ids:
-            if request_id < prev_request_id:
-                raise Errors.RequestIdsNotSorted
-
-            hint_ids.append(self._find_checkpoint_hint(request_id, first_index, last_index))
-            first_index = hint_ids[-1]
-            prev_request_id = request_id
-
-        return hint_ids
+        return self._find_checkpoint_hints(np.asarray(request_ids, dtype=np.int64), first_index, last_index).tolist()
 
     ## ---
     ## oracle report
@@ -197,6 +228,21 @@ class WithdrawalQueue(WithdrawalQueueBase, Pausable):
 
         return request_id
 
+    def _request_withdrawals_batch(self, holder_addr: str, amounts_of_steth: List[int], owner: str) -> List[int]:
+        """
+        Takes the stETH of all requests in one transfer and enqueues them at once. The shares of every request are
+        still converted from its own amount, like `_request_withdrawal` does.
+        """
+        if len(amounts_of_steth) == 0:
+            return []
+
+        amounts_of_steth = [int(amount) for amount in amounts_of_steth]
+        self.lido.transferSharesFrom(holder_addr, self.address, self.address, sum(amounts_of_steth))
+
+        amounts_of_shares = [int(self.lido.get_shares_by_pooled_eth(amount)) for amount in amounts_of_steth]
+
+        return self._enqueue_batch(amounts_of_steth, amounts_of_shares, owner)
+
     def _request_withdrawal_wsteth(self, holder_addr: str, amount_of_wsteth: int, owner: str) -> int:
         self.lido.wstETH_transferFrom(holder_addr, self.address, self.address, amount_of_wsteth)
 